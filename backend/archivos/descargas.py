@@ -0,0 +1,96 @@
+"""
+Descarga de archivos del storage con soporte de Range (reproducción y
+descargas reanudables) o delegada al servidor web.
+
+- settings.ARCHIVOS["SERVIDOR"] = "nginx": X-Accel-Redirect hacia
+  PREFIJO_INTERNO + nombre (una location `internal` que apunte a MEDIA_ROOT).
+- "apache": X-Sendfile con la ruta absoluta (mod_xsendfile).
+- None: Django transmite el archivo con FileResponse (o por bloques si es un rango).
+"""
+import mimetypes
+import os
+import re
+
+from django.http import FileResponse, HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .subidas import BLOQUE, config
+
+
+RANGO = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def leer_rango(cabecera, tamano):
+    """
+    (inicio, fin) inclusivos, None si no hay rango (o no es uno solo) y
+    False si es insatisfacible.
+    """
+    coincidencia = RANGO.match((cabecera or "").strip())
+    if not coincidencia:
+        return None
+    inicio, fin = coincidencia.groups()
+    if inicio == "" and fin == "":
+        return None
+    if inicio == "":
+        # Sufijo: los últimos N bytes
+        largo = int(fin)
+        if largo == 0:
+            return False
+        return max(tamano - largo, 0), tamano - 1
+    inicio = int(inicio)
+    fin = min(int(fin), tamano - 1) if fin else tamano - 1
+    if inicio >= tamano or fin < inicio:
+        return False
+    return inicio, fin
+
+
+def _bloques(archivo, inicio, largo):
+    try:
+        archivo.seek(inicio)
+        restante = largo
+        while restante > 0:
+            bloque = archivo.read(min(BLOQUE, restante))
+            if not bloque:
+                break
+            restante -= len(bloque)
+            yield bloque
+    finally:
+        archivo.close()
+
+
+def servir(request, campo, como_adjunto=False):
+    """Respuesta de descarga para un FieldFile (FileField/ImageField) no vacío."""
+    nombre = os.path.basename(campo.name)
+    tipo = mimetypes.guess_type(nombre)[0] or "application/octet-stream"
+    disposicion = content_disposition_header(como_adjunto, nombre)
+    opciones = config()
+
+    if opciones["SERVIDOR"] in ("nginx", "apache"):
+        response = HttpResponse(content_type=tipo)
+        if opciones["SERVIDOR"] == "nginx":
+            response["X-Accel-Redirect"] = opciones["PREFIJO_INTERNO"].rstrip("/") + "/" + campo.name
+        else:
+            response["X-Sendfile"] = campo.path
+        response["Content-Disposition"] = disposicion
+        return response
+
+    tamano = campo.size
+    rango = leer_rango(request.headers.get("Range"), tamano)
+
+    if rango is False:
+        response = HttpResponse(status=416)
+        response["Content-Range"] = f"bytes */{tamano}"
+        return response
+
+    if rango is None:
+        response = FileResponse(campo.open("rb"), as_attachment=como_adjunto, filename=nombre, content_type=tipo)
+    else:
+        inicio, fin = rango
+        largo = fin - inicio + 1
+        response = StreamingHttpResponse(_bloques(campo.open("rb"), inicio, largo), status=206, content_type=tipo)
+        response["Content-Length"] = str(largo)
+        response["Content-Range"] = f"bytes {inicio}-{fin}/{tamano}"
+        response["Content-Disposition"] = disposicion
+
+    response["Accept-Ranges"] = "bytes"
+    return response
@@ -0,0 +1,22 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from archivos.models import SubidaArchivo
+from archivos.subidas import cancelar
+
+
+class Command(BaseCommand):
+    help = "Cancela las subidas abandonadas y borra sus archivos temporales."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--horas", type=int, default=24, help="Horas sin recibir fragmentos.")
+
+    def handle(self, *args, **options):
+        limite = timezone.now() - timedelta(hours=options["horas"])
+        total = 0
+        for subida in SubidaArchivo.objects.filter(estado="en_curso", actualizada__lt=limite).iterator():
+            cancelar(subida)
+            total += 1
+        self.stdout.write(self.style.SUCCESS(f"{total} subidas canceladas."))
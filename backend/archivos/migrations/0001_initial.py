@@ -0,0 +1,40 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:23
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SubidaArchivo',
+            fields=[
+                ('id_subida', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('destino', models.CharField(choices=[('chat', 'Adjunto de chat'), ('servicio', 'Foto de servicio')], max_length=20)),
+                ('objeto_id', models.PositiveIntegerField()),
+                ('nombre', models.CharField(max_length=255)),
+                ('tamano', models.PositiveBigIntegerField()),
+                ('sha256', models.CharField(max_length=64)),
+                ('recibido', models.PositiveBigIntegerField(default=0)),
+                ('estado', models.CharField(choices=[('en_curso', 'En curso'), ('completada', 'Completada'), ('cancelada', 'Cancelada')], default='en_curso', max_length=20)),
+                ('archivo', models.CharField(blank=True, default='', max_length=255)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('actualizada', models.DateTimeField(auto_now=True)),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='subidas', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Subida de archivo',
+                'verbose_name_plural': 'Subidas de archivos',
+                'indexes': [models.Index(fields=['estado', 'actualizada'], name='subida_estado_fecha_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,58 @@
+import uuid
+
+from django.db import models
+from usuarios.models import Usuario
+
+
+class SubidaArchivo(models.Model):
+    """
+    Subida por fragmentos de un archivo (adjunto de chat o foto de servicio).
+    El contenido se va escribiendo en un archivo temporal y solo al completarse
+    y verificar el SHA-256 se guarda en el storage y se asocia a su destino.
+    """
+
+    DESTINOS = [
+        ("chat", "Adjunto de chat"),
+        ("servicio", "Foto de servicio"),
+    ]
+
+    ESTADOS = [
+        ("en_curso", "En curso"),
+        ("completada", "Completada"),
+        ("cancelada", "Cancelada"),
+    ]
+
+    # UUID: la subida se identifica en URLs y no debe ser adivinable
+    id_subida = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name="subidas"
+    )
+
+    destino = models.CharField(max_length=20, choices=DESTINOS)
+    # id de la Solicitud (chat) o del Servicio (foto)
+    objeto_id = models.PositiveIntegerField()
+
+    nombre = models.CharField(max_length=255)
+    tamano = models.PositiveBigIntegerField()
+    sha256 = models.CharField(max_length=64)
+    recibido = models.PositiveBigIntegerField(default=0)
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default="en_curso")
+    # Ruta en el storage una vez completada
+    archivo = models.CharField(max_length=255, blank=True, default="")
+
+    creada = models.DateTimeField(auto_now_add=True)
+    actualizada = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.nombre} ({self.recibido}/{self.tamano}) — {self.estado}"
+
+    class Meta:
+        verbose_name = "Subida de archivo"
+        verbose_name_plural = "Subidas de archivos"
+        indexes = [
+            models.Index(fields=["estado", "actualizada"], name="subida_estado_fecha_idx"),
+        ]
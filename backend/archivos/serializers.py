@@ -0,0 +1,51 @@
+import os
+import re
+
+from rest_framework import serializers
+
+from chat.tiempo_real import es_participante
+from servicios.models import Servicio
+
+from .models import SubidaArchivo
+from .subidas import config
+
+
+SHA256 = re.compile(r"^[0-9a-fA-F]{64}$")
+
+
+class SubidaArchivoSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SubidaArchivo
+        fields = ["id_subida", "destino", "objeto_id", "nombre", "tamano", "sha256", "recibido", "estado", "archivo"]
+        read_only_fields = ["id_subida", "recibido", "estado", "archivo"]
+
+    def validate_nombre(self, value):
+        # Solo el nombre base: la ruta final la decide el upload_to del campo
+        nombre = os.path.basename(value.replace("\\", "/")).strip()
+        if not nombre:
+            raise serializers.ValidationError("Nombre de archivo inválido.")
+        return nombre
+
+    def validate_sha256(self, value):
+        if not SHA256.match(value):
+            raise serializers.ValidationError("Debe ser el SHA-256 en hexadecimal (64 caracteres).")
+        return value.lower()
+
+    def validate(self, data):
+        usuario = self.context["request"].user
+        destino = data["destino"]
+        maximo = config()["TAMANO_MAXIMO"][destino]
+
+        if data["tamano"] <= 0 or data["tamano"] > maximo:
+            raise serializers.ValidationError({"tamano": f"Debe estar entre 1 y {maximo} bytes."})
+
+        if destino == "chat":
+            if not es_participante(usuario, data["objeto_id"]):
+                raise serializers.ValidationError("No perteneces a esta solicitud.")
+        else:
+            if not Servicio.objects.filter(pk=data["objeto_id"], trabajador__usuario=usuario).exists():
+                raise serializers.ValidationError("No puedes modificar este servicio.")
+            if os.path.splitext(data["nombre"])[1].lower() not in config()["EXTENSIONES_FOTO"]:
+                raise serializers.ValidationError({"nombre": "La foto debe ser una imagen."})
+
+        return data
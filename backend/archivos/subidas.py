@@ -0,0 +1,177 @@
+"""
+Subidas de archivos por fragmentos, reanudables.
+
+1. POST /api/archivos/subidas/ con {destino, objeto_id, nombre, tamano, sha256}
+   reserva la subida (valida permisos y el tamaño máximo).
+2. PUT /api/archivos/subidas/<id>/ con el fragmento en crudo en el cuerpo y
+   la cabecera Content-Range: bytes <inicio>-<fin>/<tamano>. El cuerpo se copia
+   al archivo temporal por bloques, sin pasar por el parser multipart.
+   Si el inicio no coincide con lo ya recibido se responde 409 con el offset
+   correcto: así se reanuda tras un corte. El offset se reclama con un UPDATE
+   condicional antes de escribir, así que de dos PUT al mismo offset solo uno
+   toca el archivo temporal.
+3. GET /api/archivos/subidas/<id>/ devuelve lo recibido hasta ahora.
+
+Con el último fragmento se verifica el SHA-256 y el archivo pasa al storage
+(Mensaje.archivo o Servicio.foto_servicio). Si ese paso falla, repetir el
+último PUT lo vuelve a intentar sin reenviar datos.
+"""
+import hashlib
+import os
+import re
+from pathlib import Path
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from rest_framework import status
+from rest_framework.exceptions import APIException, ValidationError
+
+from .models import SubidaArchivo
+
+
+MB = 1024 * 1024
+
+CONFIG_POR_DEFECTO = {
+    "TAMANO_MAXIMO": {"chat": 20 * MB, "servicio": 5 * MB},
+    "TAMANO_FRAGMENTO": 5 * MB,
+    "DIRECTORIO_TEMPORAL": None,  # por defecto MEDIA_ROOT/subidas_tmp
+    "EXTENSIONES_FOTO": (".jpg", ".jpeg", ".png", ".webp", ".gif"),
+    # Entrega de descargas: None (Django), "nginx" (X-Accel-Redirect) o "apache" (X-Sendfile)
+    "SERVIDOR": None,
+    "PREFIJO_INTERNO": "/protegido/",
+}
+
+BLOQUE = 64 * 1024
+
+CONTENT_RANGE = re.compile(r"^bytes (\d+)-(\d+)/(\d+)$")
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "ARCHIVOS", {})}
+
+
+class OffsetIncorrecto(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "El fragmento no empieza donde termina lo recibido."
+
+    def __init__(self, recibido):
+        super().__init__()
+        # recibido como número: el cliente lo usa para reanudar
+        self.detail = {"error": self.default_detail, "recibido": recibido}
+
+
+class SubidaTerminada(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "La subida ya no está en curso."
+
+
+def directorio_temporal():
+    directorio = Path(config()["DIRECTORIO_TEMPORAL"] or Path(settings.MEDIA_ROOT) / "subidas_tmp")
+    directorio.mkdir(parents=True, exist_ok=True)
+    return directorio
+
+
+def ruta_temporal(subida):
+    return directorio_temporal() / f"{subida.pk}.part"
+
+
+def leer_content_range(valor, subida):
+    coincidencia = CONTENT_RANGE.match(valor or "")
+    if not coincidencia:
+        raise ValidationError({"error": "Falta Content-Range: bytes <inicio>-<fin>/<tamaño>."})
+    inicio, fin, total = (int(g) for g in coincidencia.groups())
+    if total != subida.tamano or fin < inicio or fin >= total:
+        raise ValidationError({"error": "Content-Range no corresponde con la subida."})
+    largo = fin - inicio + 1
+    if largo > config()["TAMANO_FRAGMENTO"]:
+        raise ValidationError({"error": f"El fragmento supera {config()['TAMANO_FRAGMENTO']} bytes."})
+    return inicio, largo
+
+
+def escribir_fragmento(subida, inicio, largo, flujo):
+    """
+    Copia `largo` bytes de `flujo` al archivo temporal desde `inicio`.
+    Devuelve la subida con `recibido` actualizado.
+    """
+    if inicio != subida.recibido:
+        raise OffsetIncorrecto(subida.recibido)
+
+    with transaction.atomic():
+        # Reclama el offset antes de escribir: la fila queda bloqueada hasta el
+        # commit y una petición concurrente al mismo offset no actualiza nada.
+        # Si la escritura falla, el rollback devuelve `recibido` a `inicio`.
+        if not SubidaArchivo.objects.filter(pk=subida.pk, recibido=inicio, estado="en_curso").update(
+            recibido=inicio + largo
+        ):
+            subida.refresh_from_db(fields=["recibido"])
+            raise OffsetIncorrecto(subida.recibido)
+
+        ruta = ruta_temporal(subida)
+        escritos = 0
+        with open(ruta, "r+b" if ruta.exists() else "wb") as destino:
+            destino.seek(inicio)
+            while escritos < largo:
+                bloque = flujo.read(min(BLOQUE, largo - escritos))
+                if not bloque:
+                    break
+                destino.write(bloque)
+                escritos += len(bloque)
+            destino.truncate(inicio + escritos)
+
+        if escritos != largo:
+            raise ValidationError({"error": "El cuerpo es más corto que el rango indicado.", "recibido": inicio})
+
+    subida.recibido = inicio + largo
+    return subida
+
+
+def sha256_de(ruta):
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as archivo:
+        for bloque in iter(lambda: archivo.read(BLOQUE), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def completar(subida):
+    """Verifica el checksum y guarda el archivo en su destino. Devuelve el objeto creado/actualizado."""
+    from chat.models import Mensaje
+    from servicios.models import Servicio
+
+    ruta = ruta_temporal(subida)
+    if sha256_de(ruta) != subida.sha256.lower():
+        cancelar(subida)
+        raise ValidationError({"error": "El SHA-256 no coincide; la subida se descartó."})
+
+    with transaction.atomic(), open(ruta, "rb") as contenido:
+        # Reclama la finalización: dos PUT finales simultáneos no crean dos
+        # mensajes. Si algo falla, el rollback la deja en curso para reintentar
+        if not SubidaArchivo.objects.filter(pk=subida.pk, estado="en_curso").update(estado="completada"):
+            raise SubidaTerminada()
+
+        if subida.destino == "chat":
+            destino = Mensaje(solicitud_id=subida.objeto_id, remitente=subida.usuario)
+            destino.archivo.save(subida.nombre, File(contenido), save=False)
+            destino.save()
+            subida.archivo = destino.archivo.name
+        else:
+            destino = Servicio.objects.get(pk=subida.objeto_id)
+            destino.foto_servicio.save(subida.nombre, File(contenido), save=False)
+            destino.save(update_fields=["foto_servicio", "actualizado"])
+            subida.archivo = destino.foto_servicio.name
+
+        subida.estado = "completada"
+        subida.save(update_fields=["archivo", "actualizada"])
+
+    os.remove(ruta)
+    return destino
+
+
+def cancelar(subida):
+    subida.estado = "cancelada"
+    subida.save(update_fields=["estado", "actualizada"])
+    try:
+        os.remove(ruta_temporal(subida))
+    except FileNotFoundError:
+        pass
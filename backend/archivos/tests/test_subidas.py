@@ -0,0 +1,249 @@
+import hashlib
+import io
+
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from archivos.descargas import leer_rango
+from archivos.models import SubidaArchivo
+from archivos.subidas import OffsetIncorrecto, escribir_fragmento, ruta_temporal
+from chat.models import Mensaje
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+CONTENIDO = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture(autouse=True)
+def media_temporal(settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    settings.ARCHIVOS = {"TAMANO_FRAGMENTO": 4096, "SERVIDOR": None}
+
+
+@pytest.fixture
+def conversacion():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+    return solicitud, cliente, trabajador
+
+
+def cliente_api(usuario):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client
+
+
+def crear_subida(client, objeto_id, destino="chat", nombre="doc.pdf", contenido=CONTENIDO):
+    return client.post("/api/archivos/subidas/", {
+        "destino": destino,
+        "objeto_id": objeto_id,
+        "nombre": nombre,
+        "tamano": len(contenido),
+        "sha256": hashlib.sha256(contenido).hexdigest(),
+    }, format="json")
+
+
+def enviar(client, id_subida, inicio, fin, contenido=CONTENIDO):
+    return client.put(
+        f"/api/archivos/subidas/{id_subida}/",
+        data=contenido[inicio:fin + 1],
+        content_type="application/octet-stream",
+        HTTP_CONTENT_RANGE=f"bytes {inicio}-{fin}/{len(contenido)}",
+    )
+
+
+def subir_completo(client, id_subida, contenido=CONTENIDO, fragmento=4096):
+    for inicio in range(0, len(contenido), fragmento):
+        res = enviar(client, id_subida, inicio, min(inicio + fragmento, len(contenido)) - 1, contenido)
+    return res
+
+
+def test_subida_por_fragmentos_crea_mensaje(conversacion):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+
+    res = crear_subida(client, solicitud.pk)
+    assert res.status_code == 201
+    id_subida = res.data["id_subida"]
+
+    res = enviar(client, id_subida, 0, 4095)
+    assert res.status_code == 202
+    assert res.data["recibido"] == 4096
+
+    res = enviar(client, id_subida, 0, 4095)
+    assert res.status_code == 409  # el primer fragmento ya estaba
+
+    # Cuerpo vacío con un Content-Range válido
+    res = client.put(
+        f"/api/archivos/subidas/{id_subida}/", data=b"", content_type="application/octet-stream",
+        HTTP_CONTENT_RANGE=f"bytes 4096-8191/{len(CONTENIDO)}",
+    )
+    assert res.status_code == 400
+    assert res.data["recibido"] == 4096
+
+    res = enviar(client, id_subida, 4096, 8191)
+    res = enviar(client, id_subida, 8192, len(CONTENIDO) - 1)
+    assert res.status_code == 201
+    assert res.data["estado"] == "completada"
+
+    # El adjunto apunta a la descarga con permisos, no a /media/
+    assert res.data["mensaje"]["archivo"] == f"/api/archivos/mensajes/{res.data['mensaje']['id_mensaje']}/"
+    mensaje = Mensaje.objects.get(pk=res.data["mensaje"]["id_mensaje"])
+    assert mensaje.remitente == cliente
+    assert mensaje.archivo.read() == CONTENIDO
+    assert not ruta_temporal(SubidaArchivo.objects.get(pk=id_subida)).exists()
+
+
+def test_reanudar_tras_corte(conversacion):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+    enviar(client, id_subida, 0, 4095)
+
+    # El cliente perdió la conexión: pregunta cuánto llegó y sigue desde ahí
+    res = enviar(client, id_subida, 8192, len(CONTENIDO) - 1)
+    assert res.status_code == 409
+    assert res.data["recibido"] == 4096
+
+    recibido = client.get(f"/api/archivos/subidas/{id_subida}/").data["recibido"]
+    enviar(client, id_subida, recibido, recibido + 4095)
+    res = enviar(client, id_subida, recibido + 4096, len(CONTENIDO) - 1)
+    assert res.status_code == 201
+
+
+def test_offset_reclamado_no_toca_el_archivo(conversacion):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+    # Dos PUT leyeron recibido=0: el primero ya escribió y avanzó el offset
+    vieja = SubidaArchivo.objects.get(pk=id_subida)
+    enviar(client, id_subida, 0, 4095)
+
+    with pytest.raises(OffsetIncorrecto):
+        escribir_fragmento(vieja, 0, 4096, io.BytesIO(b"x" * 4096))
+    assert ruta_temporal(vieja).read_bytes() == CONTENIDO[:4096]
+
+    # Un cuerpo corto no deja el offset avanzado
+    actual = SubidaArchivo.objects.get(pk=id_subida)
+    with pytest.raises(ValidationError):
+        escribir_fragmento(actual, 4096, 4096, io.BytesIO(CONTENIDO[4096:5000]))
+    assert SubidaArchivo.objects.get(pk=id_subida).recibido == 4096
+
+
+def test_reintentar_ultimo_fragmento_completa(conversacion, monkeypatch):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+
+    def fallar(*args, **kwargs):
+        raise RuntimeError("storage caído")
+
+    guardar = Mensaje.save
+    monkeypatch.setattr(Mensaje, "save", fallar)
+    with pytest.raises(RuntimeError):
+        subir_completo(client, id_subida)
+    subida = SubidaArchivo.objects.get(pk=id_subida)
+    assert (subida.estado, subida.recibido) == ("en_curso", len(CONTENIDO))
+
+    monkeypatch.setattr(Mensaje, "save", guardar)
+    res = enviar(client, id_subida, 8192, len(CONTENIDO) - 1)
+    assert res.status_code == 201
+    assert Mensaje.objects.count() == 1
+    assert SubidaArchivo.objects.get(pk=id_subida).estado == "completada"
+    assert not ruta_temporal(subida).exists()
+
+    assert enviar(client, id_subida, 8192, len(CONTENIDO) - 1).status_code == 409
+
+
+def test_checksum_incorrecto_descarta(conversacion):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+
+    corrupto = b"x" + CONTENIDO[1:]
+    res = subir_completo(client, id_subida, corrupto)
+    assert res.status_code == 400
+    assert SubidaArchivo.objects.get(pk=id_subida).estado == "cancelada"
+    assert not Mensaje.objects.exists()
+
+
+def test_limites_y_permisos(conversacion, settings):
+    solicitud, cliente, _ = conversacion
+    client = cliente_api(cliente)
+
+    settings.ARCHIVOS = {"TAMANO_MAXIMO": {"chat": 100, "servicio": 100}}
+    assert crear_subida(client, solicitud.pk).status_code == 400
+
+    settings.ARCHIVOS = {"TAMANO_FRAGMENTO": 1024}
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+    assert enviar(client, id_subida, 0, 4095).status_code == 400
+
+    extrano = Usuario.objects.create_user(email="x@test.com", nombre="X", password="123")
+    assert crear_subida(cliente_api(extrano), solicitud.pk).status_code == 400
+    # La subida de otro usuario no existe para él
+    assert cliente_api(extrano).get(f"/api/archivos/subidas/{id_subida}/").status_code == 404
+    # El cliente no es dueño del servicio
+    assert crear_subida(client, solicitud.servicio_id, "servicio", "foto.png").status_code == 400
+
+
+def test_foto_de_servicio(conversacion):
+    solicitud, _, trabajador = conversacion
+    client = cliente_api(trabajador)
+    servicio = solicitud.servicio
+
+    id_subida = crear_subida(client, servicio.pk, "servicio", "foto.png").data["id_subida"]
+    assert subir_completo(client, id_subida).status_code == 201
+
+    servicio.refresh_from_db()
+    assert servicio.foto_servicio.name.startswith("fotos_servicios/")
+
+    # Sin aprobar solo la ve su dueño
+    assert APIClient().get(f"/api/archivos/servicios/{servicio.pk}/foto/").status_code == 404
+    Servicio.objects.filter(pk=servicio.pk).update(estado_publicacion="aprobado")
+    res = APIClient().get(f"/api/archivos/servicios/{servicio.pk}/foto/")
+    assert res.status_code == 200
+    assert b"".join(res.streaming_content) == CONTENIDO
+
+
+def test_descarga_con_rangos(conversacion, settings):
+    solicitud, cliente, trabajador = conversacion
+    client = cliente_api(cliente)
+    id_subida = crear_subida(client, solicitud.pk).data["id_subida"]
+    id_mensaje = subir_completo(client, id_subida).data["mensaje"]["id_mensaje"]
+    url = f"/api/archivos/mensajes/{id_mensaje}/"
+
+    res = cliente_api(trabajador).get(url)
+    assert res.status_code == 200
+    assert res["Accept-Ranges"] == "bytes"
+    assert b"".join(res.streaming_content) == CONTENIDO
+
+    res = client.get(url, HTTP_RANGE="bytes=100-199")
+    assert res.status_code == 206
+    assert res["Content-Range"] == f"bytes 100-199/{len(CONTENIDO)}"
+    assert b"".join(res.streaming_content) == CONTENIDO[100:200]
+
+    res = client.get(url, HTTP_RANGE=f"bytes={len(CONTENIDO)}-")
+    assert res.status_code == 416
+
+    extrano = Usuario.objects.create_user(email="x@test.com", nombre="X", password="123")
+    assert cliente_api(extrano).get(url).status_code == 403
+
+    settings.ARCHIVOS = {"SERVIDOR": "nginx", "PREFIJO_INTERNO": "/protegido/"}
+    res = client.get(url)
+    assert res["X-Accel-Redirect"].startswith("/protegido/chat_archivos/")
+
+
+def test_leer_rango():
+    assert leer_rango(None, 100) is None
+    assert leer_rango("bytes=0-", 100) == (0, 99)
+    assert leer_rango("bytes=-10", 100) == (90, 99)
+    assert leer_rango("bytes=50-500", 100) == (50, 99)
+    assert leer_rango("bytes=0-1,5-6", 100) is None  # varios rangos: archivo completo
+    assert leer_rango("bytes=100-", 100) is False
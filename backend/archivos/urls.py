@@ -0,0 +1,10 @@
+from django.urls import path
+from .views import SubidasView, SubidaDetalleView, ArchivoMensajeView, ArchivoArchivadoView, FotoServicioView
+
+urlpatterns = [
+    path('subidas/', SubidasView.as_view(), name='subidas'),
+    path('subidas/<uuid:id_subida>/', SubidaDetalleView.as_view(), name='subida-detalle'),
+    path('mensajes/<int:id_mensaje>/', ArchivoMensajeView.as_view(), name='archivo-mensaje'),
+    path('archivados/<int:id_mensaje>/', ArchivoArchivadoView.as_view(), name='archivo-archivado'),
+    path('servicios/<int:id_servicio>/foto/', FotoServicioView.as_view(), name='foto-servicio'),
+]
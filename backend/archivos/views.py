@@ -0,0 +1,131 @@
+from django.db.models.fields.files import FieldFile
+from django.http import Http404
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from chat.archivo import adjunto_archivado
+from chat.models import Mensaje
+from chat.serializers import MensajeSerializer
+from chat.tiempo_real import es_participante
+from servicios.models import Servicio
+
+from .descargas import servir
+from .models import SubidaArchivo
+from .serializers import SubidaArchivoSerializer
+from . import subidas
+
+
+class SubidasView(APIView):
+    """
+    Reserva una subida por fragmentos.
+    Body: {"destino": "chat" | "servicio", "objeto_id", "nombre", "tamano", "sha256"}
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = SubidaArchivoSerializer(data=request.data, context={"request": request})
+        serializer.is_valid(raise_exception=True)
+        subida = serializer.save(usuario=request.user)
+        # Reserva el temporal: los fragmentos se escriben sobre él
+        subidas.ruta_temporal(subida).touch()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class SubidaDetalleView(APIView):
+    """
+    GET: estado de la subida (cuánto se recibió, para reanudar).
+    PUT: un fragmento en crudo con Content-Range: bytes <inicio>-<fin>/<tamano>.
+    DELETE: cancela la subida y borra el temporal.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_subida(self, id_subida):
+        return get_object_or_404(SubidaArchivo, pk=id_subida, usuario=self.request.user)
+
+    def get(self, request, id_subida):
+        return Response(SubidaArchivoSerializer(self.get_subida(id_subida)).data)
+
+    def put(self, request, id_subida):
+        subida = self.get_subida(id_subida)
+        if subida.estado != "en_curso":
+            return Response({"error": f"La subida está {subida.estado}."}, status=status.HTTP_409_CONFLICT)
+
+        inicio, largo = subidas.leer_content_range(request.headers.get("Content-Range"), subida)
+        # Todo recibido pero sin completar (falló la finalización): repetir el
+        # último PUT reintenta completar sin volver a escribir
+        if subida.recibido < subida.tamano:
+            # Sin cuerpo (o Content-Length: 0) DRF no abre el stream
+            if request.stream is None:
+                return Response(
+                    {"error": "El fragmento llegó vacío.", "recibido": subida.recibido},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            # request.stream: el cuerpo se lee por bloques, nunca entero en memoria
+            subidas.escribir_fragmento(subida, inicio, largo, request.stream)
+
+        if subida.recibido < subida.tamano:
+            return Response(SubidaArchivoSerializer(subida).data, status=status.HTTP_202_ACCEPTED)
+
+        destino = subidas.completar(subida)
+        data = SubidaArchivoSerializer(subida).data
+        if subida.destino == "chat":
+            data["mensaje"] = MensajeSerializer(destino).data
+        return Response(data, status=status.HTTP_201_CREATED)
+
+    def delete(self, request, id_subida):
+        subida = self.get_subida(id_subida)
+        if subida.estado == "en_curso":
+            subidas.cancelar(subida)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
+class ArchivoMensajeView(APIView):
+    """Adjunto de un mensaje (solo participantes de la conversación). Soporta Range."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, id_mensaje):
+        mensaje = get_object_or_404(Mensaje.objects.only("solicitud_id", "archivo"), pk=id_mensaje)
+        if not es_participante(request.user, mensaje.solicitud_id):
+            return Response({"error": "No puedes ver este chat."}, status=status.HTTP_403_FORBIDDEN)
+        if not mensaje.archivo:
+            raise Http404
+        return servir(request, mensaje.archivo, como_adjunto=True)
+
+
+class ArchivoArchivadoView(APIView):
+    """Adjunto de un mensaje ya archivado (chat.archivo), con los mismos permisos."""
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, id_mensaje):
+        adjunto = adjunto_archivado(id_mensaje)
+        if adjunto is None:
+            raise Http404
+        solicitud_id, nombre = adjunto
+        if not es_participante(request.user, solicitud_id):
+            return Response({"error": "No puedes ver este chat."}, status=status.HTTP_403_FORBIDDEN)
+        campo = Mensaje._meta.get_field("archivo")
+        return servir(request, FieldFile(None, campo, nombre), como_adjunto=True)
+
+
+class FotoServicioView(APIView):
+    """Foto de un servicio: pública si está aprobado; si no, solo su dueño o un admin."""
+    permission_classes = [permissions.AllowAny]
+
+    def get(self, request, id_servicio):
+        servicio = get_object_or_404(
+            Servicio.objects.select_related("trabajador").only(
+                "estado_publicacion", "foto_servicio", "trabajador__usuario_id"
+            ),
+            pk=id_servicio,
+        )
+        if servicio.estado_publicacion != "aprobado":
+            usuario = request.user
+            if not usuario.is_authenticated or (
+                usuario.rol_base != "admin" and servicio.trabajador.usuario_id != usuario.pk
+            ):
+                raise Http404
+        if not servicio.foto_servicio:
+            raise Http404
+        return servir(request, servicio.foto_servicio)
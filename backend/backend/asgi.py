@@ -3,6 +3,9 @@ ASGI config for backend project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+HTTP lo atiende Django; las conexiones WebSocket se enrutan por ruta a sus
+aplicaciones ASGI (hoy solo el chat en tiempo real, ver chat.websocket).
+
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
 """
@@ -13,4 +16,22 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+# Importar después de get_asgi_application(): necesitan las apps cargadas
+from chat.websocket import chat_websocket  # noqa: E402
+
+WEBSOCKETS = [
+    ("/ws/chat/", chat_websocket),
+]
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "websocket":
+        for prefijo, aplicacion in WEBSOCKETS:
+            if scope["path"].startswith(prefijo):
+                return await aplicacion(scope, receive, send)
+        await receive()
+        await send({"type": "websocket.close", "code": 4404})
+        return
+    return await django_application(scope, receive, send)
@@ -0,0 +1,172 @@
+"""
+Cache de respuestas de los endpoints públicos del catálogo.
+
+Las respuestas se guardan con el framework de cache de Django (alias
+configurable en settings.CACHE_PUBLICO) bajo una clave que incluye:
+
+- una "generación" del catálogo, que se incrementa al cambiar los datos
+  (ver servicios.signals), de modo que invalidar es un solo incr();
+- la ruta y los parámetros de consulta normalizados (orden y vacíos).
+- lo que la URL no fija, como la ranura de ?disponible=ahora
+  (CachePublicoMixin.get_clave_extra).
+
+Con LocMemCache cada proceso tiene su propia cache: la invalidación solo
+llega al proceso que hizo la escritura y el resto sirve datos hasta TIMEOUT.
+Para varios procesos usar FileBasedCache o un backend compartido.
+"""
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache as cache_por_defecto, caches
+from rest_framework.response import Response
+
+
+CONFIG_POR_DEFECTO = {
+    "ALIAS": "default",
+    "TIMEOUT": 300,
+    "ACTIVO": True,
+    "PREFIJO": "catalogo",
+}
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "CACHE_PUBLICO", {})}
+
+
+def _cache():
+    return caches[config()["ALIAS"]]
+
+
+def _clave(nombre):
+    return f"{config()['PREFIJO']}:{nombre}"
+
+
+def _incrementar(clave, inicial, cache=None):
+    if cache is None:
+        cache = _cache()
+    try:
+        return cache.incr(clave)
+    except ValueError:
+        # La clave no existe (o fue desalojada)
+        cache.add(clave, inicial, None)
+        return cache.get(clave, inicial)
+
+
+# ---------------------------------------------------------
+# Generaciones
+# ---------------------------------------------------------
+# Contadores que se incrementan al cambiar unos datos: las entradas cacheadas
+# llevan la generación en la clave, así que invalidar es un solo incr().
+# Los usan el catálogo, la bandeja del chat (chat.inbox), el índice de
+# disponibilidad (disponibilidad.mapa) y el panel del trabajador
+# (perfiles.estadisticas). Sin `cache` se usa la cache por defecto.
+
+def leer_generacion(clave, cache=None):
+    # Si la clave se pierde se reinicia con la hora actual, nunca con un
+    # valor que pueda coincidir con entradas viejas
+    cache = cache_por_defecto if cache is None else cache
+    return cache.get_or_set(clave, int(time.time() * 1000), None)
+
+
+def incrementar_generacion(clave, cache=None):
+    cache = cache_por_defecto if cache is None else cache
+    return _incrementar(clave, int(time.time() * 1000), cache)
+
+
+def generacion():
+    return leer_generacion(_clave("generacion"), _cache())
+
+
+def invalidar_catalogo():
+    if config()["ACTIVO"]:
+        incrementar_generacion(_clave("generacion"), _cache())
+
+
+# ---------------------------------------------------------
+# Estadísticas
+# ---------------------------------------------------------
+
+def registrar(resultado):
+    _incrementar(_clave(resultado), 1)
+
+
+def estadisticas():
+    cache = _cache()
+    aciertos = cache.get(_clave("hits"), 0)
+    fallos = cache.get(_clave("misses"), 0)
+    total = aciertos + fallos
+    return {
+        "hits": aciertos,
+        "misses": fallos,
+        "ratio": round(aciertos / total, 4) if total else 0,
+        "generacion": generacion(),
+        "timeout": config()["TIMEOUT"],
+    }
+
+
+def reiniciar_estadisticas():
+    _cache().delete_many([_clave("hits"), _clave("misses")])
+
+
+# ---------------------------------------------------------
+# Claves de respuesta
+# ---------------------------------------------------------
+
+def clave_peticion(request, extra=""):
+    parametros = sorted(
+        (clave, tuple(sorted(v for v in valores if v != "")))
+        for clave, valores in request.query_params.lists()
+    )
+    parametros = [(clave, valores) for clave, valores in parametros if valores]
+    firma = hashlib.sha1(repr((request.path, parametros, extra)).encode("utf-8")).hexdigest()
+    return _clave(f"{generacion()}:{firma}")
+
+
+class CachePublicoMixin:
+    """
+    Mixin para vistas públicas (list/retrieve) cuya respuesta es igual para
+    todos los visitantes. Añade la cabecera X-Cache: HIT/MISS.
+    """
+
+    def list(self, request, *args, **kwargs):
+        return self.responder_cacheado(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.responder_cacheado(super().retrieve, request, *args, **kwargs)
+
+    def get_clave_extra(self):
+        """
+        Datos que cambian la respuesta sin estar en la URL (p. ej. la ranura
+        que resuelve ?disponible=ahora). Entran en la clave y en el ETag.
+        """
+        return ""
+
+    def get_generacion(self):
+        # Versión para ConditionalGetMixin: la generación ya se mueve con cada
+        # cambio del catálogo. Con la cache desactivada no se incrementa.
+        if not config()["ACTIVO"]:
+            return None
+        extra = self.get_clave_extra()
+        return f"{generacion()}:{extra}" if extra else generacion()
+
+    def responder_cacheado(self, metodo, request, *args, **kwargs):
+        opciones = config()
+        if not opciones["ACTIVO"]:
+            return metodo(request, *args, **kwargs)
+
+        cache = _cache()
+        clave = clave_peticion(request, self.get_clave_extra())
+        datos = cache.get(clave)
+        if datos is not None:
+            registrar("hits")
+            response = Response(datos)
+            response["X-Cache"] = "HIT"
+            return response
+
+        response = metodo(request, *args, **kwargs)
+        registrar("misses")
+        if response.status_code == 200:
+            cache.set(clave, response.data, opciones["TIMEOUT"])
+        response["X-Cache"] = "MISS"
+        return response
@@ -0,0 +1,88 @@
+"""
+GET condicional (ETag / Last-Modified) para vistas genéricas y viewsets de DRF.
+
+La versión del resultado se calcula con una sola consulta agregada sobre el
+queryset ya filtrado: COUNT(*) + MAX(campo de fecha). Si el cliente envía
+If-None-Match / If-Modified-Since y la versión coincide se responde 304 sin
+serializar nada.
+
+- Altas y ediciones mueven el MAX de `campos_version` (campos auto_now).
+- Los borrados cambian el COUNT.
+
+Si la vista ya tiene un contador que se incrementa con cada cambio (la
+generación del catálogo de backend.cache, vía `get_generacion`), la versión
+es ese contador y no se consulta la base de datos: ni en los aciertos de la
+cache pública ni en las páginas por cursor, que así no vuelven a pagar el
+COUNT que la paginación keyset evita.
+"""
+import hashlib
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    # Lookups de fecha cuyo MAX forma parte de la versión. Pueden atravesar
+    # relaciones (p. ej. "trabajador__actualizado") si la respuesta las muestra.
+    campos_version = ("actualizado",)
+
+    def get_queryset_version(self):
+        qs = self.filter_queryset(self.get_queryset())
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        if lookup in self.kwargs:
+            qs = qs.filter(**{self.lookup_field: self.kwargs[lookup]})
+        return qs
+
+    def get_generacion(self):
+        """
+        Contador de versión sin consulta, o None para usar el agregado.
+        Lo aporta el siguiente mixin en el MRO (p. ej. CachePublicoMixin).
+        """
+        siguiente = getattr(super(), "get_generacion", None)
+        return siguiente() if siguiente else None
+
+    def get_version(self):
+        """Devuelve (marca, ultima_modificacion) del resultado."""
+        generacion = self.get_generacion()
+        if generacion is not None:
+            return generacion, None
+
+        # distinct: los campos de versión pueden atravesar relaciones
+        agregados = {"total": Count("pk", distinct=True)}
+        for i, campo in enumerate(self.campos_version):
+            agregados[f"m{i}"] = Max(campo)
+        datos = self.get_queryset_version().order_by().aggregate(**agregados)
+
+        fechas = [datos[f"m{i}"] for i in range(len(self.campos_version))]
+        fechas = [f for f in fechas if f is not None]
+        return datos["total"], max(fechas) if fechas else None
+
+    def get_etag(self, request, marca, ultimo):
+        usuario = request.user.pk if request.user.is_authenticated else ""
+        parametros = sorted(request.query_params.lists())
+        base = repr((request.path, parametros, usuario, marca, ultimo.isoformat() if ultimo else ""))
+        return 'W/"%s"' % hashlib.md5(base.encode("utf-8")).hexdigest()
+
+    def list(self, request, *args, **kwargs):
+        return self.responder_condicional(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.responder_condicional(super().retrieve, request, *args, **kwargs)
+
+    def responder_condicional(self, metodo, request, *args, **kwargs):
+        marca, ultimo = self.get_version()
+        etag = self.get_etag(request, marca, ultimo)
+        last_modified = int(ultimo.timestamp()) if ultimo else None
+
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = metodo(request, *args, **kwargs)
+
+        if 200 <= response.status_code < 300 or response.status_code == 304:
+            response["ETag"] = etag
+            if last_modified:
+                response["Last-Modified"] = http_date(last_modified)
+            # Guardar pero revalidar siempre con el servidor
+            response["Cache-Control"] = "no-cache"
+        return response
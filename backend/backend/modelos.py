@@ -0,0 +1,52 @@
+"""
+Utilidades compartidas por los modelos de varias apps.
+"""
+from django.db import connections, router
+
+
+class CamposCalculadosMixin:
+    """
+    Para modelos con columnas que se mantienen con UPDATE directos en la base
+    de datos (deltas de calificaciones, mapa de disponibilidad). Un save()
+    completo desde una instancia cargada al principio de la petición las
+    pisaría con valores viejos, así que al guardar una fila existente se
+    excluyen de update_fields salvo que se pidan explícitamente.
+    """
+    campos_calculados = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get("update_fields") is None and self.campos_calculados:
+            kwargs["update_fields"] = [
+                campo.name for campo in self._meta.concrete_fields
+                if not campo.primary_key and campo.name not in self.campos_calculados
+            ]
+        super().save(*args, **kwargs)
+
+
+def insertar_o_actualizar(modelo, filas, unique_fields, update_fields):
+    """
+    Upsert en lote de `filas` (instancias de `modelo`) según lo que admita la
+    base de datos:
+
+    - PostgreSQL, SQLite: INSERT ... ON CONFLICT (unique_fields) DO UPDATE.
+    - MySQL/MariaDB: ON DUPLICATE KEY UPDATE, que no acepta destino; vale
+      porque unique_fields es la única clave única además de la primaria.
+    - Sin soporte: update_or_create fila a fila.
+    """
+    if not filas:
+        return
+    features = connections[router.db_for_write(modelo)].features
+    if features.supports_update_conflicts_with_target:
+        modelo.objects.bulk_create(
+            filas, update_conflicts=True, unique_fields=unique_fields, update_fields=update_fields
+        )
+    elif features.supports_update_conflicts:
+        modelo.objects.bulk_create(filas, update_conflicts=True, update_fields=update_fields)
+    else:
+        claves = [modelo._meta.get_field(campo).attname for campo in unique_fields]
+        valores = [modelo._meta.get_field(campo).attname for campo in update_fields]
+        for fila in filas:
+            modelo.objects.update_or_create(
+                **{clave: getattr(fila, clave) for clave in claves},
+                defaults={valor: getattr(fila, valor) for valor in valores},
+            )
@@ -0,0 +1,132 @@
+"""
+Paginación por cursor (keyset) opcional para los listados grandes.
+
+Los clientes actuales siguen recibiendo PageNumberPagination. Si la petición
+trae el parámetro ?cursor= (vacío para la primera página) se pagina por el
+par estable (timestamp, pk) que declara la vista en `keyset_campos`:
+
+- sin OFFSET: cada página es un rango sobre el índice compuesto,
+- sin COUNT(*), salvo que el cliente pida ?total=1,
+- cursores opacos (base64 de la última posición vista).
+"""
+import base64
+import json
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    cursor_query_param = "cursor"
+    total_query_param = "total"
+    invalid_cursor_message = "Cursor inválido."
+
+    def paginate_queryset(self, queryset, request, view=None):
+        campos = getattr(view, "keyset_campos", None)
+        self.keyset = bool(campos) and self.cursor_query_param in request.query_params
+        if not self.keyset:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        self.campo, self.campo_pk = campos
+        self.descendente = getattr(view, "keyset_descendente", True)
+        self.modelo = queryset.model
+        page_size = self.get_page_size(request)
+
+        cursor = self.decodificar_cursor(request)
+        hacia_atras = bool(cursor and cursor["atras"])
+        # Recorrer hacia atrás es recorrer en el orden contrario y luego invertir
+        desc = self.descendente != hacia_atras
+
+        qs = queryset.order_by(*self.orden(desc))
+        if cursor:
+            qs = qs.filter(self.condicion(cursor["valor"], cursor["pk"], desc))
+
+        filas = list(qs[:page_size + 1])
+        hay_mas = len(filas) > page_size
+        filas = filas[:page_size]
+        if hacia_atras:
+            filas.reverse()
+
+        self.hay_siguiente = hay_mas if not hacia_atras else True
+        self.hay_anterior = hay_mas if hacia_atras else cursor is not None
+        self.filas = filas
+
+        self.total = None
+        if request.query_params.get(self.total_query_param) in ("1", "true"):
+            self.total = queryset.order_by().count()
+
+        return filas
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+
+        respuesta = {}
+        if self.total is not None:
+            respuesta["count"] = self.total
+        respuesta["next"] = self.get_next_link()
+        respuesta["previous"] = self.get_previous_link()
+        respuesta["results"] = data
+        return Response(respuesta)
+
+    def get_next_link(self):
+        if not self.keyset:
+            return super().get_next_link()
+        if not self.hay_siguiente or not self.filas:
+            return None
+        return self.link(self.filas[-1], atras=False)
+
+    def get_previous_link(self):
+        if not self.keyset:
+            return super().get_previous_link()
+        if not self.hay_anterior or not self.filas:
+            return None
+        return self.link(self.filas[0], atras=True)
+
+    # -----------------------------------------------------
+    # Helpers
+    # -----------------------------------------------------
+
+    def orden(self, desc):
+        prefijo = "-" if desc else ""
+        return [f"{prefijo}{self.campo}", f"{prefijo}{self.campo_pk}"]
+
+    def condicion(self, valor, pk, desc):
+        # (campo, pk) < (valor, pk) escrito de forma que el índice se use como rango sobre `campo`
+        if desc:
+            return Q(**{f"{self.campo}__lte": valor}) & ~Q(**{self.campo: valor, f"{self.campo_pk}__gte": pk})
+        return Q(**{f"{self.campo}__gte": valor}) & ~Q(**{self.campo: valor, f"{self.campo_pk}__lte": pk})
+
+    def link(self, fila, atras):
+        valor = getattr(fila, self.campo)
+        posicion = {
+            # isoformat completo: DjangoJSONEncoder recorta los microsegundos
+            "v": valor.isoformat() if hasattr(valor, "isoformat") else valor,
+            "p": getattr(fila, self.campo_pk),
+            "a": atras,
+        }
+        crudo = json.dumps(posicion).encode("utf-8")
+        cursor = base64.urlsafe_b64encode(crudo).decode("ascii").rstrip("=")
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def decodificar_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None
+        try:
+            relleno = "=" * (-len(cursor) % 4)
+            posicion = json.loads(base64.urlsafe_b64decode(cursor + relleno))
+            campo = self.modelo._meta.get_field(self.campo)
+            campo_pk = self.modelo._meta.get_field(self.campo_pk)
+            return {
+                "valor": campo.to_python(posicion["v"]),
+                "pk": campo_pk.to_python(posicion["p"]),
+                "atras": bool(posicion.get("a")),
+            }
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
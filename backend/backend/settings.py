@@ -62,6 +62,7 @@ INSTALLED_APPS = [
     'moderacion',
     'chat',
     'membresias',
+    'archivos',
 ]
 
 MIDDLEWARE = [
@@ -94,6 +95,7 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'backend.wsgi.application'
+ASGI_APPLICATION = 'backend.asgi.application'
 
 
 # Database
@@ -151,6 +153,57 @@ REST_FRAMEWORK = {
 
 from datetime import timedelta
 
+# Cache (locmem por defecto). Para compartirla entre procesos:
+# 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+# 'LOCATION': BASE_DIR / 'cache',
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'skilllink',
+    }
+}
+
+# Cache de respuestas de los endpoints públicos del catálogo (backend/cache.py)
+CACHE_PUBLICO = {
+    'ALIAS': 'default',
+    'TIMEOUT': 300,  # segundos
+    'ACTIVO': True,
+}
+
+# Chat en tiempo real (chat.capa). La capa en memoria solo sirve con un
+# único proceso ASGI; con varios, apuntar CAPA a una implementación de CapaBase
+CHAT_TIEMPO_REAL = {
+    'CAPA': 'chat.capa.CapaEnMemoria',
+    'INBOX_CACHE': 60,  # segundos; 0 desactiva la cache de /api/chat/inbox/
+}
+
+# Moderación automática de servicios (moderacion.cola)
+MODERACION = {
+    'MODO': 'hilo',  # 'hilo' | 'externo' (manage.py moderacion_worker) | 'sincrono'
+    'LOTE': 50,
+    'MAX_INTENTOS': 5,
+}
+
+# Agenda de citas por trabajador (solicitudes.agenda)
+AGENDA = {
+    'TIMEOUT': 3600,  # segundos en cache; se invalida al cambiar franjas o citas
+    'HORIZONTE_DIAS': 60,
+}
+
+# Panel del trabajador, GET /api/perfiles/mi-perfil/stats/ (perfiles.estadisticas)
+PANEL_TRABAJADOR = {
+    'TIMEOUT': 300,  # segundos en cache; se invalida con cada cambio de sus datos
+}
+
+# Subidas por fragmentos y descargas de archivos (archivos.subidas)
+ARCHIVOS = {
+    'TAMANO_MAXIMO': {'chat': 20 * 1024 * 1024, 'servicio': 5 * 1024 * 1024},
+    'TAMANO_FRAGMENTO': 5 * 1024 * 1024,
+    # En producción: 'nginx' (X-Accel-Redirect) o 'apache' (X-Sendfile)
+    'SERVIDOR': None,
+    'PREFIJO_INTERNO': '/protegido/',
+}
+
 SIMPLE_JWT = {
     "USER_ID_FIELD": "id_usuario",   # ESTE es el fix clave
     "USER_ID_CLAIM": "user_id",      # cómo se va a llamar en el payload
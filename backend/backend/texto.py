@@ -0,0 +1,23 @@
+import re
+import unicodedata
+
+
+_ESPACIOS = re.compile(r"\s+")
+_PALABRAS = re.compile(r"\w+")
+
+
+def quitar_acentos(texto):
+    """'Plomería' -> 'Plomeria' (la ñ queda como n)."""
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in descompuesto if not unicodedata.combining(c))
+
+
+def normalizar(texto):
+    """Minúsculas, sin acentos y con los espacios colapsados."""
+    if not texto:
+        return ""
+    return _ESPACIOS.sub(" ", quitar_acentos(texto).lower()).strip()
+
+
+def palabras(texto):
+    return _PALABRAS.findall(normalizar(texto))
@@ -85,6 +85,7 @@ urlpatterns = [
     path('api/moderacion/', include('moderacion.urls')),
     path('api/chat/', include('chat.urls')),
     path('api/membresias/', include('membresias.urls')),
+    path('api/archivos/', include('archivos.urls')),
     
 ]
 
@@ -0,0 +1,121 @@
+"""
+Agregados de calificaciones guardados en PerfilTrabajador y en Servicio.
+
+Cada alta, edición o borrado de una Calificacion aplica un delta (suma y
+total) con un único UPDATE por destino, sin volver a agregar todas las
+calificaciones del trabajador o del servicio. Los signals lo hacen dentro de
+la transacción de Calificacion.save()/delete().
+
+`verificar` compara lo guardado con una recomputación completa
+(manage.py verificar_calificaciones).
+"""
+from django.db.models import Case, F, FloatField, Sum, Count, When
+from django.db.models.functions import Cast, Round
+from django.utils import timezone
+
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+
+
+def _actualizar(queryset, suma, total, **extra):
+    nueva_suma = F("calificacion_suma") + suma
+    nuevo_total = F("calificacion_total") + total
+
+    queryset.update(
+        calificacion_suma=nueva_suma,
+        calificacion_total=nuevo_total,
+        calificacion_promedio=Case(
+            When(calificacion_total=-total, then=0.0),
+            default=Round(
+                Cast(nueva_suma, FloatField()) / Cast(nuevo_total, FloatField()),
+                2,
+            ),
+            output_field=FloatField(),
+        ),
+        **extra,
+    )
+
+
+def aplicar_delta(trabajador_id, suma, total):
+    """
+    Suma `suma` puntos y `total` calificaciones al perfil indicado y
+    recalcula el promedio en la misma sentencia.
+    """
+    if not trabajador_id or (suma == 0 and total == 0):
+        return
+
+    ahora = timezone.now()
+    _actualizar(
+        PerfilTrabajador.objects.filter(pk=trabajador_id), suma, total,
+        calificacion_actualizada=ahora,
+        actualizado=ahora,
+    )
+
+
+def aplicar_delta_servicio(servicio_id, suma, total):
+    """Igual que aplicar_delta, sobre los agregados del servicio."""
+    if not servicio_id or (suma == 0 and total == 0):
+        return
+
+    _actualizar(Servicio.objects.filter(pk=servicio_id), suma, total, actualizado=timezone.now())
+
+
+def mover(anterior, actual):
+    """
+    Aplica el paso de una calificación de `anterior` a `actual`, cada uno
+    (trabajador_id, servicio_id, puntaje) o None en altas y borrados.
+    Si el destino no cambia se aplica un solo delta con la diferencia.
+    """
+    for posicion, aplicar in ((0, aplicar_delta), (1, aplicar_delta_servicio)):
+        deltas = {}
+        for fila, signo in ((anterior, -1), (actual, 1)):
+            if fila and fila[posicion]:
+                suma, total = deltas.get(fila[posicion], (0, 0))
+                deltas[fila[posicion]] = (suma + signo * int(fila[2]), total + signo)
+        for destino, (suma, total) in deltas.items():
+            aplicar(destino, suma, total)
+
+
+def calcular_agregados(campo="trabajador"):
+    """
+    Recalcula desde cero (suma, total) por trabajador o por servicio.
+    Devuelve un iterador de dicts {campo, suma, total}.
+    """
+    from .models import Calificacion
+
+    return (
+        Calificacion.objects.filter(**{f"{campo}__isnull": False})
+        .values(campo)
+        .annotate(suma=Sum("puntaje"), total=Count("pk"))
+        .order_by(campo)
+        .iterator()
+    )
+
+
+def promedio(suma, total):
+    return round(suma / total, 2) if total else 0
+
+
+# Modelos con agregados y el campo de Calificacion que apunta a cada uno
+DESTINOS = {
+    "perfiles": (PerfilTrabajador, "trabajador"),
+    "servicios": (Servicio, "servicio"),
+}
+
+
+def verificar(modelo, campo):
+    """
+    Compara los agregados guardados en `modelo` con una recomputación
+    completa. Genera (pk, (suma, total, promedio) guardado, esperado) por
+    cada fila que no coincide.
+    """
+    esperados = {fila[campo]: (fila["suma"], fila["total"]) for fila in calcular_agregados(campo)}
+
+    guardados = modelo.objects.values_list(
+        "pk", "calificacion_suma", "calificacion_total", "calificacion_promedio"
+    ).order_by("pk")
+    for pk, suma, total, guardado_promedio in guardados.iterator():
+        esperada_suma, esperado_total = esperados.get(pk, (0, 0))
+        esperado = (esperada_suma, esperado_total, promedio(esperada_suma, esperado_total))
+        if (suma, total) != esperado[:2] or abs(guardado_promedio - esperado[2]) > 0.005:
+            yield pk, (suma, total, guardado_promedio), esperado
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from perfiles.models import PerfilTrabajador
+from calificaciones.agregados import DESTINOS, calcular_agregados, promedio
+
+
+class Command(BaseCommand):
+    help = "Reconstruye desde cero los agregados de calificaciones de cada perfil de trabajador y de cada servicio."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=500, help="Filas por bulk_update.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            for nombre, (modelo, campo) in DESTINOS.items():
+                actualizados = self.recalcular(modelo, campo, options["lote"])
+                self.stdout.write(self.style.SUCCESS(
+                    f"Agregados recalculados: {actualizados} {nombre} con calificaciones."
+                ))
+
+    def recalcular(self, modelo, campo, lote_max):
+        ahora = timezone.now()
+        extra = {"actualizado": ahora}
+        if modelo is PerfilTrabajador:
+            extra["calificacion_actualizada"] = ahora
+        campos = ["calificacion_suma", "calificacion_total", "calificacion_promedio", *extra]
+        actualizados = 0
+
+        # Primero todos a cero: así quedan bien los que no tienen calificaciones
+        modelo.objects.update(
+            calificacion_suma=0,
+            calificacion_total=0,
+            calificacion_promedio=0,
+            **extra,
+        )
+
+        lote = []
+        for fila in calcular_agregados(campo):
+            lote.append(modelo(
+                pk=fila[campo],
+                calificacion_suma=fila["suma"],
+                calificacion_total=fila["total"],
+                calificacion_promedio=promedio(fila["suma"], fila["total"]),
+                **extra,
+            ))
+            if len(lote) >= lote_max:
+                modelo.objects.bulk_update(lote, campos)
+                actualizados += len(lote)
+                lote = []
+
+        if lote:
+            modelo.objects.bulk_update(lote, campos)
+            actualizados += len(lote)
+        return actualizados
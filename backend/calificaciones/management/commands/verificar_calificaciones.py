@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from perfiles.models import PerfilTrabajador
+from calificaciones.agregados import DESTINOS, verificar
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara los agregados de calificaciones guardados (perfiles y servicios) "
+        "con una recomputación completa. Con --reparar corrige las filas que no coinciden."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--reparar", action="store_true", help="Corrige los agregados inconsistentes.")
+        parser.add_argument("--lote", type=int, default=500, help="Filas por bulk_update al reparar.")
+
+    def handle(self, *args, **options):
+        inconsistentes = 0
+
+        with transaction.atomic():
+            for nombre, (modelo, campo) in DESTINOS.items():
+                filas = list(verificar(modelo, campo))
+                inconsistentes += len(filas)
+                for pk, guardado, esperado in filas:
+                    self.stdout.write(
+                        f"{nombre} {pk}: guardado suma={guardado[0]} total={guardado[1]} promedio={guardado[2]}, "
+                        f"esperado suma={esperado[0]} total={esperado[1]} promedio={esperado[2]}"
+                    )
+                if filas and options["reparar"]:
+                    self.reparar(modelo, filas, options["lote"])
+
+        if not inconsistentes:
+            self.stdout.write(self.style.SUCCESS("Agregados de calificaciones consistentes."))
+        elif options["reparar"]:
+            self.stdout.write(self.style.SUCCESS(f"Agregados reparados: {inconsistentes} filas."))
+        else:
+            raise CommandError(f"{inconsistentes} agregados inconsistentes; usa --reparar para corregirlos.")
+
+    def reparar(self, modelo, filas, lote):
+        ahora = timezone.now()
+        extra = {"actualizado": ahora}
+        if modelo is PerfilTrabajador:
+            extra["calificacion_actualizada"] = ahora
+
+        objetos = [
+            modelo(
+                pk=pk,
+                calificacion_suma=esperado[0],
+                calificacion_total=esperado[1],
+                calificacion_promedio=esperado[2],
+                **extra,
+            )
+            for pk, _, esperado in filas
+        ]
+        modelo.objects.bulk_update(
+            objetos,
+            ["calificacion_suma", "calificacion_total", "calificacion_promedio", *extra],
+            batch_size=lote,
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Sum
+
+
+def poblar_servicios(apps, schema_editor):
+    Calificacion = apps.get_model('calificaciones', 'Calificacion')
+    Servicio = apps.get_model('servicios', 'Servicio')
+    Solicitud = apps.get_model('solicitudes', 'Solicitud')
+
+    Calificacion.objects.filter(solicitud__isnull=False).update(
+        servicio=Subquery(Solicitud.objects.filter(pk=OuterRef('solicitud_id')).values('servicio_id')[:1])
+    )
+
+    servicios = []
+    for fila in (
+        Calificacion.objects.filter(servicio__isnull=False)
+        .values('servicio').annotate(suma=Sum('puntaje'), total=Count('pk')).order_by()
+    ):
+        servicios.append(Servicio(
+            pk=fila['servicio'],
+            calificacion_suma=fila['suma'],
+            calificacion_total=fila['total'],
+            calificacion_promedio=round(fila['suma'] / fila['total'], 2),
+        ))
+    Servicio.objects.bulk_update(
+        servicios, ['calificacion_suma', 'calificacion_total', 'calificacion_promedio'], batch_size=500
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('calificaciones', '0004_actualizado'),
+        ('servicios', '0006_calificaciones'),
+        ('solicitudes', '0005_citas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='calificacion',
+            name='servicio',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='calificaciones', to='servicios.servicio'),
+        ),
+        migrations.RunPython(poblar_servicios, migrations.RunPython.noop),
+    ]
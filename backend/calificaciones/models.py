@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from usuarios.models import Usuario
 from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
 from solicitudes.models import Solicitud
 from django.core.validators import MinValueValidator, MaxValueValidator
 
@@ -27,6 +28,16 @@ class Calificacion(models.Model):
         related_name="calificaciones_recibidas"
     )
 
+    # Copia de solicitud.servicio: la solicitud puede borrarse (SET_NULL) y el
+    # servicio conserva sus agregados
+    servicio = models.ForeignKey(
+        Servicio,
+        on_delete=models.SET_NULL,
+        related_name="calificaciones",
+        null=True,
+        blank=True
+    )
+
     puntaje = models.IntegerField(
     validators=[MinValueValidator(1), MaxValueValidator(5)]
     )
@@ -35,6 +46,27 @@ class Calificacion(models.Model):
 
     fecha = models.DateTimeField(auto_now_add=True)
 
+    # Versión para GET condicional (backend.conditional)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Valores cargados, para calcular el delta de los agregados al editar
+        instance._original = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        if self.servicio_id is None and self.solicitud_id is not None:
+            self.servicio_id = self.solicitud.servicio_id
+        # Los agregados del trabajador se actualizan en signals, dentro de esta transacción
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs):
+        with transaction.atomic():
+            return super().delete(*args, **kwargs)
+
     def __str__(self):
         return f"Calificación {self.puntaje}/5 - {self.cliente.nombre} → {self.trabajador.usuario.nombre}"
 
@@ -0,0 +1,10 @@
+from rest_framework import permissions
+
+
+class EsAutorOSoloLectura(permissions.BasePermission):
+    """Lectura para cualquiera; editar o borrar solo el cliente que calificó."""
+
+    def has_object_permission(self, request, view, obj):
+        if request.method in permissions.SAFE_METHODS:
+            return True
+        return obj.cliente_id == request.user.pk
@@ -12,10 +12,18 @@ class CalificacionSerializer(serializers.ModelSerializer):
             "solicitud",
             "cliente",
             "trabajador",
+            "servicio",
             "cliente_nombre",
             "trabajador_nombre",
             "puntaje",
             "comentario",
             "fecha"
         ]
-        read_only_fields = ["id_calificacion", "fecha", "cliente", "trabajador", "cliente_nombre", "trabajador_nombre"]
+        read_only_fields = ["id_calificacion", "fecha", "cliente", "trabajador", "servicio", "cliente_nombre", "trabajador_nombre"]
+
+
+class EditarCalificacionSerializer(CalificacionSerializer):
+    """Al editar solo cambian puntaje y comentario: la solicitud queda fija."""
+
+    class Meta(CalificacionSerializer.Meta):
+        read_only_fields = CalificacionSerializer.Meta.read_only_fields + ["solicitud"]
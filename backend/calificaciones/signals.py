@@ -0,0 +1,50 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Calificacion
+from .agregados import mover
+
+
+CAMPOS = ("trabajador_id", "servicio_id", "puntaje")
+
+
+def _actual(instance):
+    return instance.trabajador_id, instance.servicio_id, int(instance.puntaje)
+
+
+@receiver(pre_save, sender=Calificacion)
+def recordar_calificacion_anterior(sender, instance, raw=False, **kwargs):
+    """
+    Guarda (trabajador_id, servicio_id, puntaje) tal como estaban en la base
+    de datos, para que post_save aplique solo la diferencia.
+    """
+    instance._anterior = None
+    if raw or instance._state.adding:
+        return
+
+    original = getattr(instance, "_original", None) or {}
+    if all(campo in original for campo in CAMPOS):
+        instance._anterior = tuple(original[campo] for campo in CAMPOS)
+    else:
+        instance._anterior = Calificacion.objects.filter(pk=instance.pk).values_list(*CAMPOS).first()
+
+
+@receiver(post_save, sender=Calificacion)
+def actualizar_agregados(sender, instance, raw=False, **kwargs):
+    """
+    Agregados del trabajador y del servicio. Si la calificación cambió de
+    trabajador o de servicio, se descuenta de uno y se suma al otro.
+    """
+    if raw:
+        return
+
+    actual = _actual(instance)
+    mover(getattr(instance, "_anterior", None), actual)
+
+    instance._anterior = None
+    instance._original = dict(zip(CAMPOS, actual))
+
+
+@receiver(post_delete, sender=Calificacion)
+def descontar_calificacion_borrada(sender, instance, **kwargs):
+    mover(_actual(instance), None)
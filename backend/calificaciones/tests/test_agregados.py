@@ -0,0 +1,145 @@
+import pytest
+from django.core.management import CommandError, call_command
+from calificaciones.models import Calificacion
+from usuarios.models import Usuario
+from perfiles.models import PerfilTrabajador
+from solicitudes.models import Solicitud
+from servicios.models import Servicio
+
+
+def crear_solicitud(cliente, perfil):
+    servicio = Servicio.objects.create(
+        trabajador=perfil,
+        titulo="S",
+        descripcion="desc",
+        categoria="Hogar",
+        precio=10
+    )
+    return Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+
+
+@pytest.mark.django_db
+def test_agregados_se_actualizan_al_crear_editar_y_borrar():
+    cliente = Usuario.objects.create_user(email="ag1@test.com", nombre="C", password="123")
+    tra_u = Usuario.objects.create_user(email="ag2@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=tra_u, categoria_principal="Hogar")
+
+    c1 = Calificacion.objects.create(solicitud=crear_solicitud(cliente, perfil), cliente=cliente, trabajador=perfil, puntaje=5)
+    Calificacion.objects.create(solicitud=crear_solicitud(cliente, perfil), cliente=cliente, trabajador=perfil, puntaje=2)
+
+    perfil.refresh_from_db()
+    assert perfil.calificacion_total == 2
+    assert perfil.calificacion_suma == 7
+    assert perfil.calificacion_promedio == 3.5
+
+    # Edición: solo se aplica la diferencia
+    c1 = Calificacion.objects.get(pk=c1.pk)
+    c1.puntaje = 3
+    c1.save()
+    perfil.refresh_from_db()
+    assert perfil.calificacion_suma == 5
+    assert perfil.calificacion_promedio == 2.5
+
+    Calificacion.objects.all().delete()
+    perfil.refresh_from_db()
+    assert perfil.calificacion_total == 0
+    assert perfil.calificacion_promedio == 0
+
+
+@pytest.mark.django_db
+def test_recalcular_calificaciones_reconstruye_agregados():
+    cliente = Usuario.objects.create_user(email="ag3@test.com", nombre="C", password="123")
+    tra_u = Usuario.objects.create_user(email="ag4@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=tra_u, categoria_principal="Hogar")
+    for puntaje in [4, 5, 5]:
+        Calificacion.objects.create(solicitud=crear_solicitud(cliente, perfil), cliente=cliente, trabajador=perfil, puntaje=puntaje)
+
+    # Se corrompen los agregados a propósito
+    PerfilTrabajador.objects.filter(pk=perfil.pk).update(calificacion_suma=0, calificacion_total=0, calificacion_promedio=0)
+
+    call_command("recalcular_calificaciones")
+
+    perfil.refresh_from_db()
+    assert perfil.calificacion_total == 3
+    assert perfil.calificacion_suma == 14
+    assert perfil.calificacion_promedio == 4.67
+
+
+@pytest.mark.django_db
+def test_agregados_del_servicio():
+    cliente = Usuario.objects.create_user(email="ag5@test.com", nombre="C", password="123")
+    tra_u = Usuario.objects.create_user(email="ag6@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=tra_u, categoria_principal="Hogar")
+    s1, s2 = crear_solicitud(cliente, perfil), crear_solicitud(cliente, perfil)
+
+    c1 = Calificacion.objects.create(solicitud=s1, cliente=cliente, trabajador=perfil, puntaje=5)
+    Calificacion.objects.create(solicitud=s2, cliente=cliente, trabajador=perfil, puntaje=3)
+    # El servicio se toma de la solicitud
+    assert c1.servicio_id == s1.servicio_id
+
+    c1 = Calificacion.objects.get(pk=c1.pk)
+    c1.puntaje = 4
+    c1.save()
+    s1.servicio.refresh_from_db()
+    assert (s1.servicio.calificacion_suma, s1.servicio.calificacion_total, s1.servicio.calificacion_promedio) == (4, 1, 4)
+
+    # Borrar la solicitud no le quita la calificación al servicio
+    s1.delete()
+    s1.servicio.refresh_from_db()
+    assert s1.servicio.calificacion_total == 1
+
+    c1.delete()
+    s1.servicio.refresh_from_db()
+    s2.servicio.refresh_from_db()
+    assert s1.servicio.calificacion_total == 0
+    assert s2.servicio.calificacion_promedio == 3
+
+
+@pytest.mark.django_db
+def test_verificar_calificaciones_detecta_y_repara():
+    cliente = Usuario.objects.create_user(email="ag7@test.com", nombre="C", password="123")
+    tra_u = Usuario.objects.create_user(email="ag8@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=tra_u, categoria_principal="Hogar")
+    solicitud = crear_solicitud(cliente, perfil)
+    Calificacion.objects.create(solicitud=solicitud, cliente=cliente, trabajador=perfil, puntaje=4)
+
+    call_command("verificar_calificaciones")
+
+    PerfilTrabajador.objects.filter(pk=perfil.pk).update(calificacion_suma=9)
+    Servicio.objects.filter(pk=solicitud.servicio_id).update(calificacion_total=0, calificacion_promedio=0)
+
+    with pytest.raises(CommandError):
+        call_command("verificar_calificaciones")
+
+    call_command("verificar_calificaciones", reparar=True)
+    call_command("verificar_calificaciones")
+
+    perfil.refresh_from_db()
+    servicio = Servicio.objects.get(pk=solicitud.servicio_id)
+    assert (perfil.calificacion_suma, perfil.calificacion_total) == (4, 1)
+    assert (servicio.calificacion_total, servicio.calificacion_promedio) == (1, 4)
+
+
+@pytest.mark.django_db
+def test_save_completo_no_pisa_los_agregados():
+    cliente = Usuario.objects.create_user(email="ag9@test.com", nombre="C", password="123")
+    tra_u = Usuario.objects.create_user(email="ag10@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=tra_u, categoria_principal="Hogar")
+    solicitud = crear_solicitud(cliente, perfil)
+
+    # Instancias cargadas antes de la calificación, como en una edición en curso
+    perfil_viejo = PerfilTrabajador.objects.get(pk=perfil.pk)
+    servicio_viejo = Servicio.objects.get(pk=solicitud.servicio_id)
+    Calificacion.objects.create(solicitud=solicitud, cliente=cliente, trabajador=perfil, puntaje=4)
+
+    perfil_viejo.descripcion = "Nueva descripción"
+    perfil_viejo.save()
+    servicio_viejo.titulo = "Nuevo título"
+    servicio_viejo.save()
+
+    perfil.refresh_from_db()
+    servicio = Servicio.objects.get(pk=solicitud.servicio_id)
+    assert perfil.descripcion == "Nueva descripción"
+    assert (perfil.calificacion_suma, perfil.calificacion_total, perfil.calificacion_promedio) == (4, 1, 4)
+    assert servicio.titulo == "Nuevo título"
+    assert (servicio.calificacion_total, servicio.calificacion_promedio) == (1, 4)
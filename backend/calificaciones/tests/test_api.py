@@ -0,0 +1,58 @@
+import pytest
+from rest_framework.test import APIClient
+
+from calificaciones.models import Calificacion
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def calificacion():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio, estado="finalizada")
+    return Calificacion.objects.create(solicitud=solicitud, cliente=cliente, trabajador=perfil, puntaje=5)
+
+
+def api(usuario=None):
+    client = APIClient()
+    if usuario:
+        client.force_authenticate(user=usuario)
+    return client
+
+
+def test_listado_publico_y_filtros(calificacion):
+    res = api().get("/api/calificaciones/", {"servicio": calificacion.servicio_id, "puntuacion_min": 4})
+    assert res.status_code == 200
+    assert [c["id_calificacion"] for c in res.data["results"]] == [calificacion.pk]
+    assert api().get("/api/calificaciones/", {"puntuacion_max": 3}).data["count"] == 0
+
+
+def test_solo_el_autor_edita_y_borra(calificacion):
+    url = f"/api/calificaciones/{calificacion.pk}/"
+    trabajador = calificacion.trabajador.usuario
+
+    assert api().patch(url, {"puntaje": 1}).status_code == 401
+    assert api(trabajador).patch(url, {"puntaje": 1}).status_code == 403
+    assert api(trabajador).delete(url).status_code == 403
+
+    res = api(calificacion.cliente).patch(url, {"puntaje": 2, "solicitud": None}, format="json")
+    assert res.status_code == 200
+    perfil = PerfilTrabajador.objects.get(pk=calificacion.trabajador_id)
+    servicio = Servicio.objects.get(pk=calificacion.servicio_id)
+    assert (perfil.calificacion_suma, perfil.calificacion_total) == (2, 1)
+    assert servicio.calificacion_promedio == 2
+    # La solicitud no se puede cambiar al editar
+    assert Calificacion.objects.get(pk=calificacion.pk).solicitud_id == calificacion.solicitud_id
+
+    assert api(calificacion.cliente).delete(url).status_code == 204
+    servicio.refresh_from_db()
+    assert servicio.calificacion_total == 0
+
+
+def test_altas_solo_por_crear(calificacion):
+    assert api(calificacion.cliente).post("/api/calificaciones/", {"puntaje": 3}).status_code == 405
@@ -1,7 +1,11 @@
-from django.urls import path
-from .views import CrearCalificacionView
+from django.urls import path, include
+from rest_framework.routers import DefaultRouter
+from .views import CrearCalificacionView, CalificacionViewSet
+
+router = DefaultRouter()
+router.register(r'', CalificacionViewSet, basename='calificacion')
 
 urlpatterns = [
     path('crear/', CrearCalificacionView.as_view(), name='crear-calificacion'),
+    path('', include(router.urls)),
 ]
-
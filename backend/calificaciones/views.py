@@ -1,10 +1,9 @@
 from rest_framework import generics, permissions, viewsets, serializers
 from .models import Calificacion
-from .serializers import CalificacionSerializer
+from .serializers import CalificacionSerializer, EditarCalificacionSerializer
 from .filters import CalificacionFilter
-from django.db.models.signals import post_save
-from django.dispatch import receiver
-from django.db import models
+from .permissions import EsAutorOSoloLectura
+from backend.conditional import ConditionalGetMixin
 
 class CrearCalificacionView(generics.CreateAPIView):
     serializer_class = CalificacionSerializer
@@ -28,23 +27,26 @@ class CrearCalificacionView(generics.CreateAPIView):
         # Guardar con los campos correctos
         serializer.save(
             cliente=solicitud.cliente,
-            trabajador=solicitud.trabajador
+            trabajador=solicitud.trabajador,
+            servicio=solicitud.servicio
         )
 
 
-class CalificacionViewSet(viewsets.ModelViewSet):
-    queryset = Calificacion.objects.all()
+class CalificacionViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    """
+    Listado, detalle, edición y borrado de calificaciones. Las altas siguen
+    en crear/, que valida la solicitud. Editar o borrar solo puede el autor;
+    los agregados del trabajador y del servicio se ajustan en signals.
+    """
+    queryset = Calificacion.objects.select_related("cliente", "trabajador__usuario").order_by("-fecha", "-pk")
     serializer_class = CalificacionSerializer
+    permission_classes = [permissions.IsAuthenticatedOrReadOnly, EsAutorOSoloLectura]
     filterset_class = CalificacionFilter
     ordering_fields = ['fecha', 'puntaje']
     search_fields = ['comentario']
+    http_method_names = ["get", "put", "patch", "delete", "head", "options"]
 
-@receiver(post_save, sender=Calificacion)
-def actualizar_promedio_calificacion(sender, instance, created, **kwargs):
-    if created:
-        solicitud = instance.solicitud
-        calificaciones = Calificacion.objects.filter(solicitud=solicitud)
-        promedio = calificaciones.aggregate(promedio=models.Avg('puntaje'))['promedio']
-        solicitud.promedio_calificacion = promedio
-        solicitud.save()
-
+    def get_serializer_class(self):
+        if self.action in ("update", "partial_update"):
+            return EditarCalificacionSerializer
+        return CalificacionSerializer
@@ -1,4 +1,6 @@
 from django.contrib import admin
-from .models import Mensaje
+from .models import Mensaje, LecturaConversacion, ConversacionArchivada
 
 admin.site.register(Mensaje)
+admin.site.register(LecturaConversacion)
+admin.site.register(ConversacionArchivada)
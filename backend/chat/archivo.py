@@ -0,0 +1,145 @@
+"""
+Archivo en frío de conversaciones cerradas.
+
+Los mensajes de solicitudes finalizadas o rechazadas sin actividad en los
+últimos N días salen de chat_mensaje hacia ConversacionArchivada: bloques de
+hasta `lote` mensajes serializados en JSON y comprimidos con gzip. Así las
+tablas calientes (y sus índices) solo guardan conversaciones vivas.
+
+Cada bloque se escribe y sus mensajes se borran en la misma transacción: si
+el proceso se corta, al relanzarlo sigue con lo que quede (las
+conversaciones ya archivadas dejan de ser candidatas).
+
+La lectura (`mensajes_archivados`) devuelve los mensajes con el mismo formato
+que MensajeSerializer para mezclarlos con el historial vivo. Los adjuntos
+siguen en el storage y se descargan con permisos vía `adjunto_archivado`.
+"""
+import gzip
+import json
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from solicitudes.models import Solicitud
+
+from .models import ConversacionArchivada, LecturaConversacion, Mensaje
+from . import inbox
+
+
+ESTADOS_ARCHIVABLES = ("finalizada", "rechazada")
+
+
+def comprimir(filas):
+    return gzip.compress(json.dumps(filas, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def descomprimir(contenido):
+    return json.loads(gzip.decompress(bytes(contenido)).decode("utf-8"))
+
+
+def _fila(mensaje):
+    return {
+        "id_mensaje": mensaje.id_mensaje,
+        "remitente": mensaje.remitente_id,
+        "remitente_nombre": mensaje.remitente.nombre,
+        "texto": mensaje.texto,
+        "archivo": mensaje.archivo.name or None,
+        "fecha_envio": mensaje.fecha_envio.isoformat(),
+    }
+
+
+def candidatas(dias):
+    """Solicitudes cerradas cuyo último mensaje es anterior a `dias` días."""
+    limite = timezone.now() - timedelta(days=dias)
+    return (
+        Solicitud.objects.filter(estado__in=ESTADOS_ARCHIVABLES)
+        .annotate(ultimo_mensaje=Max("mensajes__fecha_envio"))
+        .filter(ultimo_mensaje__lt=limite)
+        .order_by("pk")
+    )
+
+
+def _borrar(mensajes):
+    """
+    DELETE directo del bloque: Mensaje no tiene dependientes y las señales
+    post_delete harían una consulta por mensaje (la bandeja se invalida una
+    vez al final). Los triggers del índice FTS sí se ejecutan.
+    """
+    marcadores = ", ".join(["%s"] * len(mensajes))
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"DELETE FROM {Mensaje._meta.db_table} WHERE id_mensaje IN ({marcadores})",
+            [m.pk for m in mensajes],
+        )
+
+
+def archivar_conversacion(solicitud, lote=500):
+    """Mueve todos los mensajes de `solicitud` al archivo, un bloque por transacción."""
+    total = 0
+    while True:
+        with transaction.atomic():
+            mensajes = list(
+                Mensaje.objects.filter(solicitud=solicitud)
+                .select_related("remitente")
+                .select_for_update()
+                .order_by("id_mensaje")[:lote]
+            )
+            if not mensajes:
+                break
+            ConversacionArchivada.objects.create(
+                solicitud=solicitud,
+                desde_id=mensajes[0].id_mensaje,
+                hasta_id=mensajes[-1].id_mensaje,
+                cantidad=len(mensajes),
+                contenido=comprimir([_fila(m) for m in mensajes]),
+            )
+            _borrar(mensajes)
+        total += len(mensajes)
+
+    if total:
+        inbox.invalidar(solicitud.cliente_id, solicitud.trabajador.usuario_id)
+    return total
+
+
+def archivar(dias, lote=500, max_conversaciones=None):
+    """Devuelve (conversaciones, mensajes) archivados."""
+    conversaciones = mensajes = 0
+    for solicitud in candidatas(dias).select_related("trabajador").iterator():
+        if max_conversaciones is not None and conversaciones >= max_conversaciones:
+            break
+        mensajes += archivar_conversacion(solicitud, lote)
+        conversaciones += 1
+    return conversaciones, mensajes
+
+
+def adjunto_archivado(id_mensaje):
+    """(solicitud_id, nombre en el storage) del adjunto de un mensaje archivado, o None."""
+    # Los rangos de bloques de conversaciones distintas pueden solaparse
+    bloques = ConversacionArchivada.objects.filter(desde_id__lte=id_mensaje, hasta_id__gte=id_mensaje)
+    for solicitud_id, contenido in bloques.values_list("solicitud_id", "contenido"):
+        for fila in descomprimir(contenido):
+            if fila["id_mensaje"] == id_mensaje:
+                return (solicitud_id, fila["archivo"]) if fila["archivo"] else None
+    return None
+
+
+def mensajes_archivados(solicitud_id):
+    """Historial archivado de la conversación, en orden, con el formato de MensajeSerializer."""
+    lecturas = dict(
+        LecturaConversacion.objects.filter(solicitud_id=solicitud_id).values_list("usuario_id", "ultimo_leido")
+    )
+    resultado = []
+    bloques = ConversacionArchivada.objects.filter(solicitud_id=solicitud_id).order_by("desde_id")
+    for contenido in bloques.values_list("contenido", flat=True):
+        for fila in descomprimir(contenido):
+            fila["solicitud"] = solicitud_id
+            fila["fecha_envio"] = parse_datetime(fila["fecha_envio"])
+            fila["leido"] = any(
+                usuario_id != fila["remitente"] and ultimo >= fila["id_mensaje"]
+                for usuario_id, ultimo in lecturas.items()
+            )
+            resultado.append(fila)
+    return resultado
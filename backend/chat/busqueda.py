@@ -0,0 +1,134 @@
+"""
+Búsqueda de texto completo en el historial de chat (GET /api/chat/buscar/).
+
+- SQLite: tabla FTS5 `chat_mensaje_fts` con contenido externo (chat_mensaje),
+  mantenida por triggers en cada INSERT/DELETE/UPDATE del texto, unida una
+  vez a chat_mensaje. Ranking bm25 y fragmento con snippet().
+- PostgreSQL: índice GIN sobre to_tsvector('spanish', texto); ts_rank y ts_headline.
+- Otras: LIKE por término, sin ranking.
+
+Siempre se busca dentro de las conversaciones del usuario. El fragmento sale
+con los términos entre marcadores de control que el serializer convierte en
+<mark> después de escapar el HTML del mensaje.
+
+Las tablas/índices se crean en la migración chat.0008_busqueda.
+"""
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, CharField, F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from solicitudes.models import Solicitud
+
+from .models import Mensaje
+
+
+MAX_TERMINOS = 8
+TABLA_FTS = "chat_mensaje_fts"
+PALABRAS_FRAGMENTO = 12
+
+INICIO_MARCA = "\x02"
+FIN_MARCA = "\x03"
+
+_PALABRAS = re.compile(r"\w+")
+
+
+def terminos(texto):
+    # Sin quitar acentos: FTS5 los ignora en el tokenizer y el diccionario
+    # 'spanish' de PostgreSQL los necesita para el stemming
+    return _PALABRAS.findall((texto or "").lower())[:MAX_TERMINOS]
+
+
+class BackendBusqueda:
+    def filtrar(self, qs, terminos):
+        """Filtra `qs` y anota `rango` (mayor es mejor) y `fragmento`."""
+        for termino in terminos:
+            qs = qs.filter(texto__icontains=termino)
+        return qs.annotate(
+            rango=Value(0.0, output_field=FloatField()),
+            fragmento=Value(None, output_field=CharField()),
+        )
+
+    def reconstruir(self):
+        pass
+
+
+class BackendSQLite(BackendBusqueda):
+    def filtrar(self, qs, terminos):
+        consulta = " ".join(f'"{t}"*' for t in terminos)
+        tabla = Mensaje._meta.db_table
+        # La tabla FTS entra una vez en el FROM: MATCH se evalúa una sola vez
+        # por consulta y bm25()/snippet() leen la fila FTS ya encontrada, en
+        # lugar de subconsultas correlacionadas que repiten MATCH por fila
+        qs = qs.extra(
+            tables=[TABLA_FTS],
+            where=[f"{TABLA_FTS}.rowid = {tabla}.id_mensaje", f"{TABLA_FTS} MATCH %s"],
+            params=[consulta],
+        )
+        return qs.annotate(
+            rango=RawSQL(f"-bm25({TABLA_FTS})", [], output_field=FloatField()),
+            fragmento=RawSQL(
+                f"snippet({TABLA_FTS}, 0, %s, %s, '…', {PALABRAS_FRAGMENTO})",
+                [INICIO_MARCA, FIN_MARCA],
+                output_field=CharField(),
+            ),
+        )
+
+    def reconstruir(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('optimize')")
+
+
+class BackendPostgres(BackendBusqueda):
+    def filtrar(self, qs, terminos):
+        consulta = " & ".join(f"{t}:*" for t in terminos)
+        tabla = Mensaje._meta.db_table
+        # Misma expresión que el índice GIN para que el planner lo use
+        vector = f"to_tsvector('spanish', coalesce({tabla}.texto, ''))"
+        coincide = RawSQL(f"{vector} @@ to_tsquery('spanish', %s)", [consulta], output_field=BooleanField())
+        rango = RawSQL(f"ts_rank({vector}, to_tsquery('spanish', %s))", [consulta], output_field=FloatField())
+        fragmento = RawSQL(
+            f"ts_headline('spanish', {tabla}.texto, to_tsquery('spanish', %s), %s)",
+            [consulta, f"StartSel={INICIO_MARCA}, StopSel={FIN_MARCA}, MaxWords={PALABRAS_FRAGMENTO}, MinWords=4"],
+            output_field=CharField(),
+        )
+        return qs.annotate(coincide=coincide).filter(coincide=True).annotate(rango=rango, fragmento=fragmento)
+
+
+_fts_disponible = None
+
+
+def _sqlite_tiene_fts():
+    global _fts_disponible
+    if _fts_disponible is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [TABLA_FTS])
+            _fts_disponible = cursor.fetchone() is not None
+    return _fts_disponible
+
+
+def get_backend():
+    if connection.vendor == "sqlite" and _sqlite_tiene_fts():
+        return BackendSQLite()
+    if connection.vendor == "postgresql":
+        return BackendPostgres()
+    return BackendBusqueda()
+
+
+def buscar(usuario, texto, solicitud_id=None):
+    """
+    Mensajes de las conversaciones de `usuario` que contienen `texto`,
+    ordenados por relevancia. Sin palabras en el texto, ninguno.
+    """
+    consulta = terminos(texto)
+    if not consulta:
+        return Mensaje.objects.none()
+
+    solicitudes = Solicitud.objects.filter(Q(cliente=usuario) | Q(trabajador__usuario=usuario))
+    if solicitud_id is not None:
+        solicitudes = solicitudes.filter(pk=solicitud_id)
+
+    qs = Mensaje.objects.filter(solicitud__in=solicitudes.values("pk")).select_related("remitente")
+    return get_backend().filtrar(qs, consulta).order_by(F("rango").desc(nulls_last=True), "-id_mensaje")
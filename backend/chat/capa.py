@@ -0,0 +1,109 @@
+"""
+Capa de difusión del chat en tiempo real.
+
+Cada conversación (Solicitud) es un grupo "solicitud.<id>". Las conexiones
+WebSocket se suscriben a su grupo y reciben los eventos que se publiquen en él.
+
+La capa por defecto vive en memoria del proceso: no necesita servicios
+externos, pero solo llega a las conexiones atendidas por el MISMO proceso
+ASGI. Para varios procesos o nodos se implementa CapaBase sobre un broker
+(Redis pub/sub, PostgreSQL LISTEN/NOTIFY...) y se configura en
+settings.CHAT_TIEMPO_REAL["CAPA"].
+"""
+import asyncio
+import threading
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+CONFIG_POR_DEFECTO = {
+    "CAPA": "chat.capa.CapaEnMemoria",
+    "TAMANO_COLA": 100,  # eventos pendientes por conexión antes de descartar
+    "INBOX_CACHE": 60,  # segundos de cache de /api/chat/inbox/ (0 = sin cache)
+}
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "CHAT_TIEMPO_REAL", {})}
+
+
+def nueva_cola():
+    return asyncio.Queue(maxsize=config()["TAMANO_COLA"])
+
+
+def grupo_solicitud(solicitud_id):
+    return f"solicitud.{solicitud_id}"
+
+
+class CapaBase:
+    """Interfaz de una capa de difusión."""
+
+    async def suscribir(self, grupo, cola=None):
+        """
+        Devuelve la asyncio.Queue donde llegarán los eventos del grupo.
+        Pasando la misma `cola` se escuchan varios grupos a la vez.
+        """
+        raise NotImplementedError
+
+    async def desuscribir(self, grupo, cola):
+        raise NotImplementedError
+
+    def publicar(self, grupo, evento):
+        """
+        Envía `evento` (dict serializable a JSON) a los suscriptores del grupo.
+        Se puede llamar desde código síncrono y desde cualquier hilo.
+        """
+        raise NotImplementedError
+
+
+class CapaEnMemoria(CapaBase):
+
+    def __init__(self):
+        self._grupos = {}
+        self._candado = threading.Lock()
+
+    async def suscribir(self, grupo, cola=None):
+        if cola is None:
+            cola = nueva_cola()
+        with self._candado:
+            self._grupos.setdefault(grupo, set()).add((asyncio.get_running_loop(), cola))
+        return cola
+
+    async def desuscribir(self, grupo, cola):
+        with self._candado:
+            suscriptores = self._grupos.get(grupo, set())
+            suscriptores.discard((asyncio.get_running_loop(), cola))
+            if not suscriptores:
+                self._grupos.pop(grupo, None)
+
+    def suscriptores(self, grupo):
+        with self._candado:
+            return len(self._grupos.get(grupo, ()))
+
+    def publicar(self, grupo, evento):
+        with self._candado:
+            suscriptores = list(self._grupos.get(grupo, ()))
+        for loop, cola in suscriptores:
+            if loop.is_closed():
+                continue
+            loop.call_soon_threadsafe(_entregar, cola, evento)
+
+
+def _entregar(cola, evento):
+    # Un cliente que no lee no debe frenar a los demás: se descarta lo más viejo
+    if cola.full():
+        cola.get_nowait()
+    cola.put_nowait(evento)
+
+
+_capa = None
+_candado_capa = threading.Lock()
+
+
+def get_capa():
+    global _capa
+    with _candado_capa:
+        if _capa is None:
+            _capa = import_string(config()["CAPA"])()
+        return _capa
@@ -1,5 +1,7 @@
 import django_filters
-from .models import Mensaje
+from django.db.models import F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Mensaje, LecturaConversacion
 
 
 class MensajeFilter(django_filters.FilterSet):
@@ -7,9 +9,21 @@ class MensajeFilter(django_filters.FilterSet):
     remitente = django_filters.NumberFilter(field_name='remitente__id_usuario')
     fecha_desde = django_filters.DateTimeFilter(field_name='fecha_envio', lookup_expr='gte')
     fecha_hasta = django_filters.DateTimeFilter(field_name='fecha_envio', lookup_expr='lte')
-    leido = django_filters.BooleanFilter()
-    contenido = django_filters.CharFilter(lookup_expr='icontains')
+    leido = django_filters.BooleanFilter(method='filtrar_leido')
+    contenido = django_filters.CharFilter(field_name='texto', lookup_expr='icontains')
     
     class Meta:
         model = Mensaje
-        fields = ['solicitud', 'remitente', 'leido']
+        fields = ['solicitud', 'remitente']
+
+    def filtrar_leido(self, queryset, name, value):
+        # Mensajes recibidos por el usuario hasta (o después de) su marca de lectura
+        marca = Coalesce(Subquery(
+            LecturaConversacion.objects.filter(
+                solicitud=OuterRef('solicitud'), usuario=self.request.user
+            ).values('ultimo_leido')[:1]
+        ), 0)
+        recibidos = queryset.exclude(remitente=self.request.user).annotate(marca_lectura=marca)
+        if value:
+            return recibidos.filter(id_mensaje__lte=F('marca_lectura'))
+        return recibidos.filter(id_mensaje__gt=F('marca_lectura'))
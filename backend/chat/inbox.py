@@ -0,0 +1,75 @@
+"""
+Bandeja de conversaciones del usuario (GET /api/chat/inbox/).
+
+Una sola consulta: cada Solicitud del usuario con subconsultas correlacionadas
+sobre el índice (solicitud, id_mensaje) para el último mensaje y sobre la
+marca de lectura (LecturaConversacion) para el conteo de no leídos.
+
+La respuesta se puede cachear por usuario (CHAT_TIEMPO_REAL["INBOX_CACHE"],
+segundos; 0 la desactiva). Cada usuario tiene una generación que se
+incrementa con mensajes nuevos, lecturas y cambios en sus solicitudes.
+"""
+import hashlib
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from backend.cache import incrementar_generacion, leer_generacion
+from solicitudes.models import Solicitud
+
+from .capa import config
+from .models import LecturaConversacion, Mensaje
+
+
+def conversaciones(usuario):
+    ultimo = Mensaje.objects.filter(solicitud=OuterRef("pk")).order_by("-id_mensaje")
+    marca = LecturaConversacion.objects.filter(solicitud=OuterRef("pk"), usuario=usuario).values("ultimo_leido")[:1]
+    no_leidos = (
+        Mensaje.objects.filter(solicitud=OuterRef("pk"), id_mensaje__gt=OuterRef("marca_lectura"))
+        .exclude(remitente=usuario)
+        .order_by()
+        .values("solicitud")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+
+    return (
+        Solicitud.objects.filter(Q(cliente=usuario) | Q(trabajador__usuario=usuario))
+        .select_related("cliente", "trabajador__usuario", "servicio")
+        .annotate(
+            ultimo_id=Subquery(ultimo.values("id_mensaje")[:1]),
+            ultimo_texto=Subquery(ultimo.values("texto")[:1]),
+            ultimo_fecha=Subquery(ultimo.values("fecha_envio")[:1]),
+            ultimo_remitente=Subquery(ultimo.values("remitente")[:1]),
+            marca_lectura=Coalesce(Subquery(marca), 0),
+            no_leidos=Coalesce(Subquery(no_leidos, output_field=IntegerField()), 0),
+        )
+        .order_by(F("ultimo_fecha").desc(nulls_last=True), "-fecha_solicitud", "-pk")
+    )
+
+
+# ---------------------------------------------------------
+# Cache por usuario
+# ---------------------------------------------------------
+
+def _clave_generacion(usuario_id):
+    return f"inbox:gen:{usuario_id}"
+
+
+def generacion(usuario_id):
+    return leer_generacion(_clave_generacion(usuario_id))
+
+
+def invalidar(*usuario_ids):
+    for usuario_id in set(filter(None, usuario_ids)):
+        incrementar_generacion(_clave_generacion(usuario_id))
+
+
+def clave_respuesta(request):
+    parametros = sorted(request.query_params.lists())
+    firma = hashlib.sha1(repr(parametros).encode("utf-8")).hexdigest()
+    return f"inbox:{request.user.pk}:{generacion(request.user.pk)}:{firma}"
+
+
+def timeout_cache():
+    return config().get("INBOX_CACHE", 0)
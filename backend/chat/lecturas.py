@@ -0,0 +1,60 @@
+"""
+Marcas de lectura por conversación (LecturaConversacion).
+
+Un participante leyó todo lo que tenga id_mensaje <= su ultimo_leido.
+Marcar como leído toca una sola fila y contar no leídos es un conteo por
+rango sobre el índice (solicitud, id_mensaje).
+"""
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import LecturaConversacion, Mensaje
+from .tiempo_real import publicar_lectura
+from . import inbox
+
+
+def ultimo_leido(solicitud_id, usuario):
+    return (
+        LecturaConversacion.objects.filter(solicitud_id=solicitud_id, usuario=usuario)
+        .values_list("ultimo_leido", flat=True).first()
+    ) or 0
+
+
+def recibidos_despues(solicitud_id, usuario, desde):
+    return Mensaje.objects.filter(solicitud_id=solicitud_id, id_mensaje__gt=desde).exclude(remitente=usuario)
+
+
+def no_leidos(solicitud_id, usuario):
+    return recibidos_despues(solicitud_id, usuario, ultimo_leido(solicitud_id, usuario)).count()
+
+
+def marcar_leidos(solicitud_id, usuario):
+    """
+    Mueve la marca del usuario hasta el último mensaje de la conversación.
+    Devuelve cuántos mensajes recibidos pasaron a leídos y avisa al grupo.
+    """
+    ultimo = Mensaje.objects.filter(solicitud_id=solicitud_id).aggregate(ultimo=Max("id_mensaje"))["ultimo"]
+    if ultimo is None:
+        return 0
+
+    anterior = ultimo_leido(solicitud_id, usuario)
+    if anterior >= ultimo:
+        return 0
+
+    # La condición ultimo_leido < ultimo evita retroceder si otra petición ya avanzó más
+    actualizadas = LecturaConversacion.objects.filter(
+        solicitud_id=solicitud_id, usuario=usuario, ultimo_leido__lt=ultimo
+    ).update(ultimo_leido=ultimo, actualizado=timezone.now())
+    if not actualizadas:
+        LecturaConversacion.objects.get_or_create(
+            solicitud_id=solicitud_id, usuario=usuario, defaults={"ultimo_leido": ultimo}
+        )
+
+    inbox.invalidar(usuario.pk)
+
+    cantidad = Mensaje.objects.filter(
+        solicitud_id=solicitud_id, id_mensaje__gt=anterior, id_mensaje__lte=ultimo
+    ).exclude(remitente=usuario).count()
+    if cantidad:
+        publicar_lectura(solicitud_id, usuario.pk, cantidad)
+    return cantidad
@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from chat.archivo import archivar
+
+
+class Command(BaseCommand):
+    help = (
+        "Mueve los mensajes de solicitudes finalizadas o rechazadas sin actividad reciente "
+        "a bloques comprimidos (ConversacionArchivada). Se puede interrumpir y relanzar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dias", type=int, default=180, help="Días sin mensajes para archivar una conversación.")
+        parser.add_argument("--lote", type=int, default=500, help="Mensajes por bloque (y por transacción).")
+        parser.add_argument("--max-conversaciones", type=int, default=None, help="Parar tras N conversaciones.")
+
+    def handle(self, *args, **options):
+        conversaciones, mensajes = archivar(options["dias"], options["lote"], options["max_conversaciones"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{mensajes} mensajes archivados de {conversaciones} conversaciones."
+        ))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from chat.busqueda import get_backend
+
+
+class Command(BaseCommand):
+    help = "Reconstruye y optimiza el índice de texto completo de los mensajes del chat."
+
+    def handle(self, *args, **options):
+        get_backend().reconstruir()
+        self.stdout.write(self.style.SUCCESS("Índice de mensajes reconstruido."))
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0002_initial'),
+        ('solicitudes', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['solicitud', 'fecha_envio', 'id_mensaje'], name='mensaje_sol_fecha_pk_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['fecha_envio', 'id_mensaje'], name='mensaje_fecha_pk_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_indices_keyset'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mensaje',
+            name='actualizado',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_actualizado'),
+        ('solicitudes', '0003_indices_keyset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mensaje',
+            index=models.Index(fields=['solicitud', 'id_mensaje'], name='mensaje_sol_pk_idx'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max
+
+
+
+def migrar_leidos(apps, schema_editor):
+    """
+    Cada participante queda con el mayor id_mensaje que ya tenía marcado
+    como leído entre los mensajes que recibió.
+    """
+    Mensaje = apps.get_model("chat", "Mensaje")
+    LecturaConversacion = apps.get_model("chat", "LecturaConversacion")
+
+    filas = (
+        Mensaje.objects.filter(leido=True)
+        .values("solicitud_id", "remitente_id", "solicitud__cliente_id", "solicitud__trabajador__usuario_id")
+        .annotate(ultimo=Max("id_mensaje"))
+        .order_by()
+    )
+    marcas = {}
+    for fila in filas.iterator():
+        participantes = {fila["solicitud__cliente_id"], fila["solicitud__trabajador__usuario_id"]}
+        for lector in participantes - {fila["remitente_id"]}:
+            clave = (fila["solicitud_id"], lector)
+            marcas[clave] = max(marcas.get(clave, 0), fila["ultimo"])
+
+    LecturaConversacion.objects.bulk_create(
+        [
+            LecturaConversacion(solicitud_id=solicitud_id, usuario_id=usuario_id, ultimo_leido=ultimo)
+            for (solicitud_id, usuario_id), ultimo in marcas.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_indice_incremental'),
+        ('solicitudes', '0003_indices_keyset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LecturaConversacion',
+            fields=[
+                ('id_lectura', models.AutoField(primary_key=True, serialize=False)),
+                ('ultimo_leido', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+                ('solicitud', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lecturas', to='solicitudes.solicitud')),
+                ('usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lecturas_chat', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Lectura de conversación',
+                'verbose_name_plural': 'Lecturas de conversaciones',
+                'constraints': [models.UniqueConstraint(fields=('solicitud', 'usuario'), name='lectura_solicitud_usuario_unica')],
+            },
+        ),
+        migrations.RunPython(migrar_leidos, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:17
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0006_lecturas'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='mensaje',
+            name='leido',
+        ),
+    ]
@@ -0,0 +1,85 @@
+from django.db import migrations
+
+
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS chat_mensaje_fts USING fts5(
+        texto,
+        content='chat_mensaje',
+        content_rowid='id_mensaje',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_mensaje_fts_ai AFTER INSERT ON chat_mensaje BEGIN
+        INSERT INTO chat_mensaje_fts(rowid, texto) VALUES (new.id_mensaje, new.texto);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_mensaje_fts_ad AFTER DELETE ON chat_mensaje BEGIN
+        INSERT INTO chat_mensaje_fts(chat_mensaje_fts, rowid, texto)
+        VALUES ('delete', old.id_mensaje, old.texto);
+    END
+    """,
+    # Solo cuando cambia el texto: marcar leído o tocar `actualizado` no reindexa
+    """
+    CREATE TRIGGER IF NOT EXISTS chat_mensaje_fts_au AFTER UPDATE OF texto ON chat_mensaje BEGIN
+        INSERT INTO chat_mensaje_fts(chat_mensaje_fts, rowid, texto)
+        VALUES ('delete', old.id_mensaje, old.texto);
+        INSERT INTO chat_mensaje_fts(rowid, texto) VALUES (new.id_mensaje, new.texto);
+    END
+    """,
+    "INSERT INTO chat_mensaje_fts(chat_mensaje_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BORRAR = [
+    "DROP TRIGGER IF EXISTS chat_mensaje_fts_au",
+    "DROP TRIGGER IF EXISTS chat_mensaje_fts_ad",
+    "DROP TRIGGER IF EXISTS chat_mensaje_fts_ai",
+    "DROP TABLE IF EXISTS chat_mensaje_fts",
+]
+
+POSTGRES_CREAR = [
+    "CREATE INDEX IF NOT EXISTS chat_mensaje_texto_gin "
+    "ON chat_mensaje USING GIN (to_tsvector('spanish', coalesce(texto, '')))",
+]
+
+POSTGRES_BORRAR = [
+    "DROP INDEX IF EXISTS chat_mensaje_texto_gin",
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _ejecutar(schema_editor, SQLITE_CREAR)
+        except Exception:
+            # SQLite compilado sin FTS5: la búsqueda cae a LIKE
+            pass
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES_CREAR)
+
+
+def borrar_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _ejecutar(schema_editor, SQLITE_BORRAR)
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES_BORRAR)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0007_quitar_leido'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice, borrar_indice),
+    ]
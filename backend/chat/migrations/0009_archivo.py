@@ -0,0 +1,33 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:28
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0008_busqueda'),
+        ('solicitudes', '0003_indices_keyset'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversacionArchivada',
+            fields=[
+                ('id_archivo', models.AutoField(primary_key=True, serialize=False)),
+                ('desde_id', models.PositiveIntegerField()),
+                ('hasta_id', models.PositiveIntegerField()),
+                ('cantidad', models.PositiveIntegerField()),
+                ('contenido', models.BinaryField()),
+                ('creado', models.DateTimeField(auto_now_add=True)),
+                ('solicitud', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mensajes_archivados', to='solicitudes.solicitud')),
+            ],
+            options={
+                'verbose_name': 'Conversación archivada',
+                'verbose_name_plural': 'Conversaciones archivadas',
+                'ordering': ['solicitud', 'desde_id'],
+                'indexes': [models.Index(fields=['solicitud', 'desde_id'], name='archivo_sol_desde_idx')],
+            },
+        ),
+    ]
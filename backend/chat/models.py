@@ -27,7 +27,8 @@ class Mensaje(models.Model):
 
     fecha_envio = models.DateTimeField(auto_now_add=True)
 
-    leido = models.BooleanField(default=False)
+    # Versión para GET condicional (backend.conditional)
+    actualizado = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return f"Msg {self.id_mensaje} | Solicitud {self.solicitud.id} | {self.remitente.email}"
@@ -36,3 +37,80 @@ class Mensaje(models.Model):
         verbose_name = "Mensaje"
         verbose_name_plural = "Mensajes"
         ordering = ["fecha_envio"]
+        indexes = [
+            # Paginación keyset de una conversación y del listado general
+            models.Index(fields=["solicitud", "fecha_envio", "id_mensaje"], name="mensaje_sol_fecha_pk_idx"),
+            models.Index(fields=["fecha_envio", "id_mensaje"], name="mensaje_fecha_pk_idx"),
+            # Sincronización incremental (?after=<id_mensaje>)
+            models.Index(fields=["solicitud", "id_mensaje"], name="mensaje_sol_pk_idx"),
+        ]
+
+
+class LecturaConversacion(models.Model):
+    """
+    Marca de lectura de un participante en una conversación: leyó todos los
+    mensajes con id_mensaje <= ultimo_leido. Marcar como leído es actualizar
+    esta fila; los no leídos son un conteo por rango sobre (solicitud, id_mensaje).
+    """
+
+    id_lectura = models.AutoField(primary_key=True)
+
+    solicitud = models.ForeignKey(
+        Solicitud,
+        on_delete=models.CASCADE,
+        related_name="lecturas"
+    )
+
+    usuario = models.ForeignKey(
+        Usuario,
+        on_delete=models.CASCADE,
+        related_name="lecturas_chat"
+    )
+
+    ultimo_leido = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Solicitud {self.solicitud_id} | {self.usuario_id} leyó hasta {self.ultimo_leido}"
+
+    class Meta:
+        verbose_name = "Lectura de conversación"
+        verbose_name_plural = "Lecturas de conversaciones"
+        constraints = [
+            models.UniqueConstraint(fields=["solicitud", "usuario"], name="lectura_solicitud_usuario_unica"),
+        ]
+
+
+class ConversacionArchivada(models.Model):
+    """
+    Bloque de mensajes antiguos de una conversación cerrada, sacados de
+    chat_mensaje y guardados como JSON comprimido con gzip (chat.archivo).
+    Una conversación puede tener varios bloques, en orden por id_mensaje.
+    """
+
+    id_archivo = models.AutoField(primary_key=True)
+
+    solicitud = models.ForeignKey(
+        Solicitud,
+        on_delete=models.CASCADE,
+        related_name="mensajes_archivados"
+    )
+
+    # Rango de id_mensaje que contiene el bloque
+    desde_id = models.PositiveIntegerField()
+    hasta_id = models.PositiveIntegerField()
+    cantidad = models.PositiveIntegerField()
+    contenido = models.BinaryField()
+
+    creado = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"Solicitud {self.solicitud_id} | mensajes {self.desde_id}-{self.hasta_id} ({self.cantidad})"
+
+    class Meta:
+        verbose_name = "Conversación archivada"
+        verbose_name_plural = "Conversaciones archivadas"
+        ordering = ["solicitud", "desde_id"]
+        indexes = [
+            models.Index(fields=["solicitud", "desde_id"], name="archivo_sol_desde_idx"),
+        ]
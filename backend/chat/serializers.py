@@ -1,8 +1,14 @@
+from django.urls import reverse
+from django.utils.html import escape
+from django.utils.text import Truncator
 from rest_framework import serializers
-from .models import Mensaje
+from .models import Mensaje, LecturaConversacion
+from .busqueda import FIN_MARCA, INICIO_MARCA, PALABRAS_FRAGMENTO
 
 class MensajeSerializer(serializers.ModelSerializer):
     remitente_nombre = serializers.CharField(source="remitente.nombre", read_only=True)
+    # Compatibilidad: se calcula con la marca de lectura del destinatario
+    leido = serializers.SerializerMethodField()
 
     class Meta:
         model = Mensaje
@@ -16,4 +22,93 @@ class MensajeSerializer(serializers.ModelSerializer):
             "fecha_envio",
             "leido"
         ]
-        read_only_fields = ["remitente", "fecha_envio", "leido"]
+        read_only_fields = ["remitente", "fecha_envio"]
+
+    def to_representation(self, obj):
+        data = super().to_representation(obj)
+        if obj.archivo:
+            # Descarga con permisos y Range (archivos.views.ArchivoMensajeView),
+            # no la URL de MEDIA, que solo se sirve con DEBUG
+            url = reverse("archivo-mensaje", kwargs={"id_mensaje": obj.pk})
+            request = self.context.get("request")
+            data["archivo"] = request.build_absolute_uri(url) if request else url
+        return data
+
+    def get_leido(self, obj):
+        # Una consulta por conversación, compartida por todo el listado
+        cache = self.context.setdefault("_lecturas", {})
+        if obj.solicitud_id not in cache:
+            cache[obj.solicitud_id] = dict(
+                LecturaConversacion.objects.filter(solicitud_id=obj.solicitud_id)
+                .values_list("usuario_id", "ultimo_leido")
+            )
+        return any(
+            usuario_id != obj.remitente_id and ultimo >= obj.id_mensaje
+            for usuario_id, ultimo in cache[obj.solicitud_id].items()
+        )
+
+
+class MensajeBusquedaSerializer(MensajeSerializer):
+    """Resultado de /api/chat/buscar/: el mensaje, su relevancia y un fragmento resaltado."""
+    rango = serializers.FloatField(read_only=True)
+    fragmento = serializers.SerializerMethodField()
+
+    class Meta(MensajeSerializer.Meta):
+        fields = MensajeSerializer.Meta.fields + ["rango", "fragmento"]
+
+    def get_fragmento(self, obj):
+        fragmento = getattr(obj, "fragmento", None)
+        if fragmento is None:
+            return escape(Truncator(obj.texto or "").words(PALABRAS_FRAGMENTO))
+        # Se escapa el texto del usuario antes de insertar las marcas
+        return escape(fragmento).replace(INICIO_MARCA, "<mark>").replace(FIN_MARCA, "</mark>")
+
+
+class MensajeArchivadoSerializer(serializers.Serializer):
+    """Mensaje sacado de chat.archivo, con la misma forma que MensajeSerializer."""
+    id_mensaje = serializers.IntegerField()
+    solicitud = serializers.IntegerField()
+    remitente = serializers.IntegerField()
+    remitente_nombre = serializers.CharField()
+    texto = serializers.CharField(allow_null=True)
+    archivo = serializers.SerializerMethodField()
+    fecha_envio = serializers.DateTimeField()
+    leido = serializers.BooleanField()
+
+    def get_archivo(self, fila):
+        if not fila["archivo"]:
+            return None
+        # Misma descarga con permisos que los adjuntos vivos
+        url = reverse("archivo-archivado", kwargs={"id_mensaje": fila["id_mensaje"]})
+        request = self.context.get("request")
+        return request.build_absolute_uri(url) if request else url
+
+
+class ConversacionInboxSerializer(serializers.Serializer):
+    solicitud = serializers.IntegerField(source="pk")
+    estado = serializers.CharField()
+    servicio_titulo = serializers.CharField(source="servicio.titulo")
+    contraparte = serializers.SerializerMethodField()
+    contraparte_nombre = serializers.SerializerMethodField()
+    ultimo_mensaje = serializers.SerializerMethodField()
+    no_leidos = serializers.IntegerField()
+
+    def _contraparte(self, obj):
+        usuario = self.context["request"].user
+        return obj.trabajador.usuario if obj.cliente_id == usuario.pk else obj.cliente
+
+    def get_contraparte(self, obj):
+        return self._contraparte(obj).pk
+
+    def get_contraparte_nombre(self, obj):
+        return self._contraparte(obj).nombre
+
+    def get_ultimo_mensaje(self, obj):
+        if obj.ultimo_id is None:
+            return None
+        return {
+            "id_mensaje": obj.ultimo_id,
+            "texto": obj.ultimo_texto,
+            "remitente": obj.ultimo_remitente,
+            "fecha_envio": serializers.DateTimeField().to_representation(obj.ultimo_fecha),
+        }
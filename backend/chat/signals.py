@@ -0,0 +1,56 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from perfiles.models import PerfilTrabajador
+from solicitudes.models import Solicitud
+from solicitudes.signals import estado_cambiado
+
+from .models import Mensaje
+from .tiempo_real import publicar_mensaje
+from . import inbox
+
+
+@receiver(post_save, sender=Mensaje)
+def difundir_mensaje_nuevo(sender, instance, created, raw=False, **kwargs):
+    if raw or not created:
+        return
+    publicar_mensaje(instance)
+
+
+# ---------------------------------------------------------
+# Cache de la bandeja (chat.inbox)
+# ---------------------------------------------------------
+
+@receiver(post_save, sender=Mensaje)
+@receiver(post_delete, sender=Mensaje)
+def invalidar_inbox_por_mensaje(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    participantes = (
+        Solicitud.objects.filter(pk=instance.solicitud_id)
+        .values_list("cliente_id", "trabajador__usuario_id")
+        .first()
+    )
+    if participantes:
+        inbox.invalidar(*participantes)
+
+
+@receiver(post_save, sender=Solicitud)
+@receiver(post_delete, sender=Solicitud)
+def invalidar_inbox_por_solicitud(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    trabajador_usuario = (
+        PerfilTrabajador.objects.filter(pk=instance.trabajador_id)
+        .values_list("usuario_id", flat=True).first()
+    )
+    inbox.invalidar(instance.cliente_id, trabajador_usuario)
+
+
+@receiver(estado_cambiado, sender=Solicitud)
+def invalidar_inbox_por_transicion(sender, ids, **kwargs):
+    # Las transiciones son UPDATE condicionales: no pasan por post_save
+    for cliente_id, trabajador_usuario in Solicitud.objects.filter(pk__in=ids).values_list(
+        "cliente_id", "trabajador__usuario_id"
+    ):
+        inbox.invalidar(cliente_id, trabajador_usuario)
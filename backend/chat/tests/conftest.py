@@ -0,0 +1,16 @@
+import pytest
+
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def conversacion():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+    return solicitud, cliente, trabajador
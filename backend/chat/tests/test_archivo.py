@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from chat.archivo import candidatas, descomprimir
+from chat.lecturas import marcar_leidos
+from chat.models import ConversacionArchivada, Mensaje
+from usuarios.models import Usuario
+
+
+def envejecer(solicitud, dias):
+    Mensaje.objects.filter(solicitud=solicitud).update(fecha_envio=timezone.now() - timedelta(days=dias))
+
+
+def test_archiva_por_bloques_y_borra_los_mensajes(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    for i in range(5):
+        Mensaje.objects.create(solicitud=solicitud, remitente=cliente if i % 2 else trabajador, texto=f"mensaje {i}")
+    envejecer(solicitud, 400)
+
+    # Abierta: no se archiva aunque sea antigua
+    assert not candidatas(180).exists()
+
+    solicitud.estado = "finalizada"
+    solicitud.save()
+    call_command("archivar_chat", dias=180, lote=2)
+
+    assert not Mensaje.objects.filter(solicitud=solicitud).exists()
+    bloques = list(ConversacionArchivada.objects.filter(solicitud=solicitud))
+    assert [b.cantidad for b in bloques] == [2, 2, 1]
+    assert [f["texto"] for b in bloques for f in descomprimir(b.contenido)] == [f"mensaje {i}" for i in range(5)]
+
+    # Relanzar no hace nada
+    call_command("archivar_chat", dias=180)
+    assert ConversacionArchivada.objects.count() == 3
+
+
+def test_respeta_antiguedad(conversacion):
+    solicitud, cliente, _ = conversacion
+    solicitud.estado = "rechazada"
+    solicitud.save()
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="reciente")
+
+    call_command("archivar_chat", dias=30)
+    assert Mensaje.objects.filter(solicitud=solicitud).count() == 1
+    assert not ConversacionArchivada.objects.exists()
+
+
+def test_lectura_con_historial_archivado(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    viejo = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="viejo")
+    marcar_leidos(solicitud.pk, cliente)
+    envejecer(solicitud, 400)
+    solicitud.estado = "finalizada"
+    solicitud.save()
+    call_command("archivar_chat", dias=180)
+
+    nuevo = Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="nuevo")
+
+    client = APIClient()
+    client.force_authenticate(user=cliente)
+    url = f"/api/chat/{solicitud.pk}/"
+
+    res = client.get(url)
+    assert [m["id_mensaje"] for m in res.data["results"]] == [nuevo.pk]
+    assert "archivados" not in res.data
+
+    res = client.get(url, {"incluir_archivo": 1})
+    assert [m["id_mensaje"] for m in res.data["archivados"]] == [viejo.pk]
+    archivado = res.data["archivados"][0]
+    assert archivado["texto"] == "viejo"
+    assert archivado["remitente_nombre"] == trabajador.nombre
+    assert archivado["leido"] is True
+    assert set(archivado) == set(res.data["results"][0])
+
+
+def test_adjunto_archivado_se_descarga_con_permisos(conversacion, settings, tmp_path):
+    settings.MEDIA_ROOT = tmp_path
+    solicitud, cliente, trabajador = conversacion
+    mensaje = Mensaje(solicitud=solicitud, remitente=trabajador)
+    mensaje.archivo.save("nota.txt", ContentFile(b"hola"))
+    envejecer(solicitud, 400)
+    solicitud.estado = "finalizada"
+    solicitud.save()
+    call_command("archivar_chat", dias=180)
+
+    client = APIClient()
+    client.force_authenticate(user=cliente)
+    res = client.get(f"/api/chat/{solicitud.pk}/", {"incluir_archivo": 1})
+    enlace = res.data["archivados"][0]["archivo"]
+    assert enlace.endswith(f"/api/archivos/archivados/{mensaje.pk}/")
+
+    res = client.get(enlace)
+    assert res.status_code == 200
+    assert b"".join(res.streaming_content) == b"hola"
+
+    extrano = Usuario.objects.create_user(email="x@test.com", nombre="X", password="123")
+    client.force_authenticate(user=extrano)
+    assert client.get(enlace).status_code == 403
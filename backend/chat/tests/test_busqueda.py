@@ -0,0 +1,83 @@
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.test import APIClient
+
+from chat.models import Mensaje
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+def buscar(usuario, **params):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client.get("/api/chat/buscar/", params)
+
+
+def test_busqueda_con_ranking_y_fragmento(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="¿Puedes revisar la tubería del baño?")
+    doble = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="Tubería rota, cambio la tubería mañana")
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="Gracias")
+
+    res = buscar(cliente, q="TUBERIA")
+    assert res.status_code == 200
+    resultados = res.data["results"]
+    assert len(resultados) == 2
+    if connection.vendor == "sqlite":
+        assert resultados[0]["id_mensaje"] == doble.pk
+        assert "<mark>Tubería</mark>" in resultados[0]["fragmento"]
+
+    # Prefijo y varios términos
+    assert len(buscar(cliente, q="tuber baño").data["results"]) == 1
+    assert buscar(cliente, q="   ").data["results"] == []
+
+
+def test_busqueda_solo_en_conversaciones_propias(conversacion):
+    solicitud, cliente, _ = conversacion
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="clave secreta del portón")
+
+    otro = Usuario.objects.create_user(email="o@test.com", nombre="O", password="123")
+    otro_trab = Usuario.objects.create_user(email="ot@test.com", nombre="OT", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=otro_trab)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S2", descripcion="d", categoria="Hogar", precio=10)
+    ajena = Solicitud.objects.create(cliente=otro, trabajador=perfil, servicio=servicio)
+    Mensaje.objects.create(solicitud=ajena, remitente=otro, texto="otra clave")
+
+    assert [m["texto"] for m in buscar(otro, q="clave").data["results"]] == ["otra clave"]
+    assert len(buscar(cliente, q="clave").data["results"]) == 1
+    assert buscar(cliente, q="clave", solicitud=ajena.pk).data["results"] == []
+    assert buscar(cliente, q="clave", solicitud="x").status_code == 400
+
+
+def test_indice_sigue_ediciones_y_borrados(conversacion):
+    solicitud, cliente, _ = conversacion
+    mensaje = Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="<b>hola</b> mundo")
+
+    # El HTML del mensaje se escapa en el fragmento
+    assert "&lt;b&gt;" in buscar(cliente, q="mundo").data["results"][0]["fragmento"]
+
+    Mensaje.objects.filter(pk=mensaje.pk).update(texto="adiós planeta")
+    assert buscar(cliente, q="mundo").data["results"] == []
+    assert len(buscar(cliente, q="planeta").data["results"]) == 1
+
+    mensaje.delete()
+    assert buscar(cliente, q="planeta").data["results"] == []
+
+    call_command("reindexar_mensajes")
+
+
+def test_match_una_vez_por_consulta(conversacion):
+    from django.test.utils import CaptureQueriesContext
+    from chat.busqueda import buscar as buscar_mensajes
+
+    solicitud, cliente, _ = conversacion
+    for i in range(3):
+        Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto=f"tubería {i}")
+
+    with CaptureQueriesContext(connection) as consultas:
+        assert len(list(buscar_mensajes(cliente, "tuberia"))) == 3
+    if connection.vendor == "sqlite":
+        # Sin subconsultas correlacionadas para el rango o el fragmento
+        assert consultas.captured_queries[-1]["sql"].count("MATCH") == 1
@@ -0,0 +1,58 @@
+from rest_framework.test import APIClient
+
+from chat.models import LecturaConversacion, Mensaje
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+def test_inbox_con_ultimo_mensaje_y_no_leidos(conversacion, settings, django_assert_num_queries):
+    settings.CHAT_TIEMPO_REAL = {**settings.CHAT_TIEMPO_REAL, "INBOX_CACHE": 0}
+    solicitud, cliente, trabajador = conversacion
+    servicio = Servicio.objects.get(pk=solicitud.servicio_id)
+    otro = Usuario.objects.create_user(email="o@test.com", nombre="Otro", password="123")
+    sin_mensajes = Solicitud.objects.create(cliente=otro, trabajador=solicitud.trabajador, servicio=servicio)
+
+    mensajes = [Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto=f"m{n}") for n in range(3)]
+    LecturaConversacion.objects.create(solicitud=solicitud, usuario=trabajador, ultimo_leido=mensajes[0].pk)
+    Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="respuesta")
+
+    for n in range(5):
+        extra = Solicitud.objects.create(cliente=otro, trabajador=solicitud.trabajador, servicio=servicio)
+        Mensaje.objects.create(solicitud=extra, remitente=otro, texto=f"extra {n}")
+
+    api = APIClient()
+    api.force_authenticate(trabajador)
+    # Conteo de paginación + conversaciones, sin importar cuántas haya
+    with django_assert_num_queries(2):
+        response = api.get("/api/chat/inbox/")
+
+    resultados = response.data["results"]
+    assert len(resultados) == 7
+    por_solicitud = {r["solicitud"]: r for r in resultados}
+    conversacion_cliente = por_solicitud[solicitud.pk]
+    assert conversacion_cliente["contraparte_nombre"] == "C"
+    assert conversacion_cliente["ultimo_mensaje"]["texto"] == "respuesta"
+    assert conversacion_cliente["no_leidos"] == 2
+    assert por_solicitud[sin_mensajes.pk]["ultimo_mensaje"] is None
+    # Lo más reciente primero y las conversaciones sin mensajes al final
+    assert resultados[0]["ultimo_mensaje"]["texto"] == "extra 4"
+    assert resultados[-1]["solicitud"] == sin_mensajes.pk
+
+
+def test_inbox_cacheado_se_invalida_con_mensajes_y_lecturas(conversacion, django_assert_num_queries):
+    solicitud, cliente, trabajador = conversacion
+    api = APIClient()
+    api.force_authenticate(cliente)
+
+    Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="hola")
+    assert api.get("/api/chat/inbox/").data["results"][0]["no_leidos"] == 1
+    with django_assert_num_queries(0):
+        api.get("/api/chat/inbox/")
+
+    api.put(f"/api/chat/{solicitud.pk}/leer/")
+    assert api.get("/api/chat/inbox/").data["results"][0]["no_leidos"] == 0
+
+    Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="¿sigues ahí?")
+    datos = api.get("/api/chat/inbox/").data["results"][0]
+    assert (datos["no_leidos"], datos["ultimo_mensaje"]["texto"]) == (1, "¿sigues ahí?")
@@ -0,0 +1,66 @@
+import pytest
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from rest_framework.test import APIClient
+
+from chat.lecturas import marcar_leidos, no_leidos
+from chat.models import LecturaConversacion, Mensaje
+
+
+def test_marcar_leidos_mueve_la_marca_y_responde_compatible(conversacion, django_assert_max_num_queries):
+    solicitud, cliente, trabajador = conversacion
+    for n in range(3):
+        Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto=f"m{n}")
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="propio")
+    api = APIClient()
+    api.force_authenticate(cliente)
+
+    assert no_leidos(solicitud.pk, cliente) == 3
+    response = api.put(f"/api/chat/{solicitud.pk}/leer/")
+    assert response.data == {"mensajes_leidos": 3}
+    assert no_leidos(solicitud.pk, cliente) == 0
+    assert LecturaConversacion.objects.get(solicitud=solicitud, usuario=cliente).ultimo_leido == \
+        Mensaje.objects.latest("id_mensaje").pk
+
+    # Sin mensajes nuevos no se escribe nada
+    assert api.put(f"/api/chat/{solicitud.pk}/leer/").data == {"mensajes_leidos": 0}
+
+    nuevo = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="otro")
+    assert no_leidos(solicitud.pk, cliente) == 1
+
+    # Con la marca ya creada: último id, marca anterior, UPDATE de una fila y el conteo del aviso
+    with django_assert_max_num_queries(4):
+        assert marcar_leidos(solicitud.pk, cliente) == 1
+    assert LecturaConversacion.objects.get(solicitud=solicitud, usuario=cliente).ultimo_leido == nuevo.pk
+
+
+def test_leido_del_serializer_usa_la_marca_del_destinatario(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    mensaje = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="hola")
+    api = APIClient()
+    api.force_authenticate(trabajador)
+
+    assert api.get(f"/api/chat/{solicitud.pk}/").data["results"][0]["leido"] is False
+    LecturaConversacion.objects.create(solicitud=solicitud, usuario=cliente, ultimo_leido=mensaje.pk)
+    assert api.get(f"/api/chat/{solicitud.pk}/").data["results"][0]["leido"] is True
+
+
+@pytest.mark.django_db(transaction=True)
+def test_migracion_convierte_leido_en_marcas(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    executor = MigrationExecutor(connection)
+    executor.migrate([("chat", "0005_indice_incremental")])
+    apps = executor.loader.project_state([("chat", "0005_indice_incremental")]).apps
+    MensajeViejo = apps.get_model("chat", "Mensaje")
+
+    leidos = [MensajeViejo.objects.create(solicitud_id=solicitud.pk, remitente_id=trabajador.pk, leido=True) for _ in range(2)]
+    MensajeViejo.objects.create(solicitud_id=solicitud.pk, remitente_id=trabajador.pk, leido=False)
+    MensajeViejo.objects.create(solicitud_id=solicitud.pk, remitente_id=cliente.pk, leido=False)
+
+    executor = MigrationExecutor(connection)
+    executor.loader.build_graph()
+    executor.migrate(executor.loader.graph.leaf_nodes())
+
+    marcas = dict(LecturaConversacion.objects.values_list("usuario_id", "ultimo_leido"))
+    assert marcas == {cliente.pk: leidos[-1].pk}
+    assert no_leidos(solicitud.pk, cliente) == 1
@@ -0,0 +1,69 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from django.test import AsyncClient
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from chat.models import Mensaje
+
+
+def test_after_devuelve_solo_lo_nuevo(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    mensajes = [
+        Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto=f"m{n}") for n in range(4)
+    ]
+    api = APIClient()
+    api.force_authenticate(cliente)
+
+    response = api.get(f"/api/chat/{solicitud.pk}/", {"after": mensajes[1].pk})
+    assert [m["texto"] for m in response.data["results"]] == ["m2", "m3"]
+
+    assert api.get(f"/api/chat/{solicitud.pk}/", {"after": "x"}).status_code == 400
+
+
+def test_esperar_responde_al_momento_si_ya_hay_mensajes(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    anterior = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="viejo")
+    nuevo = Mensaje.objects.create(solicitud=solicitud, remitente=trabajador, texto="nuevo")
+    token = AccessToken.for_user(cliente)
+
+    response = APIClient().get(
+        "/api/chat/esperar/", {"after": anterior.pk}, HTTP_AUTHORIZATION=f"Bearer {token}"
+    )
+    datos = response.json()
+    assert [m["texto"] for m in datos["mensajes"]] == ["nuevo"]
+    assert datos["ultimo"] == nuevo.pk
+
+    inicio = time.monotonic()
+    response = APIClient().get(
+        "/api/chat/esperar/", {"after": nuevo.pk, "timeout": "0.2"}, HTTP_AUTHORIZATION=f"Bearer {token}"
+    )
+    assert response.json() == {"mensajes": [], "ultimo": nuevo.pk}
+    assert time.monotonic() - inicio < 2
+
+    assert APIClient().get("/api/chat/esperar/").status_code == 401
+
+
+@pytest.mark.django_db(transaction=True)
+def test_esperar_se_despierta_con_un_mensaje_nuevo(conversacion):
+    solicitud, cliente, trabajador = conversacion
+    token = AccessToken.for_user(cliente)
+
+    async def escenario():
+        espera = asyncio.ensure_future(AsyncClient().get(
+            "/api/chat/esperar/", {"after": 0, "timeout": 10}, headers={"Authorization": f"Bearer {token}"}
+        ))
+        await asyncio.sleep(0.3)
+        assert not espera.done()
+
+        await sync_to_async(Mensaje.objects.create)(solicitud=solicitud, remitente=trabajador, texto="¡Listo!")
+        response = await asyncio.wait_for(espera, timeout=5)
+        return response.json()
+
+    inicio = time.monotonic()
+    datos = async_to_sync(escenario)()
+    assert [m["texto"] for m in datos["mensajes"]] == ["¡Listo!"]
+    assert time.monotonic() - inicio < 5
@@ -0,0 +1,83 @@
+import asyncio
+import json
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from rest_framework_simplejwt.tokens import AccessToken
+
+from backend.asgi import application
+from chat.models import Mensaje
+from usuarios.models import Usuario
+
+
+class Conexion:
+    """Cliente WebSocket mínimo que habla ASGI directamente con la aplicación."""
+
+    def __init__(self, ruta, token=None):
+        self.entrada = asyncio.Queue()
+        self.salida = asyncio.Queue()
+        scope = {
+            "type": "websocket",
+            "path": ruta,
+            "query_string": f"token={token}".encode() if token else b"",
+        }
+        self.tarea = asyncio.ensure_future(application(scope, self.entrada.get, self.salida.put))
+
+    async def conectar(self):
+        await self.entrada.put({"type": "websocket.connect"})
+        return await self.recibir_crudo()
+
+    async def recibir_crudo(self):
+        return await asyncio.wait_for(self.salida.get(), timeout=3)
+
+    async def recibir(self):
+        return json.loads((await self.recibir_crudo())["text"])
+
+    async def enviar(self, datos):
+        await self.entrada.put({"type": "websocket.receive", "text": json.dumps(datos)})
+
+    async def cerrar(self):
+        await self.entrada.put({"type": "websocket.disconnect", "code": 1000})
+        await asyncio.wait_for(self.tarea, timeout=3)
+
+
+@pytest.mark.django_db(transaction=True)
+def test_push_de_mensajes_y_confirmaciones_de_lectura(conversacion):
+    solicitud, cliente, trabajador = conversacion
+
+    async def escenario():
+        ws = Conexion(f"/ws/chat/{solicitud.pk}/", AccessToken.for_user(cliente))
+        assert (await ws.conectar())["type"] == "websocket.accept"
+
+        # Mensaje creado por la API REST (u otro canal): llega por push
+        await sync_to_async(Mensaje.objects.create)(solicitud=solicitud, remitente=trabajador, texto="Hola")
+        evento = await ws.recibir()
+        assert evento["tipo"] == "mensaje" and evento["mensaje"]["texto"] == "Hola"
+
+        await ws.enviar({"tipo": "leer"})
+        assert await ws.recibir() == {
+            "tipo": "leido", "solicitud": solicitud.pk, "usuario": cliente.pk, "mensajes_leidos": 1
+        }
+
+        await ws.enviar({"tipo": "mensaje", "texto": "¿A qué hora?"})
+        evento = await ws.recibir()
+        assert evento["mensaje"]["remitente"] == cliente.pk
+
+        await ws.cerrar()
+
+    async_to_sync(escenario)()
+    assert Mensaje.objects.filter(solicitud=solicitud).count() == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_conexion_rechazada_sin_token_o_sin_permiso(conversacion):
+    solicitud, _, _ = conversacion
+    ajeno = Usuario.objects.create_user(email="x@test.com", nombre="X", password="123")
+
+    async def escenario():
+        assert (await Conexion(f"/ws/chat/{solicitud.pk}/").conectar())["code"] == 4401
+        assert (await Conexion(f"/ws/chat/{solicitud.pk}/", "basura").conectar())["code"] == 4401
+        assert (await Conexion(f"/ws/chat/{solicitud.pk}/", AccessToken.for_user(ajeno)).conectar())["code"] == 4403
+        assert (await Conexion("/ws/otra/", AccessToken.for_user(ajeno)).conectar())["code"] == 4404
+
+    async_to_sync(escenario)()
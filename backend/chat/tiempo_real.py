@@ -0,0 +1,38 @@
+"""
+Eventos del chat en tiempo real y helpers compartidos por el WebSocket y las vistas.
+
+Eventos que recibe el cliente (JSON):
+- {"tipo": "mensaje", "mensaje": {...MensajeSerializer...}}
+- {"tipo": "leido", "solicitud": id, "usuario": id_usuario, "mensajes_leidos": n}
+"""
+from django.db import transaction
+from django.db.models import Q
+
+from solicitudes.models import Solicitud
+
+from .capa import get_capa, grupo_solicitud
+from .serializers import MensajeSerializer
+
+
+def es_participante(usuario, solicitud_id):
+    return Solicitud.objects.filter(
+        Q(cliente=usuario) | Q(trabajador__usuario=usuario), pk=solicitud_id
+    ).exists()
+
+
+def publicar(solicitud_id, evento):
+    """Publica tras el commit: nadie recibe filas que luego se deshacen."""
+    transaction.on_commit(lambda: get_capa().publicar(grupo_solicitud(solicitud_id), evento))
+
+
+def publicar_mensaje(mensaje):
+    publicar(mensaje.solicitud_id, {"tipo": "mensaje", "mensaje": dict(MensajeSerializer(mensaje).data)})
+
+
+def publicar_lectura(solicitud_id, usuario_id, cantidad):
+    publicar(solicitud_id, {
+        "tipo": "leido",
+        "solicitud": solicitud_id,
+        "usuario": usuario_id,
+        "mensajes_leidos": cantidad,
+    })
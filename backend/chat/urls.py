@@ -1,8 +1,11 @@
 from django.urls import path
-from .views import EnviarMensajeView, MensajesDeSolicitudView, MarcarLeidosView
+from .views import EnviarMensajeView, MensajesDeSolicitudView, MarcarLeidosView, EsperarMensajesView, InboxView, BuscarMensajesView
 
 urlpatterns = [
     path('enviar/', EnviarMensajeView.as_view(), name='enviar-mensaje'),
+    path('inbox/', InboxView.as_view(), name='inbox'),
+    path('buscar/', BuscarMensajesView.as_view(), name='buscar-mensajes'),
+    path('esperar/', EsperarMensajesView.as_view(), name='esperar-mensajes'),
     path('<int:solicitud_id>/', MensajesDeSolicitudView.as_view(), name='mensajes-solicitud'),
     path('<int:solicitud_id>/leer/', MarcarLeidosView.as_view(), name='leer-mensajes'),
 ]
@@ -1,14 +1,31 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.http import JsonResponse
+from django.views import View
 from rest_framework import generics, permissions, serializers
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.viewsets import ModelViewSet
 from django.db.models import Q
 
 from .models import Mensaje
-from .serializers import MensajeSerializer
+from .serializers import (
+    MensajeSerializer, MensajeBusquedaSerializer, MensajeArchivadoSerializer, ConversacionInboxSerializer
+)
 from .filters import MensajeFilter
+from .lecturas import marcar_leidos
+from .capa import get_capa, grupo_solicitud, nueva_cola
+from . import inbox
+from .busqueda import buscar
+from .archivo import mensajes_archivados
 from solicitudes.models import Solicitud
 from usuarios.models import Usuario
+from backend.pagination import KeysetPagination
+from backend.conditional import ConditionalGetMixin
 
 
 class EnviarMensajeView(generics.CreateAPIView):
@@ -23,15 +40,17 @@ class EnviarMensajeView(generics.CreateAPIView):
         if solicitud.cliente != self.request.user and solicitud.trabajador.usuario != self.request.user:
             raise serializers.ValidationError("No perteneces a esta solicitud.")
 
-        serializer.save(
-            remitente=self.request.user,
-            leido=False
-        )
+        serializer.save(remitente=self.request.user)
 
 
-class MensajesDeSolicitudView(generics.ListAPIView):
+class MensajesDeSolicitudView(ConditionalGetMixin, generics.ListAPIView):
     serializer_class = MensajeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_campos = ("fecha_envio", "id_mensaje")
+    keyset_descendente = False
+    # "leido" depende de las marcas de lectura de la conversación
+    campos_version = ("actualizado", "solicitud__lecturas__actualizado")
 
     def get_queryset(self):
         solicitud_id = self.kwargs["solicitud_id"]
@@ -41,7 +60,167 @@ class MensajesDeSolicitudView(generics.ListAPIView):
         if solicitud.cliente != self.request.user and solicitud.trabajador.usuario != self.request.user:
             raise serializers.ValidationError("No puedes ver este chat.")
 
-        return Mensaje.objects.filter(solicitud=solicitud).order_by("fecha_envio")
+        qs = Mensaje.objects.filter(solicitud=solicitud).select_related("remitente")
+
+        # Sincronización incremental: solo lo posterior al último mensaje que tiene el cliente
+        after = self.request.query_params.get("after")
+        if after:
+            try:
+                return qs.filter(id_mensaje__gt=int(after)).order_by("id_mensaje")
+            except ValueError:
+                raise serializers.ValidationError({"after": "Debe ser un id de mensaje."})
+
+        return qs.order_by("fecha_envio")
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        # ?incluir_archivo=1: el historial archivado (chat.archivo) va antes
+        # de la primera página; es más antiguo que cualquier mensaje vivo
+        if (
+            request.query_params.get("incluir_archivo") in ("1", "true")
+            and response.status_code == 200
+            and not request.query_params.get("after")
+            and response.data.get("previous") is None
+        ):
+            response.data["archivados"] = MensajeArchivadoSerializer(
+                mensajes_archivados(self.kwargs["solicitud_id"]), many=True, context={"request": request}
+            ).data
+        return response
+
+
+class EsperarMensajesView(View):
+    """
+    Long polling de mensajes nuevos en TODAS las conversaciones del usuario.
+
+    GET /api/chat/esperar/?after=<id_mensaje>&timeout=<segundos>
+    Responde en cuanto hay mensajes con id > after (o al vencer el timeout,
+    con la lista vacía). Sin `after` espera desde el último mensaje actual.
+    La espera es asíncrona: no ocupa un hilo ni consulta la base de datos
+    mientras tanto, la despierta la capa de chat.capa.
+
+    Respuesta: {"mensajes": [...], "ultimo": <id para el siguiente after>}
+    """
+    TIMEOUT_POR_DEFECTO = 25
+    TIMEOUT_MAXIMO = 60
+    LIMITE = 200
+
+    async def get(self, request):
+        usuario = await sync_to_async(self.autenticar)(request)
+        if usuario is None:
+            return JsonResponse({"detail": "Las credenciales de autenticación no se proveyeron."}, status=401)
+
+        try:
+            after = request.GET.get("after")
+            after = int(after) if after else None
+            timeout = float(request.GET.get("timeout", self.TIMEOUT_POR_DEFECTO))
+        except ValueError:
+            return JsonResponse({"error": "after y timeout deben ser números."}, status=400)
+        timeout = max(0.0, min(timeout, self.TIMEOUT_MAXIMO))
+
+        conversaciones = await sync_to_async(self.conversaciones)(usuario)
+        capa = get_capa()
+        cola = nueva_cola()
+        grupos = [grupo_solicitud(pk) for pk in conversaciones]
+
+        # Suscribirse ANTES de consultar: lo que llegue entre medio despierta la espera
+        for grupo in grupos:
+            await capa.suscribir(grupo, cola)
+        try:
+            if after is None:
+                after = await sync_to_async(self.ultimo_id)(conversaciones)
+            loop = asyncio.get_running_loop()
+            limite = loop.time() + timeout
+            while True:
+                mensajes = await sync_to_async(self.nuevos)(conversaciones, after)
+                restante = limite - loop.time()
+                if mensajes or restante <= 0:
+                    break
+                try:
+                    await asyncio.wait_for(cola.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+        finally:
+            for grupo in grupos:
+                await capa.desuscribir(grupo, cola)
+
+        return JsonResponse({
+            "mensajes": mensajes,
+            "ultimo": mensajes[-1]["id_mensaje"] if mensajes else after,
+        })
+
+    def autenticar(self, request):
+        try:
+            resultado = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        return resultado[0] if resultado else None
+
+    def conversaciones(self, usuario):
+        return list(
+            Solicitud.objects.filter(Q(cliente=usuario) | Q(trabajador__usuario=usuario))
+            .values_list("pk", flat=True)
+        )
+
+    def ultimo_id(self, conversaciones):
+        ultimo = (
+            Mensaje.objects.filter(solicitud_id__in=conversaciones)
+            .order_by("-id_mensaje").values_list("id_mensaje", flat=True).first()
+        )
+        return ultimo or 0
+
+    def nuevos(self, conversaciones, after):
+        mensajes = (
+            Mensaje.objects.filter(solicitud_id__in=conversaciones, id_mensaje__gt=after)
+            .select_related("remitente").order_by("id_mensaje")[:self.LIMITE]
+        )
+        return MensajeSerializer(mensajes, many=True).data
+
+
+class InboxView(generics.ListAPIView):
+    """
+    Conversaciones del usuario con la contraparte, el último mensaje y los
+    no leídos, ordenadas por actividad. Consultas fijas por página (ver chat.inbox).
+    """
+    serializer_class = ConversacionInboxSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_queryset(self):
+        return inbox.conversaciones(self.request.user)
+
+    def list(self, request, *args, **kwargs):
+        timeout = inbox.timeout_cache()
+        if not timeout:
+            return super().list(request, *args, **kwargs)
+
+        clave = inbox.clave_respuesta(request)
+        datos = cache.get(clave)
+        if datos is not None:
+            return Response(datos)
+
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            cache.set(clave, response.data, timeout)
+        return response
+
+
+class BuscarMensajesView(generics.ListAPIView):
+    """
+    Búsqueda de texto completo en las conversaciones del usuario.
+    GET /api/chat/buscar/?q=<texto>[&solicitud=<id>]
+    Ordenada por relevancia, con un fragmento donde los términos van en <mark>.
+    """
+    serializer_class = MensajeBusquedaSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    filter_backends = []
+
+    def get_queryset(self):
+        solicitud = self.request.query_params.get("solicitud")
+        if solicitud is not None:
+            try:
+                solicitud = int(solicitud)
+            except ValueError:
+                raise serializers.ValidationError({"solicitud": "Debe ser un id de solicitud."})
+        return buscar(self.request.user, self.request.query_params.get("q", ""), solicitud)
 
 
 class MarcarLeidosView(generics.UpdateAPIView):
@@ -56,21 +235,22 @@ class MarcarLeidosView(generics.UpdateAPIView):
         if solicitud.cliente != request.user and solicitud.trabajador.usuario != request.user:
             return Response({"error": "No autorizado"}, status=status.HTTP_403_FORBIDDEN)
 
-        mensajes = Mensaje.objects.filter(
-            solicitud=solicitud
-        ).exclude(remitente=request.user)
-
-        mensajes.update(leido=True)
-
-        return Response({"mensajes_leidos": mensajes.count()})
+        # Una fila de LecturaConversacion; la otra parte recibe el aviso por WebSocket
+        return Response({"mensajes_leidos": marcar_leidos(solicitud.pk, request.user)})
 
 
-class MensajeViewSet(ModelViewSet):
+class MensajeViewSet(ConditionalGetMixin, ModelViewSet):
     serializer_class = MensajeSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_class = MensajeFilter
     ordering_fields = ['fecha_envio']
-    search_fields = ['contenido']
+    pagination_class = KeysetPagination
+    keyset_campos = ("fecha_envio", "id_mensaje")
+    keyset_descendente = False
+    # "leido" depende de las marcas de lectura de la conversación
+    campos_version = ("actualizado", "solicitud__lecturas__actualizado")
+    # LIKE simple; la búsqueda indexada con ranking es /api/chat/buscar/
+    search_fields = ['texto']
 
     def get_queryset(self):
         usuario = self.request.user
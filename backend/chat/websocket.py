@@ -0,0 +1,117 @@
+"""
+WebSocket del chat: /ws/chat/<solicitud_id>/?token=<JWT de acceso>
+
+Aplicación ASGI pura (sin Channels) montada en backend/asgi.py.
+
+- Al conectar se valida el JWT (el mismo de la API) y que el usuario sea
+  cliente o trabajador de la solicitud. Si no: cierre con código 4401 / 4403.
+- El servidor empuja los eventos del grupo de la conversación (ver chat.tiempo_real).
+- El cliente puede enviar:
+    {"tipo": "mensaje", "texto": "..."}  -> crea el Mensaje (llega a todos por el grupo)
+    {"tipo": "leer"}                     -> marca como leídos los mensajes recibidos
+"""
+import asyncio
+import json
+import re
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .capa import get_capa, grupo_solicitud
+from .lecturas import marcar_leidos
+from .models import Mensaje
+from .tiempo_real import es_participante
+
+
+RUTA = re.compile(r"^/ws/chat/(?P<solicitud_id>\d+)/?$")
+
+CIERRE_NO_AUTENTICADO = 4401
+CIERRE_PROHIBIDO = 4403
+CIERRE_NO_ENCONTRADO = 4404
+
+
+def usuario_desde_token(token):
+    autenticacion = JWTAuthentication()
+    try:
+        return autenticacion.get_user(autenticacion.get_validated_token(token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def crear_mensaje(solicitud_id, usuario, texto):
+    return Mensaje.objects.create(solicitud_id=solicitud_id, remitente=usuario, texto=texto)
+
+
+async def _cerrar(send, codigo):
+    await send({"type": "websocket.close", "code": codigo})
+
+
+async def chat_websocket(scope, receive, send):
+    ruta = RUTA.match(scope["path"])
+    evento = await receive()
+    if evento["type"] != "websocket.connect":
+        return
+    if ruta is None:
+        await _cerrar(send, CIERRE_NO_ENCONTRADO)
+        return
+
+    solicitud_id = int(ruta.group("solicitud_id"))
+    parametros = parse_qs(scope.get("query_string", b"").decode("latin-1"))
+    token = (parametros.get("token") or [""])[0]
+
+    usuario = await sync_to_async(usuario_desde_token)(token) if token else None
+    if usuario is None:
+        await _cerrar(send, CIERRE_NO_AUTENTICADO)
+        return
+    if not await sync_to_async(es_participante)(usuario, solicitud_id):
+        await _cerrar(send, CIERRE_PROHIBIDO)
+        return
+
+    capa = get_capa()
+    grupo = grupo_solicitud(solicitud_id)
+    cola = await capa.suscribir(grupo)
+    await send({"type": "websocket.accept"})
+
+    recibir = asyncio.ensure_future(receive())
+    saliente = asyncio.ensure_future(cola.get())
+    try:
+        while True:
+            hechas, _ = await asyncio.wait({recibir, saliente}, return_when=asyncio.FIRST_COMPLETED)
+
+            if saliente in hechas:
+                await send({"type": "websocket.send", "text": json.dumps(saliente.result())})
+                saliente = asyncio.ensure_future(cola.get())
+
+            if recibir in hechas:
+                evento = recibir.result()
+                if evento["type"] == "websocket.disconnect":
+                    break
+                if evento["type"] == "websocket.receive":
+                    await _atender(evento, solicitud_id, usuario, send)
+                recibir = asyncio.ensure_future(receive())
+    finally:
+        recibir.cancel()
+        saliente.cancel()
+        await capa.desuscribir(grupo, cola)
+
+
+async def _atender(evento, solicitud_id, usuario, send):
+    try:
+        datos = json.loads(evento.get("text") or evento.get("bytes") or b"")
+    except ValueError:
+        datos = None
+    if not isinstance(datos, dict):
+        await send({"type": "websocket.send", "text": json.dumps({"tipo": "error", "error": "JSON inválido."})})
+        return
+
+    tipo = datos.get("tipo")
+    if tipo == "mensaje":
+        texto = str(datos.get("texto") or "").strip()
+        if texto:
+            await sync_to_async(crear_mensaje)(solicitud_id, usuario, texto)
+    elif tipo == "leer":
+        await sync_to_async(marcar_leidos)(solicitud_id, usuario)
+    else:
+        await send({"type": "websocket.send", "text": json.dumps({"tipo": "error", "error": "Tipo desconocido."})})
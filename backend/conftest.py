@@ -1,6 +1,23 @@
 import pytest
 from django.conf import settings
+from django.core.cache import cache
 
 @pytest.fixture(autouse=True)
 def enable_db_access_for_all_tests(db):
     pass
+
+@pytest.fixture(autouse=True)
+def limpiar_cache():
+    # La cache sobrevive al rollback de cada test
+    cache.clear()
+
+@pytest.fixture(autouse=True)
+def moderacion_sincrona(settings):
+    # Sin hilos en los tests: la cola se procesa dentro de la petición
+    settings.MODERACION = {**getattr(settings, "MODERACION", {}), "MODO": "sincrono"}
+
+@pytest.fixture(autouse=True)
+def diccionario_moderacion_fresco():
+    # El motor compilado vive en el proceso y sobrevive al rollback de cada test
+    from moderacion.motor import olvidar_motor
+    olvidar_motor()
@@ -0,0 +1,150 @@
+"""
+Disponibilidad semanal como mapa de bits (PerfilTrabajador.disponibilidad_semanal).
+
+La semana son 7 x 96 ranuras de 15 minutos; la ranura (dia * 96 + cuarto)
+está encendida si alguna franja de Disponibilidad cubre el inicio de ese
+cuarto de hora. El bit n vive en el byte n // 8, posición n % 8 (el mismo
+orden que get_bit() de PostgreSQL e int.from_bytes(..., "little")).
+
+"¿Quién atiende el martes a las 18:00?" (?disponible=martes@18:00):
+
+- PostgreSQL: get_bit(disponibilidad_semanal, n) = 1 dentro de la consulta.
+- Otras bases: índice en memoria por proceso con los mapas de todos los
+  trabajadores. Con NumPy es una matriz (trabajadores x 84 bytes) y la
+  prueba es una operación vectorial sobre una columna; sin NumPy, un
+  desplazamiento de bits por trabajador. Se reconstruye cuando cambia la
+  generación guardada en la cache (la incrementa `recalcular`).
+"""
+import re
+import threading
+
+from django.db import connection
+from django.db.models import F, Func, IntegerField, Value
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from backend.cache import incrementar_generacion, leer_generacion
+from backend.texto import normalizar
+from perfiles.models import PerfilTrabajador
+
+from .models import Disponibilidad
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - NumPy es opcional
+    np = None
+
+
+MINUTOS_RANURA = 15
+RANURAS_DIA = 24 * 60 // MINUTOS_RANURA
+RANURAS = 7 * RANURAS_DIA
+BYTES = RANURAS // 8
+
+DIA_SEMANA = {dia: i for i, (dia, _) in enumerate(Disponibilidad.DIAS)}
+
+CLAVE_GENERACION = "disponibilidad:mapa:gen"
+
+_CONSULTA = re.compile(r"^([a-z]+)@(\d{1,2}):(\d{2})$")
+
+
+# ---------------------------------------------------------
+# Escritura
+# ---------------------------------------------------------
+
+def _minutos(hora):
+    return hora.hour * 60 + hora.minute
+
+
+def mapa_de(franjas):
+    """franjas: [(dia, hora_inicio, hora_fin)] -> bytes del mapa."""
+    bits = 0
+    for dia, inicio, fin in franjas:
+        base = DIA_SEMANA[dia] * RANURAS_DIA
+        # Cuartos de hora cuyo inicio cae en [inicio, fin)
+        primero = -(-_minutos(inicio) // MINUTOS_RANURA)
+        ultimo = -(-_minutos(fin) // MINUTOS_RANURA)
+        if ultimo > primero:
+            bits |= ((1 << (ultimo - primero)) - 1) << (base + primero)
+    return bits.to_bytes(BYTES, "little")
+
+
+def recalcular(trabajador_id):
+    franjas = Disponibilidad.objects.filter(trabajador_id=trabajador_id).values_list("dia", "hora_inicio", "hora_fin")
+    PerfilTrabajador.objects.filter(pk=trabajador_id).update(
+        disponibilidad_semanal=mapa_de(franjas),
+        actualizado=timezone.now(),
+    )
+    incrementar_generacion(CLAVE_GENERACION)
+
+
+# ---------------------------------------------------------
+# Consulta
+# ---------------------------------------------------------
+
+def ranura(valor):
+    """'martes@18:00' | 'ahora' -> número de ranura (un número se devuelve tal cual)."""
+    if isinstance(valor, int):
+        return valor
+    if normalizar(valor) == "ahora":
+        ahora = timezone.localtime()
+        return ahora.weekday() * RANURAS_DIA + (ahora.hour * 60 + ahora.minute) // MINUTOS_RANURA
+
+    coincidencia = _CONSULTA.match(normalizar(valor).replace(" ", ""))
+    if not coincidencia or coincidencia.group(1) not in DIA_SEMANA:
+        raise ValidationError({"disponible": 'Formato: <dia>@HH:MM, p. ej. "martes@18:00", o "ahora".'})
+    dia, hora, minuto = coincidencia.group(1), int(coincidencia.group(2)), int(coincidencia.group(3))
+    if hora > 23 or minuto > 59:
+        raise ValidationError({"disponible": "Hora inválida."})
+    return DIA_SEMANA[dia] * RANURAS_DIA + (hora * 60 + minuto) // MINUTOS_RANURA
+
+
+class GetBit(Func):
+    function = "get_bit"
+    output_field = IntegerField()
+
+
+class IndiceDisponibilidad:
+    def __init__(self, filas):
+        self.ids = [pk for pk, _ in filas]
+        if np is not None:
+            datos = b"".join(bytes(mapa).ljust(BYTES, b"\0")[:BYTES] for _, mapa in filas)
+            self.matriz = np.frombuffer(datos, dtype=np.uint8).reshape(len(filas), BYTES)
+            self.id_array = np.array(self.ids, dtype=np.int64)
+        else:
+            self.enteros = [int.from_bytes(bytes(mapa), "little") for _, mapa in filas]
+
+    def disponibles(self, n):
+        if np is not None:
+            columna = self.matriz[:, n // 8] & (1 << (n % 8))
+            return self.id_array[columna != 0].tolist()
+        return [pk for pk, bits in zip(self.ids, self.enteros) if bits >> n & 1]
+
+
+_indice = None
+_generacion = None
+_cerrojo = threading.Lock()
+
+
+def get_indice():
+    global _indice, _generacion
+    generacion = leer_generacion(CLAVE_GENERACION)
+    with _cerrojo:
+        if _indice is None or _generacion != generacion:
+            # Todos los perfiles: la visibilidad (estado, publicación) la decide
+            # la consulta del catálogo, y así activar o desactivar un trabajador
+            # no deja el índice desactualizado
+            filas = list(PerfilTrabajador.objects.values_list("pk", "disponibilidad_semanal"))
+            _indice, _generacion = IndiceDisponibilidad(filas), generacion
+        return _indice
+
+
+def filtrar_disponibles(qs, valor, campo="pk"):
+    """
+    Filtra `qs` a los trabajadores disponibles en la ranura de `valor`.
+    `campo` es el camino hasta PerfilTrabajador ("pk" o "trabajador").
+    """
+    n = ranura(valor)
+    prefijo = "" if campo == "pk" else f"{campo}__"
+    if connection.vendor == "postgresql":
+        return qs.alias(disponible_ranura=GetBit(F(f"{prefijo}disponibilidad_semanal"), Value(n))).filter(disponible_ranura=1)
+    return qs.filter(**{f"{campo}__in": get_indice().disponibles(n)})
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('disponibilidad', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='disponibilidad',
+            name='actualizado',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,31 @@
+from django.db import migrations
+
+from disponibilidad.mapa import mapa_de
+
+
+def poblar_mapas(apps, schema_editor):
+    Disponibilidad = apps.get_model('disponibilidad', 'Disponibilidad')
+    PerfilTrabajador = apps.get_model('perfiles', 'PerfilTrabajador')
+
+    franjas = {}
+    for trabajador_id, dia, inicio, fin in Disponibilidad.objects.values_list(
+        'trabajador_id', 'dia', 'hora_inicio', 'hora_fin'
+    ).iterator():
+        franjas.setdefault(trabajador_id, []).append((dia, inicio, fin))
+
+    perfiles = list(PerfilTrabajador.objects.filter(pk__in=franjas))
+    for perfil in perfiles:
+        perfil.disponibilidad_semanal = mapa_de(franjas[perfil.pk])
+    PerfilTrabajador.objects.bulk_update(perfiles, ['disponibilidad_semanal'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('disponibilidad', '0003_actualizado'),
+        ('perfiles', '0006_disponibilidad_semanal'),
+    ]
+
+    operations = [
+        migrations.RunPython(poblar_mapas, migrations.RunPython.noop),
+    ]
@@ -24,6 +24,9 @@ class Disponibilidad(models.Model):
     hora_inicio = models.TimeField()
     hora_fin = models.TimeField()
 
+    # Versión para GET condicional (backend.conditional)
+    actualizado = models.DateTimeField(auto_now=True)
+
     def __str__(self):
         return f"{self.trabajador.usuario.nombre} - {self.dia}"
     
@@ -12,3 +12,10 @@ class DisponibilidadSerializer(serializers.ModelSerializer):
             "hora_fin",
         ]
         read_only_fields = ["trabajador"]
+
+
+class FranjaDisponibilidadSerializer(serializers.ModelSerializer):
+    """Franja semanal sin ids, para embeber en otros recursos."""
+    class Meta:
+        model = Disponibilidad
+        fields = ["dia", "hora_inicio", "hora_fin"]
@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .models import Disponibilidad
+from . import mapa
+
+
+@receiver(post_save, sender=Disponibilidad)
+@receiver(post_delete, sender=Disponibilidad)
+def recalcular_mapa_del_perfil(sender, instance, raw=False, **kwargs):
+    # Mapa de bits semanal del perfil; también mueve su versión (`actualizado`),
+    # porque la disponibilidad se muestra con el perfil/servicios
+    if not raw:
+        mapa.recalcular(instance.trabajador_id)
@@ -0,0 +1,98 @@
+from datetime import time
+
+import pytest
+from rest_framework.exceptions import ValidationError
+from rest_framework.test import APIClient
+
+from disponibilidad import mapa
+from disponibilidad.models import Disponibilidad
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+def crear_trabajador(n):
+    usuario = Usuario.objects.create_user(email=f"mapa{n}@test.com", nombre=f"M{n}", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = Servicio.objects.create(
+        trabajador=perfil, titulo=f"S{n}", descripcion="d", categoria="Hogar", precio=10,
+        estado_publicacion="aprobado",
+    )
+    return perfil, servicio
+
+
+def encendidas(perfil):
+    perfil.refresh_from_db()
+    bits = int.from_bytes(bytes(perfil.disponibilidad_semanal), "little")
+    return {n for n in range(mapa.RANURAS) if bits >> n & 1}
+
+
+def test_mapa_se_sincroniza_con_las_franjas():
+    perfil, _ = crear_trabajador(1)
+    franja = Disponibilidad.objects.create(trabajador=perfil, dia="martes", hora_inicio=time(17, 50), hora_fin=time(19))
+
+    martes = mapa.RANURAS_DIA
+    # 18:00, 18:15, 18:30, 18:45 (17:45 no: la franja empieza a las 17:50)
+    assert encendidas(perfil) == {martes + 72, martes + 73, martes + 74, martes + 75}
+
+    franja.dia = "domingo"
+    franja.save()
+    assert min(encendidas(perfil)) == 6 * mapa.RANURAS_DIA + 72
+
+    franja.delete()
+    assert encendidas(perfil) == set()
+
+
+def test_ranura():
+    assert mapa.ranura("martes@18:00") == mapa.RANURAS_DIA + 72
+    assert mapa.ranura("Miércoles@08:14") == 2 * mapa.RANURAS_DIA + 32
+    for invalido in ["martes", "festivo@10:00", "lunes@25:00"]:
+        with pytest.raises(ValidationError):
+            mapa.ranura(invalido)
+
+
+@pytest.mark.parametrize("con_numpy", [True, False])
+def test_indice_en_memoria(con_numpy, monkeypatch):
+    if con_numpy:
+        monkeypatch.setattr(mapa, "np", pytest.importorskip("numpy"))
+    else:
+        monkeypatch.setattr(mapa, "np", None)
+    filas = [
+        (1, mapa.mapa_de([("martes", time(18), time(20))])),
+        (2, mapa.mapa_de([("lunes", time(8), time(12))])),
+        (3, mapa.mapa_de([("martes", time(8), time(18, 15))])),
+    ]
+    indice = mapa.IndiceDisponibilidad(filas)
+    assert sorted(indice.disponibles(mapa.ranura("martes@18:00"))) == [1, 3]
+    assert indice.disponibles(mapa.ranura("lunes@12:00")) == []
+    assert mapa.IndiceDisponibilidad([]).disponibles(0) == []
+
+
+def test_indice_incluye_trabajadores_inactivos():
+    p1, _ = crear_trabajador(1)
+    Disponibilidad.objects.create(trabajador=p1, dia="martes", hora_inicio=time(17), hora_fin=time(20))
+    PerfilTrabajador.objects.filter(pk=p1.pk).update(estado="inactivo")
+    n = mapa.ranura("martes@18:00")
+    assert mapa.get_indice().disponibles(n) == [p1.pk]
+
+    # Reactivarlo no depende de que alguien toque sus franjas
+    PerfilTrabajador.objects.filter(pk=p1.pk).update(estado="activo")
+    assert mapa.get_indice().disponibles(n) == [p1.pk]
+
+
+def test_filtro_disponible_en_catalogo():
+    p1, s1 = crear_trabajador(1)
+    p2, s2 = crear_trabajador(2)
+    Disponibilidad.objects.create(trabajador=p1, dia="martes", hora_inicio=time(17), hora_fin=time(20))
+    Disponibilidad.objects.create(trabajador=p2, dia="martes", hora_inicio=time(8), hora_fin=time(12))
+
+    client = APIClient()
+    res = client.get("/api/servicios/publicos/", {"disponible": "martes@18:00"})
+    assert [s["id_servicio"] for s in res.data["results"]] == [s1.pk]
+
+    # Un cambio de franjas se ve en la siguiente búsqueda
+    Disponibilidad.objects.create(trabajador=p2, dia="martes", hora_inicio=time(18), hora_fin=time(19))
+    res = client.get("/api/servicios/publicos/", {"disponible": "martes@18:00"})
+    assert {s["id_servicio"] for s in res.data["results"]} == {s1.pk, s2.pk}
+
+    assert client.get("/api/servicios/publicos/", {"disponible": "martes"}).status_code == 400
@@ -0,0 +1,62 @@
+import pytest
+from datetime import time
+from rest_framework.test import APIClient
+from disponibilidad.models import Disponibilidad
+from perfiles.models import PerfilTrabajador
+from usuarios.models import Usuario
+
+
+def crear_perfil(n):
+    usuario = Usuario.objects.create_user(email=f"disp{n}@test.com", nombre=f"D{n}", password="123")
+    return PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+
+
+@pytest.mark.django_db
+def test_disponibilidad_agrupada_por_trabajador():
+    p1, p2, p3 = crear_perfil(1), crear_perfil(2), crear_perfil(3)
+    Disponibilidad.objects.create(trabajador=p1, dia="martes", hora_inicio=time(8), hora_fin=time(10))
+    Disponibilidad.objects.create(trabajador=p1, dia="lunes", hora_inicio=time(8), hora_fin=time(10))
+    Disponibilidad.objects.create(trabajador=p2, dia="viernes", hora_inicio=time(9), hora_fin=time(11))
+    Disponibilidad.objects.create(trabajador=p3, dia="lunes", hora_inicio=time(9), hora_fin=time(11))
+
+    response = APIClient().get(
+        "/api/disponibilidad/publico/",
+        {"agrupar": "trabajador", "trabajador__in": f"{p1.pk},{p2.pk}"},
+    )
+
+    assert set(response.data) == {str(p1.pk), str(p2.pk)}
+    assert [f["dia"] for f in response.data[str(p1.pk)]] == ["lunes", "martes"]
+
+
+@pytest.mark.django_db
+def test_disponibilidad_responde_304_si_no_cambio():
+    perfil = crear_perfil(4)
+    franja = Disponibilidad.objects.create(trabajador=perfil, dia="lunes", hora_inicio=time(8), hora_fin=time(10))
+    client = APIClient()
+    url = f"/api/disponibilidad/publico/?trabajador={perfil.pk}"
+
+    response = client.get(url)
+    etag = response["ETag"]
+    assert response.status_code == 200
+
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    franja.delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_disponibilidad_agrupada_responde_304():
+    perfil = crear_perfil(5)
+    Disponibilidad.objects.create(trabajador=perfil, dia="lunes", hora_inicio=time(8), hora_fin=time(10))
+    client = APIClient()
+    params = {"agrupar": "trabajador", "trabajador__in": str(perfil.pk)}
+
+    response = client.get("/api/disponibilidad/publico/", params)
+    assert response.status_code == 200 and response["ETag"]
+    assert client.get("/api/disponibilidad/publico/", params, HTTP_IF_NONE_MATCH=response["ETag"]).status_code == 304
+
+    Disponibilidad.objects.create(trabajador=perfil, dia="martes", hora_inicio=time(8), hora_fin=time(10))
+    response = client.get("/api/disponibilidad/publico/", params, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert [f["dia"] for f in response.data[str(perfil.pk)]] == ["lunes", "martes"]
@@ -1,10 +1,25 @@
-from rest_framework import generics, permissions, viewsets
+from itertools import groupby
+
+from django.db.models import Case, When, IntegerField
+from rest_framework import generics, permissions, viewsets, serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .models import Disponibilidad
-from .serializers import DisponibilidadSerializer
+from .serializers import DisponibilidadSerializer, FranjaDisponibilidadSerializer
 from perfiles.models import PerfilTrabajador
 from .filters import DisponibilidadFilter
+from backend.conditional import ConditionalGetMixin
+
+
+# lunes=0 ... domingo=6, para ordenar por día de la semana y no alfabéticamente
+ORDEN_DIA = Case(
+    *[When(dia=dia, then=i) for i, (dia, _) in enumerate(Disponibilidad.DIAS)],
+    output_field=IntegerField(),
+)
 
-class DisponibilidadListCreate(generics.ListCreateAPIView):
+MAX_TRABAJADORES_AGRUPADOS = 100
+
+class DisponibilidadListCreate(ConditionalGetMixin, generics.ListCreateAPIView):
     serializer_class = DisponibilidadSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -17,18 +32,46 @@ class DisponibilidadListCreate(generics.ListCreateAPIView):
             raise serializers.ValidationError("Debes tener un perfil de trabajador.")
         serializer.save(trabajador=perfil)
 
-class DisponibilidadViewSet(viewsets.ModelViewSet):
+class DisponibilidadViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Disponibilidad.objects.all()
     serializer_class = DisponibilidadSerializer
     filterset_class = DisponibilidadFilter
     ordering_fields = ['fecha', 'dia_semana', 'hora_inicio']
 
-class DisponibilidadPublicoListView(generics.ListAPIView):
+class DisponibilidadPublicoListView(ConditionalGetMixin, generics.ListAPIView):
     """
-    Endpoint público para obtener todas las disponibilidades.
+    Endpoint público para obtener las disponibilidades.
     Sin autenticación requerida.
+
+    - ?trabajador=1 o ?trabajador__in=1,2,3 para pedir solo esos trabajadores.
+    - ?agrupar=trabajador devuelve {trabajador_id: [franjas]} (requiere
+      filtrar por trabajador), construido con una sola consulta ordenada.
+    - Envía ETag/Last-Modified: si nada cambió responde 304.
     """
-    queryset = Disponibilidad.objects.all()
     serializer_class = DisponibilidadSerializer
     permission_classes = [permissions.AllowAny]
     filterset_class = DisponibilidadFilter
+
+    def get_queryset(self):
+        return Disponibilidad.objects.order_by("trabajador_id", ORDEN_DIA, "hora_inicio", "id_disponibilidad")
+
+    def list(self, request, *args, **kwargs):
+        if request.query_params.get("agrupar") != "trabajador":
+            return super().list(request, *args, **kwargs)
+
+        ids = request.query_params.get("trabajador__in") or request.query_params.get("trabajador")
+        if not ids:
+            raise ValidationError("Para agrupar envía ?trabajador__in=1,2,3.")
+        if len(ids.split(",")) > MAX_TRABAJADORES_AGRUPADOS:
+            raise ValidationError(f"Máximo {MAX_TRABAJADORES_AGRUPADOS} trabajadores por petición.")
+
+        # Misma versión (ETag/Last-Modified) y 304 que el listado plano
+        return self.responder_condicional(self.listar_agrupado, request, *args, **kwargs)
+
+    def listar_agrupado(self, request, *args, **kwargs):
+        qs = self.filter_queryset(self.get_queryset())
+        agrupado = {
+            str(trabajador_id): FranjaDisponibilidadSerializer(list(franjas), many=True).data
+            for trabajador_id, franjas in groupby(qs, key=lambda d: d.trabajador_id)
+        }
+        return Response(agrupado)
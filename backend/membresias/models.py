@@ -9,6 +9,12 @@ class Membresia(models.Model):
         ("premium", "Premium"),
     ]
 
+    # Servicios que puede publicar cada plan (None = sin límite)
+    LIMITE_SERVICIOS = {
+        "free": 3,
+        "premium": None,
+    }
+
     id_membresia = models.AutoField(primary_key=True)
 
     trabajador = models.OneToOneField(
@@ -1,5 +1,25 @@
 from django.contrib import admin
-from .models import Moderacion
+from .models import Moderacion, TareaModeracion, PalabraProhibida, VersionDiccionario, RevisionCatalogo
 
-admin.site.register(Moderacion)
 
+class PalabraProhibidaAdmin(admin.ModelAdmin):
+    list_display = ("termino", "activa", "creada")
+    list_filter = ("activa",)
+    search_fields = ("termino",)
+    actions = ["activar", "desactivar"]
+
+    # update() en bloque: PalabraProhibidaQuerySet incrementa la versión
+    @admin.action(description="Activar las palabras seleccionadas")
+    def activar(self, request, queryset):
+        queryset.update(activa=True)
+
+    @admin.action(description="Desactivar las palabras seleccionadas")
+    def desactivar(self, request, queryset):
+        queryset.update(activa=False)
+
+
+admin.site.register(Moderacion)
+admin.site.register(TareaModeracion)
+admin.site.register(PalabraProhibida, PalabraProhibidaAdmin)
+admin.site.register(VersionDiccionario)
+admin.site.register(RevisionCatalogo)
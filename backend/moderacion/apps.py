@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ModeracionConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'moderacion'
+
+    def ready(self):
+        from . import signals  # noqa: F401
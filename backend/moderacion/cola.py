@@ -0,0 +1,226 @@
+"""
+Revisión automática de servicios en segundo plano.
+
+Al publicar un servicio se guarda como "pendiente" y se encola una
+TareaModeracion. Un worker toma tareas por lotes, pasa el motor de palabras
+prohibidas y la búsqueda de casi duplicados (moderacion.huellas), y actualiza
+Servicio y Moderacion con pocas sentencias por lote.
+
+Modos (settings.MODERACION["MODO"]):
+- "hilo": un hilo del propio proceso procesa la cola tras cada commit.
+- "externo": solo se encola; procesa `manage.py moderacion_worker`.
+- "sincrono": se procesa en la misma petición (tests).
+
+Si un lote falla, sus tareas se reintentan con espera exponencial hasta
+MAX_INTENTOS; después quedan como "fallida" con el error guardado.
+"""
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from backend.cache import invalidar_catalogo
+from backend.modelos import insertar_o_actualizar
+from servicios.models import Servicio
+
+from .models import Moderacion, TareaModeracion
+from .motor import get_motor
+from . import huellas
+
+
+logger = logging.getLogger(__name__)
+
+CONFIG_POR_DEFECTO = {
+    "MODO": "hilo",
+    "LOTE": 50,
+    "MAX_INTENTOS": 5,
+    "ESPERA_BASE": 30,  # segundos; se duplica en cada reintento
+    "BLOQUEO": 300,  # segundos que una tarea queda reservada para un worker
+    "INTERVALO": 5,  # segundos entre pasadas del worker cuando la cola está vacía
+}
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "MODERACION", {})}
+
+
+# ---------------------------------------------------------
+# Encolar
+# ---------------------------------------------------------
+
+def encolar(servicio):
+    """Encola la revisión de un servicio ya guardado."""
+    tarea = TareaModeracion.objects.create(servicio=servicio)
+
+    modo = config()["MODO"]
+    if modo == "sincrono":
+        procesar_lote()
+    elif modo == "hilo":
+        transaction.on_commit(despertar_worker)
+    return tarea
+
+
+# ---------------------------------------------------------
+# Procesar
+# ---------------------------------------------------------
+
+def reclamar(tamano):
+    """Reserva hasta `tamano` tareas listas para este worker y las devuelve."""
+    opciones = config()
+    ahora = timezone.now()
+    token = uuid.uuid4().hex
+
+    # Pendientes que ya pueden intentarse o en proceso con el bloqueo vencido
+    listas = Q(estado__in=["pendiente", "procesando"], proximo_intento__lte=ahora)
+    ids = list(
+        TareaModeracion.objects.filter(listas)
+        .order_by("proximo_intento", "id_tarea")
+        .values_list("id_tarea", flat=True)[:tamano]
+    )
+    if not ids:
+        return []
+
+    # El filtro se repite en el UPDATE: si otro worker las tomó primero no se pisan
+    TareaModeracion.objects.filter(listas, id_tarea__in=ids).update(
+        estado="procesando",
+        reclamada_por=token,
+        proximo_intento=ahora + timedelta(seconds=opciones["BLOQUEO"]),
+        actualizada=ahora,
+    )
+    return list(
+        TareaModeracion.objects.filter(reclamada_por=token, estado="procesando")
+        .select_related("servicio")
+    )
+
+
+def revisar(servicio):
+    return get_motor().terminos_encontrados(f"{servicio.titulo} {servicio.descripcion}")
+
+
+def aplicar_resultados(tareas):
+    """Escribe el resultado de un lote de tareas en una transacción."""
+    ahora = timezone.now()
+    duplicados = huellas.buscar_duplicados([t.servicio_id for t in tareas])
+    aprobados = []
+    con_palabras = []
+    marcados = {}
+    for tarea in tareas:
+        palabras = revisar(tarea.servicio)
+        original = duplicados.get(tarea.servicio_id, (None, None))[0]
+        if palabras:
+            con_palabras.append(tarea.servicio_id)
+        if palabras or original:
+            marcados[tarea.servicio_id] = (", ".join(palabras), original)
+        else:
+            aprobados.append(tarea.servicio_id)
+
+    with transaction.atomic():
+        if aprobados:
+            Servicio.objects.filter(pk__in=aprobados).update(
+                estado_publicacion="aprobado", palabras_detectadas=False, actualizado=ahora
+            )
+        if marcados:
+            Servicio.objects.filter(pk__in=marcados).update(
+                estado_publicacion="pendiente", palabras_detectadas=False, actualizado=ahora
+            )
+            if con_palabras:
+                Servicio.objects.filter(pk__in=con_palabras).update(palabras_detectadas=True)
+            insertar_o_actualizar(
+                Moderacion,
+                [
+                    Moderacion(
+                        servicio_id=pk,
+                        palabras_detectadas=palabras,
+                        duplicado_de_id=original,
+                        estado="pendiente",
+                    )
+                    for pk, (palabras, original) in marcados.items()
+                ],
+                unique_fields=["servicio"],
+                update_fields=["palabras_detectadas", "duplicado_de", "estado"],
+            )
+        TareaModeracion.objects.filter(pk__in=[t.pk for t in tareas]).update(
+            estado="completada", error="", actualizada=ahora
+        )
+
+    if aprobados:
+        invalidar_catalogo()
+    return len(aprobados), len(marcados)
+
+
+def registrar_fallo(tareas, error):
+    opciones = config()
+    ahora = timezone.now()
+    for tarea in tareas:
+        intentos = tarea.intentos + 1
+        agotada = intentos >= opciones["MAX_INTENTOS"]
+        espera = opciones["ESPERA_BASE"] * 2 ** (intentos - 1)
+        TareaModeracion.objects.filter(pk=tarea.pk).update(
+            estado="fallida" if agotada else "pendiente",
+            intentos=F("intentos") + 1,
+            proximo_intento=ahora + timedelta(seconds=espera),
+            reclamada_por="",
+            error=str(error)[:2000],
+            actualizada=ahora,
+        )
+
+
+def procesar_lote(tamano=None):
+    """
+    Procesa un lote de tareas. Devuelve cuántas tomó (0 = cola vacía).
+    """
+    tareas = reclamar(tamano or config()["LOTE"])
+    if not tareas:
+        return 0
+
+    try:
+        aplicar_resultados(tareas)
+    except Exception as exc:
+        logger.exception("Fallo procesando %s tareas de moderación", len(tareas))
+        registrar_fallo(tareas, exc)
+    return len(tareas)
+
+
+def procesar_pendientes(tamano=None):
+    """Vacía la cola (solo las tareas listas ahora). Devuelve cuántas tomó."""
+    total = 0
+    while True:
+        procesadas = procesar_lote(tamano)
+        if not procesadas:
+            return total
+        total += procesadas
+
+
+# ---------------------------------------------------------
+# Worker en hilo (modo "hilo")
+# ---------------------------------------------------------
+
+_aviso = threading.Event()
+_hilo = None
+_candado = threading.Lock()
+
+
+def _bucle_worker():
+    while True:
+        _aviso.wait(config()["INTERVALO"])
+        _aviso.clear()
+        try:
+            procesar_pendientes()
+        except Exception:
+            logger.exception("Error en el worker de moderación")
+        finally:
+            close_old_connections()
+
+
+def despertar_worker():
+    global _hilo
+    with _candado:
+        if _hilo is None or not _hilo.is_alive():
+            _hilo = threading.Thread(target=_bucle_worker, name="moderacion-worker", daemon=True)
+            _hilo.start()
+    _aviso.set()
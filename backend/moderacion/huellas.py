@@ -0,0 +1,218 @@
+"""
+Detección de servicios casi duplicados con SimHash.
+
+Cada servicio tiene una huella de 64 bits calculada sobre las palabras y
+pares de palabras de titulo+descripcion normalizados: textos casi iguales
+dan huellas que difieren en pocos bits.
+
+Dos huellas a distancia de Hamming <= 3 coinciden por completo en al menos
+una de sus 4 bandas de 16 bits, así que los candidatos salen de una consulta
+por igualdad sobre las bandas indexadas (sub-lineal) y la distancia exacta
+se calcula solo para ellos.
+"""
+from collections import Counter, defaultdict
+from hashlib import blake2b
+
+from django.db.models import Count, Q
+
+from backend.modelos import insertar_o_actualizar
+from backend.texto import palabras
+
+from .models import HuellaServicio
+
+
+BITS = 64
+BANDAS = 4
+BITS_BANDA = BITS // BANDAS
+MASCARA_BANDA = (1 << BITS_BANDA) - 1
+
+# Con 4 bandas solo se garantiza encontrar distancias < 4
+DISTANCIA_MAXIMA = BANDAS - 1
+
+# Textos muy cortos dan huellas poco fiables ("Plomería" vs "Pintura")
+MIN_PALABRAS = 4
+
+# Cubetas más grandes se ignoran al agrupar el catálogo (texto genérico repetido)
+MAX_CUBETA = 500
+
+
+def _hash64(caracteristica):
+    return int.from_bytes(blake2b(caracteristica.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def simhash(texto):
+    """Huella sin signo de 64 bits, o None si el texto es demasiado corto."""
+    lista = palabras(texto)
+    if len(set(lista)) < MIN_PALABRAS:
+        return None
+
+    caracteristicas = Counter(lista)
+    caracteristicas.update(f"{a} {b}" for a, b in zip(lista, lista[1:]))
+
+    pesos = [0] * BITS
+    for caracteristica, peso in caracteristicas.items():
+        h = _hash64(caracteristica)
+        for i in range(BITS):
+            if h >> i & 1:
+                pesos[i] += peso
+            else:
+                pesos[i] -= peso
+    return sum(1 << i for i, p in enumerate(pesos) if p > 0)
+
+
+def distancia(a, b):
+    return bin((a ^ b) & ((1 << BITS) - 1)).count("1")
+
+
+def bandas(valor):
+    return [(valor >> (BITS_BANDA * i)) & MASCARA_BANDA for i in range(BANDAS)]
+
+
+def a_con_signo(valor):
+    return valor - (1 << BITS) if valor >= 1 << (BITS - 1) else valor
+
+
+def sin_signo(valor):
+    return valor & ((1 << BITS) - 1)
+
+
+# ---------------------------------------------------------
+# Huellas guardadas
+# ---------------------------------------------------------
+
+def huella_para(servicio_id, titulo, descripcion):
+    valor = simhash(f"{titulo} {descripcion}")
+    if valor is None:
+        return None
+    return HuellaServicio(
+        servicio_id=servicio_id,
+        simhash=a_con_signo(valor),
+        **{f"banda{i}": b for i, b in enumerate(bandas(valor))},
+    )
+
+
+def guardar_huellas(huellas):
+    insertar_o_actualizar(
+        HuellaServicio,
+        huellas,
+        unique_fields=["servicio"],
+        update_fields=["simhash", "banda0", "banda1", "banda2", "banda3", "actualizada"],
+    )
+
+
+def actualizar_huella(servicio):
+    huella = huella_para(servicio.pk, servicio.titulo, servicio.descripcion)
+    if huella is None:
+        HuellaServicio.objects.filter(servicio_id=servicio.pk).delete()
+    else:
+        guardar_huellas([huella])
+
+
+def calcular_faltantes(lote=1000):
+    """Calcula las huellas de los servicios que aún no tienen. Devuelve cuántas."""
+    from servicios.models import Servicio
+
+    total = 0
+    ultimo = 0
+    while True:
+        filas = list(
+            Servicio.objects.filter(pk__gt=ultimo, huella__isnull=True)
+            .order_by("pk")
+            .values_list("pk", "titulo", "descripcion")[:lote]
+        )
+        if not filas:
+            return total
+        ultimo = filas[-1][0]
+        huellas = [h for h in (huella_para(*fila) for fila in filas) if h is not None]
+        guardar_huellas(huellas)
+        total += len(huellas)
+
+
+# ---------------------------------------------------------
+# Búsqueda de duplicados
+# ---------------------------------------------------------
+
+def buscar_duplicados(servicio_ids):
+    """
+    Para cada servicio devuelve el servicio ANTERIOR más parecido a distancia
+    <= DISTANCIA_MAXIMA: {servicio_id: (original_id, distancia)}.
+    Hace dos consultas sin importar cuántos ids se pasen.
+    """
+    propias = {
+        pk: sin_signo(valor)
+        for pk, valor in HuellaServicio.objects.filter(servicio_id__in=servicio_ids)
+        .values_list("servicio_id", "simhash")
+    }
+    if not propias:
+        return {}
+
+    por_banda = [set() for _ in range(BANDAS)]
+    for valor in propias.values():
+        for i, b in enumerate(bandas(valor)):
+            por_banda[i].add(b)
+    condicion = Q()
+    for i, valores in enumerate(por_banda):
+        condicion |= Q(**{f"banda{i}__in": valores})
+
+    candidatos = HuellaServicio.objects.filter(
+        condicion, servicio_id__lt=max(propias)
+    ).values_list("servicio_id", "simhash")
+
+    resultado = {}
+    for candidato_id, valor in candidatos:
+        valor = sin_signo(valor)
+        for pk, propia in propias.items():
+            if candidato_id >= pk:
+                continue
+            d = distancia(valor, propia)
+            if d <= DISTANCIA_MAXIMA and (pk not in resultado or d < resultado[pk][1]):
+                resultado[pk] = (candidato_id, d)
+    return resultado
+
+
+def agrupar(distancia_maxima=DISTANCIA_MAXIMA):
+    """
+    Agrupa el catálogo en conjuntos de servicios casi duplicados.
+    Devuelve una lista de grupos (listas de ids ordenadas, el primero es el original).
+    """
+    padre = {}
+
+    def raiz(x):
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    def unir(a, b):
+        padre.setdefault(a, a)
+        padre.setdefault(b, b)
+        ra, rb = raiz(a), raiz(b)
+        if ra != rb:
+            padre[max(ra, rb)] = min(ra, rb)
+
+    for i in range(BANDAS):
+        campo = f"banda{i}"
+        repetidas = (
+            HuellaServicio.objects.values(campo)
+            .annotate(n=Count("servicio"))
+            .filter(n__gt=1, n__lte=MAX_CUBETA)
+            .values_list(campo, flat=True)
+        )
+        cubetas = defaultdict(list)
+        for pk, valor, banda in (
+            HuellaServicio.objects.filter(**{f"{campo}__in": repetidas})
+            .values_list("servicio_id", "simhash", campo)
+            .iterator()
+        ):
+            cubetas[banda].append((pk, sin_signo(valor)))
+
+        for miembros in cubetas.values():
+            for j, (a, va) in enumerate(miembros):
+                for b, vb in miembros[j + 1:]:
+                    if distancia(va, vb) <= distancia_maxima:
+                        unir(a, b)
+
+    grupos = defaultdict(list)
+    for pk in padre:
+        grupos[raiz(pk)].append(pk)
+    return sorted((sorted(g) for g in grupos.values() if len(g) > 1), key=lambda g: g[0])
@@ -0,0 +1,63 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from backend.cache import invalidar_catalogo
+from backend.modelos import insertar_o_actualizar
+from moderacion import huellas
+from moderacion.models import Moderacion
+from servicios.models import Servicio
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcula las huellas SimHash que falten y agrupa el catálogo en "
+        "conjuntos de servicios casi duplicados. Con --marcar envía las copias "
+        "(todas menos el servicio más antiguo de cada grupo) a moderación."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000, help="Servicios por lote al calcular huellas.")
+        parser.add_argument(
+            "--distancia", type=int, default=huellas.DISTANCIA_MAXIMA,
+            help=f"Distancia de Hamming máxima (hasta {huellas.DISTANCIA_MAXIMA}).",
+        )
+        parser.add_argument("--marcar", action="store_true", help="Enviar las copias a la cola de moderación.")
+
+    def handle(self, *args, **options):
+        nuevas = huellas.calcular_faltantes(lote=options["lote"])
+        self.stdout.write(f"Huellas calculadas: {nuevas}")
+
+        distancia = min(options["distancia"], huellas.DISTANCIA_MAXIMA)
+        grupos = huellas.agrupar(distancia_maxima=distancia)
+        for grupo in grupos:
+            self.stdout.write(f"Original {grupo[0]}: copias {', '.join(map(str, grupo[1:]))}")
+
+        if options["marcar"] and grupos:
+            marcadas = self.marcar(grupos)
+            self.stdout.write(f"Copias enviadas a moderación: {marcadas}")
+
+        self.stdout.write(self.style.SUCCESS(f"Grupos de duplicados: {len(grupos)}"))
+
+    def marcar(self, grupos):
+        originales = {copia: grupo[0] for grupo in grupos for copia in grupo[1:]}
+        # Las rechazadas ya están fuera del catálogo y las ya revisadas por un admin se respetan
+        copias = list(
+            Servicio.objects.filter(pk__in=originales)
+            .exclude(estado_publicacion="rechazado")
+            .exclude(moderacion__estado__in=["aprobado", "rechazado"])
+            .values_list("pk", flat=True)
+        )
+        with transaction.atomic():
+            Servicio.objects.filter(pk__in=copias).update(
+                estado_publicacion="pendiente", actualizado=timezone.now()
+            )
+            insertar_o_actualizar(
+                Moderacion,
+                [Moderacion(servicio_id=pk, duplicado_de_id=originales[pk], estado="pendiente") for pk in copias],
+                unique_fields=["servicio"],
+                update_fields=["duplicado_de", "estado"],
+            )
+        if copias:
+            invalidar_catalogo()
+        return len(copias)
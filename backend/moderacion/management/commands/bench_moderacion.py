@@ -0,0 +1,66 @@
+import random
+import string
+import time
+
+from django.core.management.base import BaseCommand
+
+from moderacion.motor import MotorModeracion
+from moderacion.palabras import PALABRAS_PROHIBIDAS
+
+
+def _palabra(azar, minimo=4, maximo=10):
+    return "".join(azar.choice(string.ascii_lowercase) for _ in range(azar.randint(minimo, maximo)))
+
+
+def revisar_con_bucle(terminos, texto):
+    """Revisión anterior: una búsqueda de subcadena por término."""
+    texto = texto.lower()
+    return [p for p in terminos if p in texto]
+
+
+class Command(BaseCommand):
+    help = (
+        "Micro-benchmark del motor de moderación (Aho-Corasick) contra el "
+        "bucle `p in texto` por cada palabra prohibida."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--terminos", type=int, default=5000, help="Tamaño del diccionario.")
+        parser.add_argument("--textos", type=int, default=500, help="Textos a revisar.")
+        parser.add_argument("--largo", type=int, default=80, help="Palabras por texto.")
+        parser.add_argument("--semilla", type=int, default=42)
+
+    def handle(self, *args, **options):
+        azar = random.Random(options["semilla"])
+
+        terminos = list(PALABRAS_PROHIBIDAS)
+        while len(terminos) < options["terminos"]:
+            terminos.append(_palabra(azar))
+
+        vocabulario = [_palabra(azar, 2, 9) for _ in range(2000)] + list(PALABRAS_PROHIBIDAS)
+        textos = [
+            " ".join(azar.choice(vocabulario) for _ in range(options["largo"]))
+            for _ in range(options["textos"])
+        ]
+
+        inicio = time.perf_counter()
+        motor = MotorModeracion(terminos)
+        compilacion = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for texto in textos:
+            revisar_con_bucle(terminos, texto)
+        bucle = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        for texto in textos:
+            motor.terminos_encontrados(texto)
+        automata = time.perf_counter() - inicio
+
+        n = len(textos)
+        self.stdout.write(f"Términos: {len(terminos)}  Textos: {n}  Palabras/texto: {options['largo']}")
+        self.stdout.write(f"Compilación del autómata: {compilacion * 1000:.1f} ms")
+        self.stdout.write(f"Bucle `p in texto`:      {bucle * 1000:.1f} ms ({bucle / n * 1e6:.0f} µs/texto)")
+        self.stdout.write(f"Motor Aho-Corasick:      {automata * 1000:.1f} ms ({automata / n * 1e6:.0f} µs/texto)")
+        if automata:
+            self.stdout.write(self.style.SUCCESS(f"Aceleración: x{bucle / automata:.1f}"))
@@ -0,0 +1,30 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from moderacion.cola import config, procesar_lote
+
+
+class Command(BaseCommand):
+    help = "Procesa la cola de moderación automática de servicios (usar con MODERACION['MODO'] = 'externo')."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=None, help="Tareas por pasada.")
+        parser.add_argument("--una-vez", action="store_true", help="Vaciar la cola y terminar.")
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            procesadas = procesar_lote(options["lote"])
+            total += procesadas
+            if procesadas:
+                self.stdout.write(f"Procesadas {procesadas} tareas.")
+                continue
+
+            if options["una_vez"]:
+                break
+            close_old_connections()
+            time.sleep(config()["INTERVALO"])
+
+        self.stdout.write(self.style.SUCCESS(f"Cola vacía: {total} tareas procesadas."))
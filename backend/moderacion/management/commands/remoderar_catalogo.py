@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from moderacion.revision import remoderar_catalogo
+
+
+class Command(BaseCommand):
+    help = (
+        "Vuelve a moderar todo el catálogo con el diccionario vigente. "
+        "Es reanudable: si se interrumpe, la siguiente ejecución sigue donde quedó."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000, help="Servicios por lote.")
+        parser.add_argument("--max-lotes", type=int, default=None, help="Detenerse tras N lotes (se puede reanudar).")
+        parser.add_argument("--reiniciar", action="store_true", help="Descartar la revisión en curso y empezar de cero.")
+
+    def handle(self, *args, **options):
+        revision = remoderar_catalogo(
+            lote=options["lote"],
+            reiniciar=options["reiniciar"],
+            max_lotes=options["max_lotes"],
+        )
+        estado = "terminada" if revision.terminada else f"pausada en el servicio {revision.ultimo_servicio}"
+        self.stdout.write(self.style.SUCCESS(
+            f"Revisión {revision.id_revision} (diccionario v{revision.version_diccionario}) {estado}: "
+            f"{revision.revisados} revisados, {revision.marcados} marcados, {revision.liberados} liberados."
+        ))
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:05
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderacion', '0002_initial'),
+        ('servicios', '0005_actualizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TareaModeracion',
+            fields=[
+                ('id_tarea', models.AutoField(primary_key=True, serialize=False)),
+                ('estado', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completada', 'Completada'), ('fallida', 'Fallida')], default='pendiente', max_length=20)),
+                ('intentos', models.PositiveIntegerField(default=0)),
+                ('proximo_intento', models.DateTimeField(default=django.utils.timezone.now)),
+                ('reclamada_por', models.CharField(blank=True, default='', max_length=36)),
+                ('error', models.TextField(blank=True, default='')),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+                ('actualizada', models.DateTimeField(auto_now=True)),
+                ('servicio', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tareas_moderacion', to='servicios.servicio')),
+            ],
+            options={
+                'verbose_name': 'Tarea de moderación',
+                'verbose_name_plural': 'Tareas de moderación',
+                'indexes': [models.Index(fields=['estado', 'proximo_intento'], name='tarea_mod_estado_idx')],
+            },
+        ),
+    ]
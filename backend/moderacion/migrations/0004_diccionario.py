@@ -0,0 +1,69 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:07
+
+from django.db import migrations, models
+
+
+def cargar_palabras_iniciales(apps, schema_editor):
+    from moderacion.palabras import PALABRAS_PROHIBIDAS
+
+    PalabraProhibida = apps.get_model("moderacion", "PalabraProhibida")
+    VersionDiccionario = apps.get_model("moderacion", "VersionDiccionario")
+    PalabraProhibida.objects.bulk_create(
+        [PalabraProhibida(termino=termino) for termino in PALABRAS_PROHIBIDAS],
+        ignore_conflicts=True,
+    )
+    VersionDiccionario.objects.update_or_create(pk=1, defaults={"version": 1})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderacion', '0003_tareas_moderacion'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PalabraProhibida',
+            fields=[
+                ('id_palabra', models.AutoField(primary_key=True, serialize=False)),
+                ('termino', models.CharField(max_length=120, unique=True)),
+                ('activa', models.BooleanField(default=True)),
+                ('creada', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'verbose_name': 'Palabra prohibida',
+                'verbose_name_plural': 'Palabras prohibidas',
+                'ordering': ['termino'],
+            },
+        ),
+        migrations.CreateModel(
+            name='RevisionCatalogo',
+            fields=[
+                ('id_revision', models.AutoField(primary_key=True, serialize=False)),
+                ('version_diccionario', models.PositiveIntegerField()),
+                ('ultimo_servicio', models.PositiveIntegerField(default=0)),
+                ('revisados', models.PositiveIntegerField(default=0)),
+                ('marcados', models.PositiveIntegerField(default=0)),
+                ('liberados', models.PositiveIntegerField(default=0)),
+                ('iniciada', models.DateTimeField(auto_now_add=True)),
+                ('terminada', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Revisión del catálogo',
+                'verbose_name_plural': 'Revisiones del catálogo',
+            },
+        ),
+        migrations.CreateModel(
+            name='VersionDiccionario',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.PositiveIntegerField(default=0)),
+                ('actualizado', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Versión del diccionario',
+                'verbose_name_plural': 'Versión del diccionario',
+            },
+        ),
+        migrations.RunPython(cargar_palabras_iniciales, migrations.RunPython.noop),
+    ]
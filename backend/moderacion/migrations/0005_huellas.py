@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('moderacion', '0004_diccionario'),
+        ('servicios', '0005_actualizado'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HuellaServicio',
+            fields=[
+                ('servicio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='huella', serialize=False, to='servicios.servicio')),
+                ('simhash', models.BigIntegerField()),
+                ('banda0', models.PositiveIntegerField(db_index=True)),
+                ('banda1', models.PositiveIntegerField(db_index=True)),
+                ('banda2', models.PositiveIntegerField(db_index=True)),
+                ('banda3', models.PositiveIntegerField(db_index=True)),
+                ('actualizada', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Huella de servicio',
+                'verbose_name_plural': 'Huellas de servicios',
+            },
+        ),
+        migrations.AddField(
+            model_name='moderacion',
+            name='duplicado_de',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='duplicados', to='servicios.servicio'),
+        ),
+    ]
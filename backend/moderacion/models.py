@@ -1,4 +1,5 @@
-from django.db import models
+from django.db import models, transaction
+from django.utils import timezone
 from usuarios.models import Usuario
 from servicios.models import Servicio
 
@@ -20,6 +21,15 @@ class Moderacion(models.Model):
 
     palabras_detectadas = models.TextField(blank=True, null=True)
 
+    # Servicio anterior casi idéntico (moderacion.huellas), si lo hay
+    duplicado_de = models.ForeignKey(
+        Servicio,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="duplicados"
+    )
+
     estado = models.CharField(
         max_length=20,
         choices=ESTADOS,
@@ -44,3 +54,178 @@ class Moderacion(models.Model):
         verbose_name = "Moderación"
         verbose_name_plural = "Moderaciones"
 
+
+
+class TareaModeracion(models.Model):
+    """
+    Cola de revisión automática de servicios (ver moderacion.cola).
+    La procesa un worker en segundo plano, fuera de la petición de alta.
+    """
+
+    ESTADOS = [
+        ("pendiente", "Pendiente"),
+        ("procesando", "Procesando"),
+        ("completada", "Completada"),
+        ("fallida", "Fallida"),
+    ]
+
+    id_tarea = models.AutoField(primary_key=True)
+
+    servicio = models.ForeignKey(
+        Servicio,
+        on_delete=models.CASCADE,
+        related_name="tareas_moderacion"
+    )
+
+    estado = models.CharField(max_length=20, choices=ESTADOS, default="pendiente")
+    intentos = models.PositiveIntegerField(default=0)
+
+    # Pendiente: cuándo puede intentarse. Procesando: hasta cuándo dura el
+    # bloqueo del worker que la tomó (si muere, otro la retoma después).
+    proximo_intento = models.DateTimeField(default=timezone.now)
+    reclamada_por = models.CharField(max_length=36, blank=True, default="")
+    error = models.TextField(blank=True, default="")
+
+    creada = models.DateTimeField(auto_now_add=True)
+    actualizada = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Tarea {self.id_tarea} — servicio {self.servicio_id} — {self.estado}"
+
+    class Meta:
+        verbose_name = "Tarea de moderación"
+        verbose_name_plural = "Tareas de moderación"
+        indexes = [
+            models.Index(fields=["estado", "proximo_intento"], name="tarea_mod_estado_idx"),
+        ]
+
+
+class PalabraProhibidaQuerySet(models.QuerySet):
+    """
+    Las operaciones en bloque no envían post_save/post_delete: incrementan la
+    versión del diccionario aquí, para que los procesos recompilen su motor.
+    """
+
+    def update(self, **kwargs):
+        filas = super().update(**kwargs)
+        if filas:
+            nueva_version_diccionario()
+        return filas
+
+    def bulk_create(self, objs, *args, **kwargs):
+        creadas = super().bulk_create(objs, *args, **kwargs)
+        if creadas:
+            nueva_version_diccionario()
+        return creadas
+
+    def bulk_update(self, objs, *args, **kwargs):
+        filas = super().bulk_update(objs, *args, **kwargs)
+        if filas:
+            nueva_version_diccionario()
+        return filas
+
+
+class PalabraProhibida(models.Model):
+    """Diccionario de la moderación automática (ver moderacion.motor)."""
+
+    id_palabra = models.AutoField(primary_key=True)
+    termino = models.CharField(max_length=120, unique=True)
+    activa = models.BooleanField(default=True)
+    creada = models.DateTimeField(auto_now_add=True)
+
+    objects = PalabraProhibidaQuerySet.as_manager()
+
+    def __str__(self):
+        return self.termino
+
+    class Meta:
+        verbose_name = "Palabra prohibida"
+        verbose_name_plural = "Palabras prohibidas"
+        ordering = ["termino"]
+
+
+class VersionDiccionario(models.Model):
+    """
+    Fila única con la versión del diccionario. Cada cambio en
+    PalabraProhibida la incrementa y los procesos recompilan su motor.
+    """
+
+    version = models.PositiveIntegerField(default=0)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    @classmethod
+    def actual(cls):
+        return cls.objects.filter(pk=1).values_list("version", flat=True).first() or 0
+
+    @classmethod
+    def incrementar(cls):
+        if not cls.objects.filter(pk=1).update(version=models.F("version") + 1, actualizado=timezone.now()):
+            cls.objects.get_or_create(pk=1, defaults={"version": 1})
+
+    def __str__(self):
+        return f"Diccionario v{self.version}"
+
+    class Meta:
+        verbose_name = "Versión del diccionario"
+        verbose_name_plural = "Versión del diccionario"
+
+
+def nueva_version_diccionario():
+    from .motor import olvidar_motor
+
+    VersionDiccionario.incrementar()
+    olvidar_motor()
+    # Si la transacción sigue abierta, que el motor se recompile con el commit hecho
+    transaction.on_commit(olvidar_motor)
+
+
+class RevisionCatalogo(models.Model):
+    """
+    Progreso de una re-moderación completa del catálogo
+    (manage.py remoderar_catalogo). Permite reanudarla donde quedó.
+    """
+
+    id_revision = models.AutoField(primary_key=True)
+    version_diccionario = models.PositiveIntegerField()
+    ultimo_servicio = models.PositiveIntegerField(default=0)
+    revisados = models.PositiveIntegerField(default=0)
+    marcados = models.PositiveIntegerField(default=0)
+    liberados = models.PositiveIntegerField(default=0)
+    iniciada = models.DateTimeField(auto_now_add=True)
+    terminada = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"Revisión {self.id_revision} (v{self.version_diccionario}) — {self.revisados} servicios"
+
+    class Meta:
+        verbose_name = "Revisión del catálogo"
+        verbose_name_plural = "Revisiones del catálogo"
+
+
+class HuellaServicio(models.Model):
+    """
+    SimHash de 64 bits de titulo+descripcion (ver moderacion.huellas),
+    guardado también en 4 bandas de 16 bits indexadas para buscar
+    candidatos a duplicado sin recorrer el catálogo.
+    """
+
+    servicio = models.OneToOneField(
+        Servicio,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="huella"
+    )
+
+    simhash = models.BigIntegerField()  # con signo: 64 bits en BIGINT
+    banda0 = models.PositiveIntegerField(db_index=True)
+    banda1 = models.PositiveIntegerField(db_index=True)
+    banda2 = models.PositiveIntegerField(db_index=True)
+    banda3 = models.PositiveIntegerField(db_index=True)
+    actualizada = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"Huella del servicio {self.servicio_id}"
+
+    class Meta:
+        verbose_name = "Huella de servicio"
+        verbose_name_plural = "Huellas de servicios"
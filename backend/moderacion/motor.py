@@ -0,0 +1,263 @@
+"""
+Motor de moderación: búsqueda de muchas palabras prohibidas a la vez.
+
+El diccionario (moderacion.PalabraProhibida) se compila en un autómata
+Aho-Corasick una vez por proceso y se recompila solo cuando cambia su
+versión (VersionDiccionario). Revisar un texto cuesta O(largo del texto + coincidencias) sin importar
+cuántos términos tenga el diccionario (antes era O(términos × texto)).
+
+Antes de buscar, el texto se normaliza carácter a carácter:
+- minúsculas y sin acentos ("Pornografía" -> "pornografia"),
+- leetspeak común ("4rm4" -> "arma", "$exo" -> "sexo"),
+- espacios consecutivos colapsados.
+
+Solo cuentan coincidencias de palabra completa ("arma" no coincide en
+"farmacia"), admitiendo el plural ("armas"). Cada coincidencia se devuelve
+con su posición en el texto ORIGINAL.
+"""
+import re
+import threading
+import time
+from bisect import bisect_right
+from collections import deque, namedtuple
+
+from backend.texto import quitar_acentos
+
+
+LEET = {
+    "0": "o",
+    "1": "i",
+    "3": "e",
+    "4": "a",
+    "5": "s",
+    "7": "t",
+    "@": "a",
+    "$": "s",
+}
+
+SUFIJOS_PLURAL = ("s", "es")
+
+Coincidencia = namedtuple("Coincidencia", ["termino", "inicio", "fin", "fragmento"])
+
+
+def _es_palabra(caracter):
+    return caracter.isalnum()
+
+
+class _TablaNormalizacion(dict):
+    """
+    Tabla para str.translate que se llena a medida que aparecen caracteres.
+    Guarda aparte los caracteres que no se traducen a exactamente un carácter
+    (ligaduras, acentos sueltos...), que obligan a mapear posiciones a mano.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.irregulares = set()
+
+    def __missing__(self, codigo):
+        caracter = chr(codigo)
+        if caracter.isspace():
+            valor = " "
+        else:
+            valor = quitar_acentos(LEET.get(caracter, caracter)).lower()
+        if len(valor) != 1:
+            self.irregulares.add(caracter)
+        self[codigo] = valor
+        return valor
+
+
+_TABLA = _TablaNormalizacion()
+_ESPACIOS = re.compile(r" {2,}")
+
+
+def _identidad(i):
+    return i
+
+
+def _normalizar_caracter_a_caracter(texto):
+    salida = []
+    posiciones = []
+    for i, caracter in enumerate(texto):
+        for c in caracter.translate(_TABLA):
+            if c == " " and salida and salida[-1] == " ":
+                continue
+            salida.append(c)
+            posiciones.append(i)
+    return "".join(salida), posiciones.__getitem__
+
+
+def normalizar_con_posiciones(texto):
+    """
+    Devuelve (texto_normalizado, posicion) donde posicion(i) es el índice en
+    `texto` del carácter que produjo normalizado[i].
+    """
+    traducido = texto.translate(_TABLA)
+    if not _TABLA.irregulares.isdisjoint(texto):
+        return _normalizar_caracter_a_caracter(texto)
+
+    # Traducción 1 a 1: solo cambian las posiciones al colapsar espacios
+    cortes = [0]
+    desplazamientos = [0]
+    for espacios in _ESPACIOS.finditer(traducido):
+        colapsados = espacios.end() - espacios.start() - 1
+        cortes.append(espacios.end() - desplazamientos[-1] - colapsados)
+        desplazamientos.append(desplazamientos[-1] + colapsados)
+    if len(cortes) == 1:
+        return traducido, _identidad
+
+    def posicion(i):
+        return i + desplazamientos[bisect_right(cortes, i) - 1]
+
+    return _ESPACIOS.sub(" ", traducido), posicion
+
+
+def normalizar_termino(termino):
+    return " ".join(termino.translate(_TABLA).split())
+
+
+class MotorModeracion:
+    """Autómata Aho-Corasick sobre el diccionario de términos prohibidos."""
+
+    def __init__(self, terminos, sufijos=SUFIJOS_PLURAL):
+        self.sufijos = tuple(sufijos)
+        self.transiciones = [{}]
+        self.fallo = [0]
+        # salida[estado] = (término, largo normalizado) que terminan en ese estado
+        self.salida = [()]
+
+        for termino in terminos:
+            normalizado = normalizar_termino(termino)
+            if normalizado:
+                self._agregar(normalizado, termino)
+        self._construir_fallos()
+
+    def __len__(self):
+        return sum(len(s) for s in self.salida)
+
+    def _agregar(self, normalizado, termino):
+        estado = 0
+        for c in normalizado:
+            siguiente = self.transiciones[estado].get(c)
+            if siguiente is None:
+                siguiente = len(self.transiciones)
+                self.transiciones[estado][c] = siguiente
+                self.transiciones.append({})
+                self.fallo.append(0)
+                self.salida.append(())
+            estado = siguiente
+        # Variantes que normalizan igual ("Arma", "arma") cuentan una vez
+        if not self.salida[estado]:
+            self.salida[estado] = ((termino, len(normalizado)),)
+
+    def _construir_fallos(self):
+        cola = deque(self.transiciones[0].values())
+        while cola:
+            estado = cola.popleft()
+            for c, siguiente in self.transiciones[estado].items():
+                cola.append(siguiente)
+                f = self.fallo[estado]
+                while f and c not in self.transiciones[f]:
+                    f = self.fallo[f]
+                destino = self.transiciones[f].get(c, 0)
+                self.fallo[siguiente] = destino if destino != siguiente else 0
+                if self.salida[self.fallo[siguiente]]:
+                    self.salida[siguiente] = self.salida[siguiente] + self.salida[self.fallo[siguiente]]
+
+    def _fin_de_palabra(self, normalizado, fin):
+        """
+        `fin` es el índice siguiente al término. Devuelve el fin real de la
+        palabra (incluyendo un sufijo de plural) o None si no termina ahí.
+        """
+        n = len(normalizado)
+        if fin >= n or not _es_palabra(normalizado[fin]):
+            return fin
+        for sufijo in self.sufijos:
+            extremo = fin + len(sufijo)
+            if normalizado.startswith(sufijo, fin) and (extremo >= n or not _es_palabra(normalizado[extremo])):
+                return extremo
+        return None
+
+    def buscar(self, texto):
+        """Lista de Coincidencia (termino, inicio, fin, fragmento) en orden de aparición."""
+        if not texto:
+            return []
+
+        normalizado, posicion = normalizar_con_posiciones(texto)
+        transiciones, fallo, salida = self.transiciones, self.fallo, self.salida
+        coincidencias = []
+        estado = 0
+
+        for i, c in enumerate(normalizado):
+            while estado and c not in transiciones[estado]:
+                estado = fallo[estado]
+            estado = transiciones[estado].get(c, 0)
+            if not salida[estado]:
+                continue
+
+            for termino, largo in salida[estado]:
+                inicio = i - largo + 1
+                if inicio > 0 and _es_palabra(normalizado[inicio - 1]):
+                    continue
+                fin = self._fin_de_palabra(normalizado, i + 1)
+                if fin is None:
+                    continue
+                inicio_original = posicion(inicio)
+                fin_original = posicion(fin - 1) + 1
+                coincidencias.append(Coincidencia(
+                    termino,
+                    inicio_original,
+                    fin_original,
+                    texto[inicio_original:fin_original],
+                ))
+
+        coincidencias.sort(key=lambda m: (m.inicio, -m.fin))
+        return coincidencias
+
+    def terminos_encontrados(self, texto):
+        """Términos distintos encontrados, en orden de primera aparición."""
+        vistos = []
+        for coincidencia in self.buscar(texto):
+            if coincidencia.termino not in vistos:
+                vistos.append(coincidencia.termino)
+        return vistos
+
+
+# ---------------------------------------------------------
+# Motor del proceso
+# ---------------------------------------------------------
+
+# Cada cuántos segundos se consulta la versión del diccionario en la base de
+# datos. Los cambios hechos en este mismo proceso se ven al instante
+# (olvidar_motor desde moderacion.signals).
+VERIFICAR_CADA = 10
+
+_estado = {"motor": None, "version": None, "verificado": 0.0}
+_candado = threading.Lock()
+
+
+def get_motor():
+    """Motor compilado con el diccionario vigente (uno por proceso)."""
+    from .models import PalabraProhibida, VersionDiccionario
+
+    ahora = time.monotonic()
+    if _estado["motor"] is not None and ahora - _estado["verificado"] < VERIFICAR_CADA:
+        return _estado["motor"]
+
+    with _candado:
+        version = VersionDiccionario.actual()
+        if _estado["motor"] is None or version != _estado["version"]:
+            terminos = PalabraProhibida.objects.filter(activa=True).values_list("termino", flat=True)
+            _estado["motor"] = MotorModeracion(list(terminos))
+            _estado["version"] = version
+        _estado["verificado"] = ahora
+        return _estado["motor"]
+
+
+def version_motor():
+    return _estado["version"]
+
+
+def olvidar_motor():
+    """Fuerza a revisar la versión del diccionario en el próximo get_motor()."""
+    _estado["verificado"] = 0.0
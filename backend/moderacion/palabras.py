@@ -1,3 +1,5 @@
+# Diccionario inicial. El vigente se guarda en la base de datos
+# (moderacion.PalabraProhibida) y se edita desde el admin.
 PALABRAS_PROHIBIDAS = [
     "violencia",
     "arma",
@@ -0,0 +1,129 @@
+"""
+Re-moderación completa del catálogo cuando cambia el diccionario.
+
+Recorre Servicio por rangos de clave primaria (pk > último revisado), sin
+cargar el catálogo en memoria, y aplica cada lote con escrituras masivas en
+una transacción junto con el punto de control (RevisionCatalogo), así que
+se puede interrumpir y reanudar sin repetir ni saltar servicios.
+
+Por cada servicio:
+- con palabras prohibidas: queda "pendiente" con su Moderacion pendiente,
+  salvo que esté rechazado o que un admin ya haya aprobado esas mismas palabras;
+- sin palabras pero marcado antes: se desmarca y, si seguía esperando
+  moderación, se aprueba, salvo que esté retenido como posible duplicado
+  (Moderacion.duplicado_de): eso lo decide un admin.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from backend.cache import invalidar_catalogo
+from backend.modelos import insertar_o_actualizar
+from servicios.models import Servicio
+
+from .models import Moderacion, RevisionCatalogo, VersionDiccionario
+from .motor import get_motor
+
+
+def _mismas_palabras(a, b):
+    return {p.strip() for p in (a or "").split(",")} == {p.strip() for p in (b or "").split(",")}
+
+
+def revision_en_curso(reiniciar=False):
+    """Devuelve la revisión a continuar o una nueva con la versión actual."""
+    version = VersionDiccionario.actual()
+    abierta = RevisionCatalogo.objects.filter(terminada__isnull=True).order_by("-id_revision").first()
+
+    # Si el diccionario cambió, lo ya revisado no vale: se empieza de nuevo
+    if abierta and (reiniciar or abierta.version_diccionario != version):
+        abierta.terminada = timezone.now()
+        abierta.save(update_fields=["terminada"])
+        abierta = None
+
+    return abierta or RevisionCatalogo.objects.create(version_diccionario=version)
+
+
+def revisar_lote(revision, lote):
+    """
+    Revisa el siguiente lote de servicios. Devuelve cuántos revisó
+    (0 = catálogo terminado).
+    """
+    motor = get_motor()
+    filas = list(
+        Servicio.objects.filter(pk__gt=revision.ultimo_servicio)
+        .order_by("pk")
+        .values_list("pk", "titulo", "descripcion", "estado_publicacion", "palabras_detectadas")[:lote]
+        .iterator(chunk_size=lote)
+    )
+    if not filas:
+        return 0
+
+    moderaciones = dict(
+        (servicio_id, (estado, palabras, duplicado_de))
+        for servicio_id, estado, palabras, duplicado_de in Moderacion.objects.filter(
+            servicio_id__in=[f[0] for f in filas]
+        ).values_list("servicio_id", "estado", "palabras_detectadas", "duplicado_de")
+    )
+
+    marcar = {}
+    desmarcar = []
+    aprobar = []
+    for pk, titulo, descripcion, estado, marcado in filas:
+        palabras = ", ".join(motor.terminos_encontrados(f"{titulo} {descripcion}"))
+        estado_moderacion, palabras_anteriores, duplicado_de = moderaciones.get(pk, (None, None, None))
+
+        if palabras:
+            if estado == "rechazado":
+                continue
+            if estado_moderacion == "aprobado" and _mismas_palabras(palabras, palabras_anteriores):
+                continue
+            if estado_moderacion == "pendiente" and marcado and palabras == palabras_anteriores:
+                continue
+            marcar[pk] = palabras
+        elif marcado:
+            desmarcar.append(pk)
+            if estado == "pendiente" and estado_moderacion == "pendiente" and duplicado_de is None:
+                aprobar.append(pk)
+
+    ahora = timezone.now()
+    with transaction.atomic():
+        if marcar:
+            Servicio.objects.filter(pk__in=marcar).update(
+                estado_publicacion="pendiente", palabras_detectadas=True, actualizado=ahora
+            )
+            insertar_o_actualizar(
+                Moderacion,
+                [
+                    Moderacion(servicio_id=pk, palabras_detectadas=palabras, estado="pendiente")
+                    for pk, palabras in marcar.items()
+                ],
+                unique_fields=["servicio"],
+                update_fields=["palabras_detectadas", "estado"],
+            )
+        if desmarcar:
+            Servicio.objects.filter(pk__in=desmarcar).update(palabras_detectadas=False, actualizado=ahora)
+        if aprobar:
+            Servicio.objects.filter(pk__in=aprobar).update(estado_publicacion="aprobado", actualizado=ahora)
+            Moderacion.objects.filter(servicio_id__in=aprobar, estado="pendiente").update(estado="aprobado")
+
+        revision.ultimo_servicio = filas[-1][0]
+        revision.revisados += len(filas)
+        revision.marcados += len(marcar)
+        revision.liberados += len(desmarcar)
+        revision.save(update_fields=["ultimo_servicio", "revisados", "marcados", "liberados"])
+
+    if marcar or aprobar:
+        invalidar_catalogo()
+    return len(filas)
+
+
+def remoderar_catalogo(lote=1000, reiniciar=False, max_lotes=None):
+    """Revisa el catálogo completo (o `max_lotes` lotes) y devuelve la revisión."""
+    revision = revision_en_curso(reiniciar=reiniciar)
+    lotes = 0
+    while max_lotes is None or lotes < max_lotes:
+        if not revisar_lote(revision, lote):
+            revision.terminada = timezone.now()
+            revision.save(update_fields=["terminada"])
+            break
+        lotes += 1
+    return revision
@@ -14,9 +14,21 @@ class ModeracionSerializer(serializers.ModelSerializer):
             "servicio_titulo",
             "trabajador_nombre",
             "palabras_detectadas",
+            "duplicado_de",
             "estado",
             "admin",
             "admin_nombre",
             "fecha",
         ]
         read_only_fields = ["fecha"]
+
+
+class ModeracionBulkSerializer(serializers.Serializer):
+    ACCIONES = [("aprobar", "Aprobar"), ("rechazar", "Rechazar")]
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=1000,
+    )
+    accion = serializers.ChoiceField(choices=ACCIONES)
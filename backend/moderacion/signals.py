@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from servicios.models import Servicio
+
+from .models import PalabraProhibida, nueva_version_diccionario
+from . import huellas
+
+
+@receiver(post_save, sender=PalabraProhibida)
+@receiver(post_delete, sender=PalabraProhibida)
+def nueva_version_del_diccionario(sender, raw=False, **kwargs):
+    if raw:
+        return
+    nueva_version_diccionario()
+
+
+@receiver(post_save, sender=Servicio)
+def actualizar_huella_servicio(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not {"titulo", "descripcion"} & set(update_fields):
+        return
+    huellas.actualizar_huella(instance)
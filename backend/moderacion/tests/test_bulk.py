@@ -0,0 +1,63 @@
+import pytest
+from rest_framework.test import APIClient
+
+from moderacion.models import Moderacion
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def moderaciones():
+    usuario = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario)
+    resultado = []
+    for n in range(4):
+        servicio = Servicio.objects.create(
+            trabajador=perfil, titulo=f"S{n}", descripcion="d", categoria="Otros", precio=10
+        )
+        resultado.append(Moderacion.objects.create(servicio=servicio, palabras_detectadas="arma"))
+    return resultado
+
+
+def cliente(rol_base):
+    usuario = Usuario.objects.create_user(
+        email=f"{rol_base}@test.com", nombre=rol_base, password="123", rol_base=rol_base
+    )
+    api = APIClient()
+    api.force_authenticate(usuario)
+    return api
+
+
+def test_bulk_aprueba_pendientes_y_omite_el_resto(moderaciones, django_assert_max_num_queries):
+    ya_rechazada = moderaciones[3]
+    ya_rechazada.estado = "rechazado"
+    ya_rechazada.save()
+    ids = [m.id_moderacion for m in moderaciones] + [9999]
+    api = cliente("admin")
+
+    # Lectura + 2 UPDATE (más sesión/usuario y la transacción), sin importar cuántos ids
+    with django_assert_max_num_queries(8):
+        response = api.post("/api/moderacion/bulk/", {"ids": ids, "accion": "aprobar"}, format="json")
+
+    assert response.status_code == 200
+    assert response.data["procesados"] == 3
+    resultados = {r["id_moderacion"]: r for r in response.data["resultados"]}
+    assert resultados[moderaciones[0].id_moderacion]["resultado"] == "aprobado"
+    assert resultados[ya_rechazada.id_moderacion] == {
+        "id_moderacion": ya_rechazada.id_moderacion, "resultado": "omitido", "estado": "rechazado"
+    }
+    assert resultados[9999]["resultado"] == "no_encontrado"
+
+    assert Servicio.objects.filter(estado_publicacion="aprobado").count() == 3
+    assert Moderacion.objects.filter(estado="aprobado", admin__rol_base="admin").count() == 3
+
+
+def test_bulk_solo_admin_y_valida_accion(moderaciones):
+    ids = [moderaciones[0].id_moderacion]
+    assert cliente("cliente").post(
+        "/api/moderacion/bulk/", {"ids": ids, "accion": "rechazar"}, format="json"
+    ).status_code == 403
+    assert cliente("admin").post(
+        "/api/moderacion/bulk/", {"ids": ids, "accion": "borrar"}, format="json"
+    ).status_code == 400
@@ -0,0 +1,89 @@
+from datetime import timedelta
+from unittest import mock
+
+import pytest
+from django.utils import timezone
+
+from moderacion import cola
+from moderacion.models import Moderacion, TareaModeracion
+from moderacion.motor import get_motor
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def perfil():
+    usuario = Usuario.objects.create_user(email="cola@test.com", nombre="Cola", password="123")
+    return PerfilTrabajador.objects.create(usuario=usuario)
+
+
+def crear_servicio(perfil, titulo):
+    return Servicio.objects.create(
+        trabajador=perfil, titulo=titulo, descripcion="d", categoria="Otros", precio=10
+    )
+
+
+@pytest.fixture
+def modo_externo(settings):
+    settings.MODERACION = {**settings.MODERACION, "MODO": "externo", "ESPERA_BASE": 10, "MAX_INTENTOS": 2}
+
+
+def test_modo_externo_solo_encola(perfil, modo_externo):
+    servicio = crear_servicio(perfil, "Clases de guitarra")
+    tarea = cola.encolar(servicio)
+
+    servicio.refresh_from_db()
+    assert servicio.estado_publicacion == "pendiente"
+    assert tarea.estado == "pendiente"
+
+
+def test_lote_aprueba_y_marca_en_una_pasada(perfil, modo_externo, django_assert_max_num_queries):
+    limpios = [crear_servicio(perfil, f"Plomería {n}") for n in range(5)]
+    marcado = crear_servicio(perfil, "Vendo armas")
+    for servicio in limpios + [marcado]:
+        cola.encolar(servicio)
+
+    get_motor()  # diccionario ya compilado en el proceso
+
+    # Reclamar (3) + duplicados (2) + transacción de resultados, sin importar el tamaño del lote
+    with django_assert_max_num_queries(11):
+        assert cola.procesar_lote(tamano=10) == 6
+
+    assert Servicio.objects.filter(estado_publicacion="aprobado").count() == 5
+    marcado.refresh_from_db()
+    assert marcado.estado_publicacion == "pendiente" and marcado.palabras_detectadas
+    assert Moderacion.objects.get(servicio=marcado).palabras_detectadas == "arma"
+    assert set(TareaModeracion.objects.values_list("estado", flat=True)) == {"completada"}
+    assert cola.procesar_lote() == 0
+
+
+def test_reintento_con_espera_y_fallo_definitivo(perfil, modo_externo):
+    tarea = cola.encolar(crear_servicio(perfil, "Clases de inglés"))
+
+    with mock.patch.object(cola, "revisar", side_effect=RuntimeError("caído")):
+        assert cola.procesar_lote() == 1
+        tarea.refresh_from_db()
+        assert tarea.estado == "pendiente" and tarea.intentos == 1
+        assert tarea.proximo_intento > timezone.now()
+        # Todavía en espera: no se vuelve a tomar
+        assert cola.procesar_lote() == 0
+
+        TareaModeracion.objects.update(proximo_intento=timezone.now() - timedelta(seconds=1))
+        assert cola.procesar_lote() == 1
+
+    tarea.refresh_from_db()
+    assert tarea.estado == "fallida" and tarea.intentos == 2
+    assert "caído" in tarea.error
+
+
+def test_tarea_con_bloqueo_vencido_se_retoma(perfil, modo_externo):
+    tarea = cola.encolar(crear_servicio(perfil, "Pintura"))
+    TareaModeracion.objects.filter(pk=tarea.pk).update(
+        estado="procesando", reclamada_por="muerto",
+        proximo_intento=timezone.now() - timedelta(seconds=1),
+    )
+
+    assert cola.procesar_lote() == 1
+    tarea.refresh_from_db()
+    assert tarea.estado == "completada"
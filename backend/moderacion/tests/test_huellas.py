@@ -0,0 +1,71 @@
+from django.core.management import call_command
+
+from moderacion import cola, huellas
+from moderacion.models import HuellaServicio, Moderacion
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+ANUNCIO = (
+    "Plomero con experiencia en Medellín",
+    "Reparación de fugas, instalación de lavamanos, duchas y calentadores a domicilio todos los días",
+)
+
+
+def crear_perfil(n):
+    usuario = Usuario.objects.create_user(email=f"dup{n}@test.com", nombre=f"D{n}", password="123")
+    return PerfilTrabajador.objects.create(usuario=usuario)
+
+
+def crear_servicio(perfil, titulo, descripcion, **extra):
+    return Servicio.objects.create(
+        trabajador=perfil, titulo=titulo, descripcion=descripcion, categoria="Hogar", precio=10, **extra
+    )
+
+
+def test_simhash_cercano_para_textos_casi_iguales():
+    a = huellas.simhash(" ".join(ANUNCIO))
+    b = huellas.simhash(" ".join(ANUNCIO).replace("todos los días", "todos los dias!!"))
+    c = huellas.simhash("Clases de piano y guitarra para niños y jóvenes en Bogotá")
+    assert huellas.distancia(a, b) <= huellas.DISTANCIA_MAXIMA
+    assert huellas.distancia(a, c) > huellas.DISTANCIA_MAXIMA
+    assert huellas.simhash("Plomería") is None
+
+
+def test_huella_se_guarda_al_guardar_el_servicio():
+    servicio = crear_servicio(crear_perfil(1), *ANUNCIO)
+    huella = HuellaServicio.objects.get(servicio=servicio)
+    valor = huellas.sin_signo(huella.simhash)
+    assert [huella.banda0, huella.banda1, huella.banda2, huella.banda3] == huellas.bandas(valor)
+
+
+def test_copia_de_otra_cuenta_va_a_moderacion():
+    original = crear_servicio(crear_perfil(1), *ANUNCIO, estado_publicacion="aprobado")
+    copia = crear_servicio(crear_perfil(2), ANUNCIO[0].upper(), ANUNCIO[1] + ".")
+    distinto = crear_servicio(crear_perfil(3), "Clases de piano", "Clases de piano y guitarra para niños y jóvenes")
+
+    cola.encolar(copia)
+    cola.encolar(distinto)
+
+    copia.refresh_from_db()
+    assert copia.estado_publicacion == "pendiente" and not copia.palabras_detectadas
+    moderacion = Moderacion.objects.get(servicio=copia)
+    assert moderacion.duplicado_de_id == original.pk
+    assert Servicio.objects.get(pk=distinto.pk).estado_publicacion == "aprobado"
+    assert huellas.buscar_duplicados([original.pk]) == {}
+
+
+def test_agrupar_catalogo_y_marcar_copias():
+    perfiles = [crear_perfil(n) for n in range(3)]
+    grupo = [crear_servicio(p, *ANUNCIO, estado_publicacion="aprobado") for p in perfiles]
+    crear_servicio(perfiles[0], "Clases de piano", "Clases de piano y guitarra para niños y jóvenes")
+    HuellaServicio.objects.all().delete()
+
+    call_command("agrupar_duplicados", marcar=True)
+
+    assert huellas.agrupar() == [[s.pk for s in grupo]]
+    assert set(Moderacion.objects.values_list("servicio_id", "duplicado_de_id")) == {
+        (grupo[1].pk, grupo[0].pk), (grupo[2].pk, grupo[0].pk)
+    }
+    assert Servicio.objects.get(pk=grupo[0].pk).estado_publicacion == "aprobado"
@@ -0,0 +1,68 @@
+import pytest
+from rest_framework.test import APIClient
+
+from moderacion.models import Moderacion
+from moderacion.motor import MotorModeracion
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def motor():
+    return MotorModeracion(["arma", "porno", "pornografia", "venta de organos", "estafa"])
+
+
+def test_respeta_limites_de_palabra(motor):
+    assert motor.terminos_encontrados("Atención en farmacia y desarmado de muebles") == []
+    assert motor.terminos_encontrados("Vendo arma usada") == ["arma"]
+
+
+def test_admite_plural(motor):
+    assert motor.terminos_encontrados("Reparo armas y estafas") == ["arma", "estafa"]
+
+
+def test_normaliza_acentos_mayusculas_y_leetspeak(motor):
+    assert motor.terminos_encontrados("PORNOGRAFÍA gratis") == ["pornografia"]
+    assert motor.terminos_encontrados("Vendo 4rm4 barata") == ["arma"]
+    assert motor.terminos_encontrados("No es una e$taf4") == ["estafa"]
+
+
+def test_terminos_de_varias_palabras(motor):
+    assert motor.terminos_encontrados("Hago  venta   de órganos") == ["venta de organos"]
+
+
+def test_devuelve_posiciones_en_el_texto_original(motor):
+    texto = "Clases de música. Vendo ARM4S baratas."
+    (coincidencia,) = motor.buscar(texto)
+    assert coincidencia.termino == "arma"
+    assert texto[coincidencia.inicio:coincidencia.fin] == "ARM4S"
+    assert coincidencia.fragmento == "ARM4S"
+
+
+def test_diccionario_grande():
+    terminos = [f"termino{i}x" for i in range(5000)] + ["arma"]
+    motor = MotorModeracion(terminos)
+    assert motor.terminos_encontrados("termino4999x y arma, pero no termino5000x") == ["termino4999x", "arma"]
+
+
+@pytest.mark.django_db
+def test_crear_servicio_usa_el_motor():
+    usuario = Usuario.objects.create_user(
+        email="mod@test.com", nombre="Mod", password="clave12345", rol_base="trabajador"
+    )
+    PerfilTrabajador.objects.create(usuario=usuario)
+    cliente = APIClient()
+    cliente.force_authenticate(usuario)
+
+    datos = {"titulo": "Domicilios de farmacia", "descripcion": "Entrego medicamentos", "categoria": "Otros", "precio": 10000}
+    respuesta = cliente.post("/api/servicios/", datos, format="json")
+    assert respuesta.status_code == 201
+    assert Servicio.objects.get(titulo=datos["titulo"]).estado_publicacion == "aprobado"
+
+    datos = {"titulo": "Vendo 4rmas", "descripcion": "Baratas", "categoria": "Otros", "precio": 10000}
+    respuesta = cliente.post("/api/servicios/", datos, format="json")
+    assert respuesta.status_code == 201
+    servicio = Servicio.objects.get(titulo=datos["titulo"])
+    assert servicio.estado_publicacion == "pendiente"
+    assert Moderacion.objects.get(servicio=servicio).palabras_detectadas == "arma"
@@ -0,0 +1,96 @@
+import pytest
+from django.core.management import call_command
+
+from moderacion.models import Moderacion, PalabraProhibida, RevisionCatalogo, VersionDiccionario
+from moderacion.motor import get_motor
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def catalogo():
+    usuario = Usuario.objects.create_user(email="rev@test.com", nombre="Rev", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario)
+    titulos = ["Clases de tarot", "Plomería", "Tarot y cartas", "Pintura", "Vendo armas"]
+    return [
+        Servicio.objects.create(
+            trabajador=perfil, titulo=titulo, descripcion="d", categoria="Otros",
+            precio=10, estado_publicacion="aprobado",
+        )
+        for titulo in titulos
+    ]
+
+
+def test_diccionario_en_base_de_datos_con_version():
+    assert "arma" in get_motor().terminos_encontrados("armas")
+    version = VersionDiccionario.actual()
+
+    PalabraProhibida.objects.create(termino="tarot")
+    assert VersionDiccionario.actual() == version + 1
+    assert get_motor().terminos_encontrados("Lectura de tarot") == ["tarot"]
+
+    # update() en bloque no pasa por signals, pero también mueve la versión
+    PalabraProhibida.objects.filter(termino="tarot").update(activa=False)
+    assert VersionDiccionario.actual() == version + 2
+    assert get_motor().terminos_encontrados("tarot y armas") == ["arma"]
+
+    PalabraProhibida.objects.get(termino="arma").delete()
+    assert get_motor().terminos_encontrados("tarot y armas") == []
+
+    PalabraProhibida.objects.bulk_create([PalabraProhibida(termino="tarot2")])
+    assert get_motor().terminos_encontrados("tarot2") == ["tarot2"]
+
+
+def test_remoderar_es_reanudable(catalogo):
+    PalabraProhibida.objects.create(termino="tarot")
+
+    call_command("remoderar_catalogo", lote=2, max_lotes=1)
+    revision = RevisionCatalogo.objects.get()
+    assert revision.terminada is None and revision.revisados == 2
+
+    call_command("remoderar_catalogo", lote=2)
+    revision.refresh_from_db()
+    assert revision.terminada is not None
+    assert (revision.revisados, revision.marcados) == (5, 3)
+
+    marcados = Servicio.objects.filter(palabras_detectadas=True, estado_publicacion="pendiente")
+    assert set(marcados.values_list("titulo", flat=True)) == {"Clases de tarot", "Tarot y cartas", "Vendo armas"}
+    assert Moderacion.objects.filter(estado="pendiente").count() == 3
+
+
+def test_remoderar_respeta_admin_y_libera_al_quitar_palabras(catalogo):
+    PalabraProhibida.objects.create(termino="tarot")
+    call_command("remoderar_catalogo")
+
+    # Un admin aprueba uno de los marcados: no se vuelve a marcar por lo mismo
+    aprobado = Moderacion.objects.get(servicio=catalogo[0])
+    aprobado.estado = "aprobado"
+    aprobado.save()
+    Servicio.objects.filter(pk=catalogo[0].pk).update(estado_publicacion="aprobado")
+
+    PalabraProhibida.objects.filter(termino="arma").delete()
+    call_command("remoderar_catalogo")
+
+    revision = RevisionCatalogo.objects.latest("id_revision")
+    assert (revision.marcados, revision.liberados) == (0, 1)
+    vendo = Servicio.objects.get(pk=catalogo[4].pk)
+    assert vendo.estado_publicacion == "aprobado" and not vendo.palabras_detectadas
+    assert Servicio.objects.get(pk=catalogo[0].pk).estado_publicacion == "aprobado"
+
+
+def test_remoderar_no_aprueba_duplicados_retenidos(catalogo):
+    call_command("remoderar_catalogo")
+    vendo, pintura = catalogo[4], catalogo[3]
+    assert Servicio.objects.get(pk=vendo.pk).palabras_detectadas
+
+    # Además de las palabras, quedó retenido como copia de otro servicio
+    Moderacion.objects.filter(servicio=vendo).update(duplicado_de=pintura)
+
+    PalabraProhibida.objects.filter(termino="arma").delete()
+    call_command("remoderar_catalogo")
+
+    vendo = Servicio.objects.get(pk=vendo.pk)
+    assert not vendo.palabras_detectadas
+    assert vendo.estado_publicacion == "pendiente"
+    assert Moderacion.objects.get(servicio=vendo).estado == "pendiente"
@@ -4,6 +4,7 @@ from .views import (
     ServiciosPendientesModeracionView,
     AprobarServicioView,
     RechazarServicioView,
+    ModeracionBulkView,
     ModeracionViewSet
 )
 
@@ -14,5 +15,6 @@ urlpatterns = [
     path('pendientes/', ServiciosPendientesModeracionView.as_view(), name='servicios-pendientes'),
     path('<int:id_moderacion>/aprobar/', AprobarServicioView.as_view(), name='aprobar-servicio'),
     path('<int:id_moderacion>/rechazar/', RechazarServicioView.as_view(), name='rechazar-servicio'),
+    path('bulk/', ModeracionBulkView.as_view(), name='moderacion-bulk'),
     path('', include(router.urls)),
 ]
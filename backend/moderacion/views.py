@@ -4,9 +4,13 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 
+from django.db import transaction
+from django.utils import timezone
+
 from .models import Moderacion
-from .serializers import ModeracionSerializer
+from .serializers import ModeracionSerializer, ModeracionBulkSerializer
 from servicios.models import Servicio
+from backend.cache import invalidar_catalogo
 
 
 class ServiciosPendientesModeracionView(generics.ListAPIView):
@@ -107,6 +111,68 @@ class RechazarServicioView(APIView):
         })
 
 
+class ModeracionBulkView(APIView):
+    """
+    Aprobar o rechazar muchas moderaciones en una petición (SOLO ADMIN).
+    Body: {"ids": [1, 2, ...], "accion": "aprobar" | "rechazar"}
+
+    Los cambios se aplican con un UPDATE sobre Moderacion y otro sobre
+    Servicio dentro de una transacción. Las moderaciones que ya no están
+    pendientes se omiten. Resultado por id: aprobado / rechazado /
+    omitido (con el estado actual) / no_encontrado.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    ESTADO_POR_ACCION = {"aprobar": "aprobado", "rechazar": "rechazado"}
+
+    def post(self, request):
+        if request.user.rol_base != "admin":
+            return Response(
+                {"error": "Solo administradores pueden moderar servicios."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = ModeracionBulkSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+        nuevo_estado = self.ESTADO_POR_ACCION[serializer.validated_data["accion"]]
+
+        with transaction.atomic():
+            actuales = {
+                pk: (estado, servicio_id)
+                for pk, estado, servicio_id in Moderacion.objects.select_for_update()
+                .filter(id_moderacion__in=ids)
+                .values_list("id_moderacion", "estado", "servicio_id")
+            }
+            pendientes = [pk for pk in ids if pk in actuales and actuales[pk][0] == "pendiente"]
+
+            if pendientes:
+                Moderacion.objects.filter(id_moderacion__in=pendientes, estado="pendiente").update(
+                    estado=nuevo_estado, admin=request.user
+                )
+                Servicio.objects.filter(
+                    id_servicio__in=[actuales[pk][1] for pk in pendientes]
+                ).update(estado_publicacion=nuevo_estado, actualizado=timezone.now())
+
+        if pendientes:
+            invalidar_catalogo()
+
+        resultados = []
+        for pk in ids:
+            if pk not in actuales:
+                resultados.append({"id_moderacion": pk, "resultado": "no_encontrado"})
+            elif actuales[pk][0] != "pendiente":
+                resultados.append({"id_moderacion": pk, "resultado": "omitido", "estado": actuales[pk][0]})
+            else:
+                resultados.append({"id_moderacion": pk, "resultado": nuevo_estado})
+
+        return Response({
+            "procesados": len(pendientes),
+            "omitidos": len(ids) - len(pendientes),
+            "resultados": resultados,
+        })
+
+
 class ModeracionViewSet(viewsets.ModelViewSet):
     """
     Historial de moderaciones (SOLO ADMIN).
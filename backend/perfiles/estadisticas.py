@@ -0,0 +1,104 @@
+"""
+Panel del trabajador (GET /api/perfiles/mi-perfil/stats/).
+
+Cinco consultas fijas: el perfil con su membresía, solicitudes por estado y
+distribución de calificaciones (un aggregate con Count(filter=Q(...)) cada
+una), servicios publicados y mensajes no leídos.
+
+El resultado se cachea por trabajador bajo una clave con dos generaciones:
+
+- la del panel (`invalidar`), que mueven perfiles.signals al cambiar
+  calificaciones, servicios o la membresía;
+- la de la bandeja del chat (chat.inbox), que ya se mueve con mensajes
+  nuevos, lecturas y cambios de solicitudes (incluidas las transiciones).
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from backend.cache import incrementar_generacion, leer_generacion
+from calificaciones.models import Calificacion
+from chat import inbox
+from chat.models import LecturaConversacion, Mensaje
+from membresias.models import Membresia
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+
+
+CONFIG_POR_DEFECTO = {
+    "TIMEOUT": 300,  # segundos en cache
+}
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "PANEL_TRABAJADOR", {})}
+
+
+def _clave_generacion(trabajador_id):
+    return f"perfil:stats:gen:{trabajador_id}"
+
+
+def generacion(trabajador_id):
+    return leer_generacion(_clave_generacion(trabajador_id))
+
+
+def invalidar(*trabajador_ids):
+    for trabajador_id in set(filter(None, trabajador_ids)):
+        incrementar_generacion(_clave_generacion(trabajador_id))
+
+
+def calcular(perfil):
+    usuario = perfil.usuario
+
+    solicitudes = Solicitud.objects.filter(trabajador=perfil).aggregate(
+        total=Count("pk"),
+        **{estado: Count("pk", filter=Q(estado=estado)) for estado, _ in Solicitud.ESTADOS},
+    )
+
+    distribucion = Calificacion.objects.filter(trabajador=perfil).aggregate(
+        **{str(puntaje): Count("pk", filter=Q(puntaje=puntaje)) for puntaje in range(1, 6)}
+    )
+
+    membresia = getattr(perfil, "membresia", None)
+    plan = membresia.plan if membresia else "free"
+    limite = Membresia.LIMITE_SERVICIOS.get(plan)
+    servicios = Servicio.objects.filter(trabajador=perfil).count()
+
+    marca = Coalesce(Subquery(
+        LecturaConversacion.objects.filter(solicitud=OuterRef("solicitud"), usuario=usuario).values("ultimo_leido")[:1]
+    ), 0)
+    no_leidos = (
+        Mensaje.objects.filter(
+            solicitud__in=Solicitud.objects.filter(Q(cliente=usuario) | Q(trabajador=perfil)).values("pk")
+        )
+        .exclude(remitente=usuario)
+        .annotate(marca_lectura=marca)
+        .filter(id_mensaje__gt=F("marca_lectura"))
+        .count()
+    )
+
+    return {
+        "solicitudes": solicitudes,
+        "calificaciones": {
+            "promedio": perfil.calificacion_promedio,
+            "total": perfil.calificacion_total,
+            "distribucion": distribucion,
+        },
+        "servicios": {
+            "total": servicios,
+            "plan": plan,
+            "limite": limite,
+            "disponibles": None if limite is None else max(limite - servicios, 0),
+        },
+        "mensajes_no_leidos": no_leidos,
+    }
+
+
+def estadisticas(perfil):
+    clave = f"perfil:stats:{perfil.pk}:{generacion(perfil.pk)}:{inbox.generacion(perfil.usuario_id)}"
+    datos = cache.get(clave)
+    if datos is None:
+        datos = calcular(perfil)
+        cache.set(clave, datos, config()["TIMEOUT"])
+    return datos
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:52
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def poblar_agregados(apps, schema_editor):
+    PerfilTrabajador = apps.get_model('perfiles', 'PerfilTrabajador')
+    Calificacion = apps.get_model('calificaciones', 'Calificacion')
+
+    filas = Calificacion.objects.values('trabajador').annotate(suma=Sum('puntaje'), total=Count('pk')).order_by()
+    for fila in filas.iterator():
+        PerfilTrabajador.objects.filter(pk=fila['trabajador']).update(
+            calificacion_suma=fila['suma'],
+            calificacion_total=fila['total'],
+            calificacion_promedio=round(fila['suma'] / fila['total'], 2),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfiles', '0003_alter_perfiltrabajador_usuario'),
+        ('calificaciones', '0003_alter_calificacion_solicitud'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='perfiltrabajador',
+            name='calificacion_actualizada',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='perfiltrabajador',
+            name='calificacion_promedio',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='perfiltrabajador',
+            name='calificacion_suma',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='perfiltrabajador',
+            name='calificacion_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(poblar_agregados, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
 from django.conf import settings
 from usuarios.models import Usuario
+from backend.modelos import CamposCalculadosMixin
 
-class PerfilTrabajador(models.Model):
+class PerfilTrabajador(CamposCalculadosMixin, models.Model):
     id_trabajador = models.AutoField(primary_key=True)
     usuario = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE,related_name='perfil_trabajador')
 
@@ -12,10 +13,36 @@ class PerfilTrabajador(models.Model):
     categoria_principal = models.CharField(max_length=120)
     estado = models.CharField(max_length=20, default="activo")  # activo/inactivo
 
+    # Agregados de calificaciones. Se mantienen en calificaciones.agregados
+    # dentro de la misma transacción que crea/edita/borra la Calificacion.
+    calificacion_suma = models.PositiveIntegerField(default=0)
+    calificacion_total = models.PositiveIntegerField(default=0)
+    calificacion_promedio = models.FloatField(default=0)
+    calificacion_actualizada = models.DateTimeField(blank=True, null=True)
+
+    # Disponibilidad semanal como mapa de bits: 7 días x 96 cuartos de hora,
+    # bit (dia * 96 + cuarto) = libre. Se recalcula desde disponibilidad.mapa
+    # en cada cambio de Disponibilidad; permite buscar "quién atiende el
+    # martes a las 18:00" sin leer las franjas.
+    disponibilidad_semanal = models.BinaryField(default=bytes(7 * 96 // 8), editable=False)
+
+    # Versión para GET condicional (backend.conditional). También se mueve
+    # cuando cambian datos públicos que viven en otras tablas: calificaciones,
+    # disponibilidad, nombre y ciudad del usuario.
+    actualizado = models.DateTimeField(auto_now=True)
+
+    # Fuera de los save() completos (backend.modelos): los escriben
+    # calificaciones.agregados y disponibilidad.mapa con UPDATE
+    campos_calculados = (
+        "calificacion_suma",
+        "calificacion_total",
+        "calificacion_promedio",
+        "calificacion_actualizada",
+        "disponibilidad_semanal",
+    )
+
     def rating_promedio(self):
-        from django.db.models import Avg
-        resultado = self.calificaciones_recibidas.aggregate(Avg("puntaje"))["puntaje__avg"]
-        return round(resultado, 2) if resultado else 0
+        return self.calificacion_promedio
 
     def __str__(self):
         return f"Perfil de {self.usuario.nombre}"
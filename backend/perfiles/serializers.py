@@ -4,8 +4,8 @@ from .models import PerfilTrabajador
 class PerfilTrabajadorSerializer(serializers.ModelSerializer):
     usuario_id = serializers.IntegerField(source="usuario.id_usuario", read_only=True)
     usuario_nombre = serializers.CharField(source="usuario.nombre", read_only=True)
-    calificacion_promedio = serializers.SerializerMethodField()
-    total_calificaciones = serializers.SerializerMethodField()
+    calificacion_promedio = serializers.FloatField(read_only=True)
+    total_calificaciones = serializers.IntegerField(source="calificacion_total", read_only=True)
 
     class Meta:
         model = PerfilTrabajador
@@ -23,12 +23,6 @@ class PerfilTrabajadorSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["estado", "calificacion_promedio", "total_calificaciones"]
 
-    def get_calificacion_promedio(self, obj):
-        return obj.rating_promedio()
-
-    def get_total_calificaciones(self, obj):
-        return obj.calificaciones_recibidas.count()
-
 
 class PerfilTrabajadorPublicoSerializer(serializers.ModelSerializer):
     """
@@ -36,8 +30,8 @@ class PerfilTrabajadorPublicoSerializer(serializers.ModelSerializer):
     SIN datos personales (email, teléfono, dirección).
     """
     nombre = serializers.CharField(source="usuario.nombre", read_only=True)
-    calificacion_promedio = serializers.SerializerMethodField()
-    total_calificaciones = serializers.SerializerMethodField()
+    calificacion_promedio = serializers.FloatField(read_only=True)
+    total_calificaciones = serializers.IntegerField(source="calificacion_total", read_only=True)
 
     class Meta:
         model = PerfilTrabajador
@@ -50,9 +44,3 @@ class PerfilTrabajadorPublicoSerializer(serializers.ModelSerializer):
             "calificacion_promedio",
             "total_calificaciones",
         ]
-
-    def get_calificacion_promedio(self, obj):
-        return obj.rating_promedio()
-
-    def get_total_calificaciones(self, obj):
-        return obj.calificaciones_recibidas.count()
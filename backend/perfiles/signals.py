@@ -0,0 +1,19 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import estadisticas
+
+
+# ---------------------------------------------------------
+# Cache del panel del trabajador (perfiles.estadisticas)
+# ---------------------------------------------------------
+
+@receiver(post_save, sender="calificaciones.Calificacion")
+@receiver(post_delete, sender="calificaciones.Calificacion")
+@receiver(post_save, sender="servicios.Servicio")
+@receiver(post_delete, sender="servicios.Servicio")
+@receiver(post_save, sender="membresias.Membresia")
+@receiver(post_delete, sender="membresias.Membresia")
+def invalidar_estadisticas(sender, instance, raw=False, **kwargs):
+    if not raw:
+        estadisticas.invalidar(instance.trabajador_id)
@@ -0,0 +1,84 @@
+import pytest
+from rest_framework.test import APIClient
+
+from calificaciones.models import Calificacion
+from chat.models import Mensaje
+from membresias.models import Membresia
+from perfiles.estadisticas import estadisticas
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+URL = "/api/perfiles/mi-perfil/stats/"
+
+
+@pytest.fixture
+def panel():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    Membresia.objects.create(trabajador=perfil, plan="free")
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    return cliente, trabajador, perfil, servicio
+
+
+def api(usuario):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client
+
+
+def cargar(perfil):
+    return PerfilTrabajador.objects.select_related("usuario", "membresia").get(pk=perfil.pk)
+
+
+def test_conteos(panel):
+    cliente, trabajador, perfil, servicio = panel
+    for estado in ["pendiente", "pendiente", "aceptada", "finalizada"]:
+        Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio, estado=estado)
+    finalizada = Solicitud.objects.get(estado="finalizada")
+    Calificacion.objects.create(solicitud=finalizada, cliente=cliente, trabajador=perfil, puntaje=4)
+    Mensaje.objects.create(solicitud=finalizada, remitente=cliente, texto="hola")
+    Mensaje.objects.create(solicitud=finalizada, remitente=trabajador, texto="propio")
+
+    res = api(trabajador).get(URL)
+    assert res.status_code == 200
+    assert res.data["solicitudes"]["total"] == 4
+    assert res.data["solicitudes"]["pendiente"] == 2
+    assert res.data["solicitudes"]["rechazada"] == 0
+    assert res.data["calificaciones"]["distribucion"]["4"] == 1
+    assert res.data["calificaciones"]["promedio"] == 4
+    assert res.data["servicios"] == {"total": 1, "plan": "free", "limite": 3, "disponibles": 2}
+    assert res.data["mensajes_no_leidos"] == 1
+
+
+def test_sin_perfil(panel):
+    cliente, *_ = panel
+    assert api(cliente).get(URL).status_code == 400
+
+
+def test_cache_e_invalidacion(panel, django_assert_num_queries):
+    cliente, trabajador, perfil, servicio = panel
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+
+    estadisticas(cargar(perfil))
+    perfil = cargar(perfil)
+    with django_assert_num_queries(0):
+        datos = estadisticas(perfil)
+    assert datos["mensajes_no_leidos"] == 0
+
+    # Mensaje nuevo: mueve la generación de la bandeja
+    Mensaje.objects.create(solicitud=solicitud, remitente=cliente, texto="hola")
+    assert estadisticas(cargar(perfil))["mensajes_no_leidos"] == 1
+
+    # Transición con UPDATE condicional (estado_cambiado)
+    api(trabajador).patch(f"/api/solicitudes/{solicitud.pk}/aceptar/")
+    api(trabajador).patch(f"/api/solicitudes/{solicitud.pk}/finalizar/")
+    assert estadisticas(cargar(perfil))["solicitudes"]["finalizada"] == 1
+
+    Calificacion.objects.create(solicitud=solicitud, cliente=cliente, trabajador=perfil, puntaje=5)
+    assert estadisticas(cargar(perfil))["calificaciones"]["distribucion"]["5"] == 1
+
+    Servicio.objects.create(trabajador=perfil, titulo="S2", descripcion="d", categoria="Hogar", precio=10)
+    assert estadisticas(cargar(perfil))["servicios"]["disponibles"] == 1
@@ -3,6 +3,7 @@ from rest_framework.routers import DefaultRouter
 from .views import (
     CrearPerfilTrabajadorView, 
     MiPerfilTrabajadorView, 
+    MiPerfilEstadisticasView,
     PerfilTrabajadorViewSet,
     PerfilTrabajadorPublicoView
 )
@@ -13,6 +14,7 @@ router.register(r'', PerfilTrabajadorViewSet, basename='perfil-trabajador')
 urlpatterns = [
     path('crear/', CrearPerfilTrabajadorView.as_view(), name='crear-perfil-trabajador'),
     path('mi-perfil/', MiPerfilTrabajadorView.as_view(), name='mi-perfil-trabajador'),
+    path('mi-perfil/stats/', MiPerfilEstadisticasView.as_view(), name='mi-perfil-estadisticas'),
     path('publico/<int:id_trabajador>/', PerfilTrabajadorPublicoView.as_view(), name='perfil-trabajador-publico'),
     path('', include(router.urls)),
 ]
\ No newline at end of file
@@ -1,21 +1,26 @@
 from rest_framework import generics, permissions, viewsets, serializers
+from rest_framework.response import Response
+from rest_framework.views import APIView
 from .models import PerfilTrabajador
+from .estadisticas import estadisticas
 from .serializers import PerfilTrabajadorSerializer, PerfilTrabajadorPublicoSerializer
 from .filters import PerfilTrabajadorFilter
+from backend.cache import CachePublicoMixin
+from backend.conditional import ConditionalGetMixin
 
-class PerfilTrabajadorPublicoView(generics.RetrieveAPIView):
+class PerfilTrabajadorPublicoView(ConditionalGetMixin, CachePublicoMixin, generics.RetrieveAPIView):
     """
     Vista pública del perfil de un trabajador (sin autenticación).
     Muestra solo información básica: nombre, calificación, experiencia.
     """
     serializer_class = PerfilTrabajadorPublicoSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = PerfilTrabajador.objects.filter(estado="activo")
+    queryset = PerfilTrabajador.objects.filter(estado="activo").select_related("usuario")
     lookup_field = "id_trabajador"
 
 
-class PerfilTrabajadorViewSet(viewsets.ModelViewSet):
-    queryset = PerfilTrabajador.objects.all()
+class PerfilTrabajadorViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
+    queryset = PerfilTrabajador.objects.select_related("usuario")
     serializer_class = PerfilTrabajadorSerializer
     permission_classes = [permissions.IsAuthenticated]
     filterset_class = PerfilTrabajadorFilter
@@ -41,12 +46,33 @@ class CrearPerfilTrabajadorView(generics.CreateAPIView):
         serializer.save(usuario=self.request.user)
 
 
-class MiPerfilTrabajadorView(generics.RetrieveUpdateAPIView):
+class MiPerfilTrabajadorView(ConditionalGetMixin, generics.RetrieveUpdateAPIView):
     serializer_class = PerfilTrabajadorSerializer
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return PerfilTrabajador.objects.filter(usuario=self.request.user)
+
     def get_object(self):
         perfil = PerfilTrabajador.objects.filter(usuario=self.request.user).first()
         if not perfil:
             raise serializers.ValidationError("Este usuario no tiene perfil de trabajador.")
         return perfil
+
+
+class MiPerfilEstadisticasView(APIView):
+    """
+    Panel del trabajador: solicitudes por estado, calificaciones, servicios
+    frente al límite del plan y mensajes no leídos (perfiles.estadisticas).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        perfil = (
+            PerfilTrabajador.objects.filter(usuario=request.user)
+            .select_related("usuario", "membresia")
+            .first()
+        )
+        if not perfil:
+            raise serializers.ValidationError("Este usuario no tiene perfil de trabajador.")
+        return Response(estadisticas(perfil))
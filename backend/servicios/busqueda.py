@@ -0,0 +1,156 @@
+"""
+Búsqueda de texto completo del catálogo de servicios.
+
+El documento de cada servicio (titulo, descripcion, categoria, habilidades
+y ciudad del trabajador) se guarda normalizado en ServicioBusqueda. Según la
+base de datos se consulta con:
+
+- SQLite: tabla virtual FTS5 `servicios_busqueda_fts` (ranking bm25).
+- PostgreSQL: índice GIN sobre to_tsvector('simple', documento) (ts_rank).
+- Otras: LIKE sobre el documento normalizado, sin ranking.
+
+Las tablas/índices se crean en la migración servicios.0003_busqueda.
+"""
+from django.db import connection
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import RawSQL
+
+from backend.modelos import insertar_o_actualizar
+from backend.texto import normalizar, palabras
+
+from .models import Servicio, ServicioBusqueda
+
+
+MAX_TERMINOS = 8
+TABLA_FTS = "servicios_busqueda_fts"
+
+
+# ---------------------------------------------------------
+# Escritura del índice
+# ---------------------------------------------------------
+
+def documento_servicio(servicio):
+    trabajador = servicio.trabajador
+    partes = [
+        servicio.titulo,
+        servicio.descripcion,
+        servicio.categoria,
+        trabajador.habilidades,
+        trabajador.usuario.ciudad,
+    ]
+    return normalizar(" ".join(p for p in partes if p))
+
+
+def _guardar(servicios):
+    filas = [
+        ServicioBusqueda(servicio_id=s.pk, documento=documento_servicio(s))
+        for s in servicios
+    ]
+    # Un solo INSERT ... ON CONFLICT DO UPDATE por lote donde la base lo admite
+    insertar_o_actualizar(ServicioBusqueda, filas, ["servicio"], ["documento"])
+    return len(filas)
+
+
+def indexar_servicio(servicio):
+    _guardar([servicio])
+
+
+def indexar_trabajador(trabajador_id):
+    servicios = Servicio.objects.filter(trabajador_id=trabajador_id).select_related("trabajador__usuario")
+    return _guardar(servicios)
+
+
+def reindexar_todo(lote=1000):
+    total = 0
+    pendientes = []
+    servicios = Servicio.objects.select_related("trabajador__usuario").order_by("pk")
+    for servicio in servicios.iterator(chunk_size=lote):
+        pendientes.append(servicio)
+        if len(pendientes) >= lote:
+            total += _guardar(pendientes)
+            pendientes = []
+    total += _guardar(pendientes)
+    get_backend().reconstruir()
+    return total
+
+
+# ---------------------------------------------------------
+# Backends de consulta
+# ---------------------------------------------------------
+
+class BackendBusqueda:
+    def filtrar(self, qs, terminos):
+        """Filtra `qs` y anota `relevancia` (mayor es mejor)."""
+        for termino in terminos:
+            qs = qs.filter(busqueda__documento__contains=termino)
+        return qs.annotate(relevancia=Value(0.0, output_field=FloatField()))
+
+    def reconstruir(self):
+        pass
+
+
+class BackendSQLite(BackendBusqueda):
+    def filtrar(self, qs, terminos):
+        consulta = " ".join(f'"{t}"*' for t in terminos)
+        tabla = Servicio._meta.db_table
+        # La tabla FTS entra una vez en el FROM: MATCH se evalúa una sola vez
+        # y bm25() lee la fila encontrada (igual que chat.busqueda)
+        qs = qs.extra(
+            tables=[TABLA_FTS],
+            where=[f"{TABLA_FTS}.rowid = {tabla}.id_servicio", f"{TABLA_FTS} MATCH %s"],
+            params=[consulta],
+        )
+        return qs.annotate(relevancia=RawSQL(f"-bm25({TABLA_FTS})", [], output_field=FloatField()))
+
+    def reconstruir(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('rebuild')")
+            cursor.execute(f"INSERT INTO {TABLA_FTS}({TABLA_FTS}) VALUES ('optimize')")
+
+
+class BackendPostgres(BackendBusqueda):
+    def filtrar(self, qs, terminos):
+        consulta = " & ".join(f"{t}:*" for t in terminos)
+        tabla = Servicio._meta.db_table
+        indice = ServicioBusqueda._meta.db_table
+        # El documento se une una vez; misma expresión que el índice GIN
+        vector = f"to_tsvector('simple', {indice}.documento)"
+        qs = qs.extra(
+            tables=[indice],
+            where=[f"{indice}.servicio_id = {tabla}.id_servicio", f"{vector} @@ to_tsquery('simple', %s)"],
+            params=[consulta],
+        )
+        return qs.annotate(relevancia=RawSQL(
+            f"ts_rank({vector}, to_tsquery('simple', %s))", [consulta], output_field=FloatField()
+        ))
+
+
+_fts_disponible = None
+
+
+def _sqlite_tiene_fts():
+    global _fts_disponible
+    if _fts_disponible is None:
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE name = %s", [TABLA_FTS])
+            _fts_disponible = cursor.fetchone() is not None
+    return _fts_disponible
+
+
+def get_backend():
+    if connection.vendor == "sqlite" and _sqlite_tiene_fts():
+        return BackendSQLite()
+    if connection.vendor == "postgresql":
+        return BackendPostgres()
+    return BackendBusqueda()
+
+
+def buscar(qs, texto):
+    """
+    Aplica la búsqueda `texto` sobre un queryset de Servicio y lo ordena por
+    relevancia. Si el texto no tiene palabras, devuelve el queryset intacto.
+    """
+    terminos = palabras(texto)[:MAX_TERMINOS]
+    if not terminos:
+        return qs
+    return get_backend().filtrar(qs, terminos).order_by(F("relevancia").desc(nulls_last=True), "-pk")
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from servicios.busqueda import reindexar_todo
+
+
+class Command(BaseCommand):
+    help = "Reconstruye el índice de búsqueda de texto completo del catálogo de servicios."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--lote", type=int, default=1000, help="Servicios por lote.")
+
+    def handle(self, *args, **options):
+        total = reindexar_todo(lote=options["lote"])
+        self.stdout.write(self.style.SUCCESS(f"Índice reconstruido: {total} servicios."))
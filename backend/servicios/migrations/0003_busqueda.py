@@ -0,0 +1,108 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+from backend.texto import normalizar
+
+
+SQLITE_CREAR = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS servicios_busqueda_fts USING fts5(
+        documento,
+        content='servicios_serviciobusqueda',
+        content_rowid='servicio_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicios_busqueda_ai AFTER INSERT ON servicios_serviciobusqueda BEGIN
+        INSERT INTO servicios_busqueda_fts(rowid, documento) VALUES (new.servicio_id, new.documento);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicios_busqueda_ad AFTER DELETE ON servicios_serviciobusqueda BEGIN
+        INSERT INTO servicios_busqueda_fts(servicios_busqueda_fts, rowid, documento)
+        VALUES ('delete', old.servicio_id, old.documento);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS servicios_busqueda_au AFTER UPDATE ON servicios_serviciobusqueda BEGIN
+        INSERT INTO servicios_busqueda_fts(servicios_busqueda_fts, rowid, documento)
+        VALUES ('delete', old.servicio_id, old.documento);
+        INSERT INTO servicios_busqueda_fts(rowid, documento) VALUES (new.servicio_id, new.documento);
+    END
+    """,
+]
+
+SQLITE_BORRAR = [
+    "DROP TRIGGER IF EXISTS servicios_busqueda_au",
+    "DROP TRIGGER IF EXISTS servicios_busqueda_ad",
+    "DROP TRIGGER IF EXISTS servicios_busqueda_ai",
+    "DROP TABLE IF EXISTS servicios_busqueda_fts",
+]
+
+POSTGRES_CREAR = [
+    "CREATE INDEX IF NOT EXISTS servicios_busqueda_gin "
+    "ON servicios_serviciobusqueda USING GIN (to_tsvector('simple', documento))",
+]
+
+POSTGRES_BORRAR = [
+    "DROP INDEX IF EXISTS servicios_busqueda_gin",
+]
+
+
+def _ejecutar(schema_editor, sentencias):
+    for sql in sentencias:
+        schema_editor.execute(sql)
+
+
+def crear_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        try:
+            _ejecutar(schema_editor, SQLITE_CREAR)
+        except Exception:
+            # SQLite compilado sin FTS5: la búsqueda cae al backend LIKE
+            pass
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES_CREAR)
+
+
+def borrar_indice(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        _ejecutar(schema_editor, SQLITE_BORRAR)
+    elif vendor == 'postgresql':
+        _ejecutar(schema_editor, POSTGRES_BORRAR)
+
+
+def poblar_indice(apps, schema_editor):
+    Servicio = apps.get_model('servicios', 'Servicio')
+    ServicioBusqueda = apps.get_model('servicios', 'ServicioBusqueda')
+
+    filas = []
+    for s in Servicio.objects.select_related('trabajador__usuario').iterator():
+        partes = [s.titulo, s.descripcion, s.categoria, s.trabajador.habilidades, s.trabajador.usuario.ciudad]
+        filas.append(ServicioBusqueda(servicio_id=s.pk, documento=normalizar(" ".join(p for p in partes if p))))
+    ServicioBusqueda.objects.bulk_create(filas, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servicios', '0002_alter_servicio_precio'),
+        ('usuarios', '0003_add_user_fields'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ServicioBusqueda',
+            fields=[
+                ('servicio', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='busqueda', serialize=False, to='servicios.servicio')),
+                ('documento', models.TextField(blank=True, default='')),
+            ],
+        ),
+        migrations.RunPython(crear_indice, borrar_indice),
+        migrations.RunPython(poblar_indice, migrations.RunPython.noop),
+    ]
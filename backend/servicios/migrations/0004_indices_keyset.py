@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfiles', '0004_calificacion_agregados'),
+        ('servicios', '0003_busqueda'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='servicio',
+            index=models.Index(fields=['fecha_publicacion', 'id_servicio'], name='servicio_fecha_pk_idx'),
+        ),
+    ]
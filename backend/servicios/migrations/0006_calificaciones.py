@@ -0,0 +1,28 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('servicios', '0005_actualizado'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicio',
+            name='calificacion_promedio',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='servicio',
+            name='calificacion_suma',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='servicio',
+            name='calificacion_total',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,8 +1,9 @@
 from django.db import models
 from django.core.validators import MinValueValidator  
 from perfiles.models import PerfilTrabajador
+from backend.modelos import CamposCalculadosMixin
 
-class Servicio(models.Model):
+class Servicio(CamposCalculadosMixin, models.Model):
 
     ESTADOS_PUBLICACION = [
         ("pendiente", "Pendiente"),
@@ -40,7 +41,42 @@ class Servicio(models.Model):
 
     fecha_publicacion = models.DateTimeField(auto_now_add=True)
 
+    # Agregados de calificaciones del servicio, mantenidos igual que los del
+    # trabajador (calificaciones.agregados)
+    calificacion_suma = models.PositiveIntegerField(default=0)
+    calificacion_total = models.PositiveIntegerField(default=0)
+    calificacion_promedio = models.FloatField(default=0)
+
+    # Versión para GET condicional (backend.conditional)
+    actualizado = models.DateTimeField(auto_now=True)
+
+    # Fuera de los save() completos (backend.modelos): los escribe
+    # calificaciones.agregados con UPDATE
+    campos_calculados = ("calificacion_suma", "calificacion_total", "calificacion_promedio")
+
     def __str__(self):
         return f"{self.titulo} - {self.trabajador.usuario.nombre}"
 
+    class Meta:
+        indexes = [
+            # Paginación keyset del catálogo público
+            models.Index(fields=["fecha_publicacion", "id_servicio"], name="servicio_fecha_pk_idx"),
+        ]
+
 
+class ServicioBusqueda(models.Model):
+    """
+    Documento normalizado (sin acentos, en minúsculas) que alimenta el índice
+    de búsqueda del catálogo: FTS5 en SQLite, tsvector + GIN en PostgreSQL.
+    Se mantiene desde servicios.signals.
+    """
+    servicio = models.OneToOneField(
+        Servicio,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="busqueda"
+    )
+    documento = models.TextField(blank=True, default="")
+
+    def __str__(self):
+        return f"Índice de búsqueda de {self.servicio_id}"
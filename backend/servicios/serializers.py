@@ -1,9 +1,10 @@
 from rest_framework import serializers
 from .models import Servicio
+from disponibilidad.serializers import FranjaDisponibilidadSerializer
 
 class ServicioSerializer(serializers.ModelSerializer):
     trabajador_id = serializers.IntegerField(source="trabajador.id_trabajador", read_only=True)
-    trabajador_calificacion = serializers.SerializerMethodField()
+    trabajador_calificacion = serializers.FloatField(source="trabajador.calificacion_promedio", read_only=True)
 
     class Meta:
         model = Servicio
@@ -18,12 +19,14 @@ class ServicioSerializer(serializers.ModelSerializer):
             "estado_publicacion",
             "palabras_detectadas",
             "fecha_publicacion",
-            "trabajador_calificacion"
+            "trabajador_calificacion",
+            "calificacion_promedio",
+            "calificacion_total"
+        ]
+        read_only_fields = [
+            "estado_publicacion", "palabras_detectadas", "fecha_publicacion",
+            "calificacion_promedio", "calificacion_total"
         ]
-        read_only_fields = ["estado_publicacion", "palabras_detectadas", "fecha_publicacion"]
-
-    def get_trabajador_calificacion(self, obj):
-        return obj.trabajador.rating_promedio()
 
 
 class ServicioPublicoSerializer(serializers.ModelSerializer):
@@ -32,7 +35,7 @@ class ServicioPublicoSerializer(serializers.ModelSerializer):
     Incluye información básica del trabajador (nombre, calificación).
     """
     trabajador_nombre = serializers.CharField(source="trabajador.usuario.nombre", read_only=True)
-    trabajador_calificacion = serializers.SerializerMethodField()
+    trabajador_calificacion = serializers.FloatField(source="trabajador.calificacion_promedio", read_only=True)
     trabajador_experiencia = serializers.CharField(source="trabajador.experiencia", read_only=True)
     trabajador_categoria = serializers.CharField(source="trabajador.categoria_principal", read_only=True)
     trabajador_id = serializers.IntegerField(source="trabajador.id_trabajador", read_only=True)
@@ -55,8 +58,20 @@ class ServicioPublicoSerializer(serializers.ModelSerializer):
             "trabajador_id",
             "fecha_publicacion",
             "owner_id",
-            "estado_publicacion"
+            "estado_publicacion",
+            "calificacion_promedio",
+            "calificacion_total"
         ]
 
-    def get_trabajador_calificacion(self, obj):
-        return obj.trabajador.rating_promedio()
+
+class ServicioFeedSerializer(ServicioPublicoSerializer):
+    """
+    Servicio público con la disponibilidad semanal del trabajador embebida.
+    Requiere prefetch de trabajador__disponibilidades.
+    """
+    disponibilidad = FranjaDisponibilidadSerializer(
+        source="trabajador.disponibilidades", many=True, read_only=True
+    )
+
+    class Meta(ServicioPublicoSerializer.Meta):
+        fields = ServicioPublicoSerializer.Meta.fields + ["disponibilidad"]
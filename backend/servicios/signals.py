@@ -0,0 +1,83 @@
+from django.conf import settings
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from backend.cache import invalidar_catalogo
+from perfiles.models import PerfilTrabajador
+
+from .models import Servicio
+from . import busqueda
+
+
+CAMPOS_INDEXADOS_SERVICIO = {"titulo", "descripcion", "categoria", "trabajador"}
+
+# Campos de Usuario que se muestran en el catálogo público
+CAMPOS_PUBLICOS_USUARIO = ("ciudad", "nombre")
+
+
+def _afecta(update_fields, campos):
+    return update_fields is None or bool(set(update_fields) & set(campos))
+
+
+# ---------------------------------------------------------
+# Índice de búsqueda
+# ---------------------------------------------------------
+
+@receiver(post_save, sender=Servicio)
+def indexar_servicio(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _afecta(update_fields, CAMPOS_INDEXADOS_SERVICIO):
+        return
+    busqueda.indexar_servicio(instance)
+
+
+@receiver(post_save, sender=PerfilTrabajador)
+def indexar_servicios_del_trabajador(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw or created or not _afecta(update_fields, {"habilidades"}):
+        return
+    busqueda.indexar_trabajador(instance.pk)
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+def recordar_datos_publicos(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._publicos_anteriores = tuple(getattr(instance, c) for c in CAMPOS_PUBLICOS_USUARIO)
+    if raw or instance._state.adding or not _afecta(update_fields, CAMPOS_PUBLICOS_USUARIO):
+        return
+    anteriores = sender.objects.filter(pk=instance.pk).values_list(*CAMPOS_PUBLICOS_USUARIO).first()
+    if anteriores is not None:
+        instance._publicos_anteriores = anteriores
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def actualizar_por_cambio_de_usuario(sender, instance, created, raw=False, **kwargs):
+    if raw or created:
+        return
+    anteriores = getattr(instance, "_publicos_anteriores", None)
+    ciudad_anterior, nombre_anterior = anteriores or (instance.ciudad, instance.nombre)
+    if (ciudad_anterior, nombre_anterior) == (instance.ciudad, instance.nombre):
+        return
+
+    perfil_id = PerfilTrabajador.objects.filter(usuario=instance).values_list("pk", flat=True).first()
+    if not perfil_id:
+        return
+    if ciudad_anterior != instance.ciudad:
+        busqueda.indexar_trabajador(perfil_id)
+    PerfilTrabajador.objects.filter(pk=perfil_id).update(actualizado=timezone.now())
+    invalidar_catalogo()
+
+
+# ---------------------------------------------------------
+# Cache de respuestas públicas (backend.cache)
+# ---------------------------------------------------------
+
+@receiver(post_save, sender=Servicio)
+@receiver(post_delete, sender=Servicio)
+@receiver(post_save, sender=PerfilTrabajador)
+@receiver(post_delete, sender=PerfilTrabajador)
+@receiver(post_save, sender="calificaciones.Calificacion")
+@receiver(post_delete, sender="calificaciones.Calificacion")
+@receiver(post_save, sender="disponibilidad.Disponibilidad")
+@receiver(post_delete, sender="disponibilidad.Disponibilidad")
+def invalidar_cache_catalogo(sender, raw=False, **kwargs):
+    if not raw:
+        invalidar_catalogo()
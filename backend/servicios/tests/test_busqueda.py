@@ -0,0 +1,99 @@
+import pytest
+from django.core.management import call_command
+from rest_framework.test import APIClient
+from servicios.models import Servicio, ServicioBusqueda
+from perfiles.models import PerfilTrabajador
+from usuarios.models import Usuario
+
+
+def crear_servicio(perfil, titulo, descripcion, categoria="Hogar"):
+    return Servicio.objects.create(
+        trabajador=perfil,
+        titulo=titulo,
+        descripcion=descripcion,
+        categoria=categoria,
+        precio=10
+    )
+
+
+@pytest.mark.django_db
+def test_busqueda_ignora_acentos_y_mayusculas():
+    usuario = Usuario.objects.create_user(email="bus1@test.com", nombre="B", password="123", ciudad="Medellín")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar", habilidades="tuberías")
+    plomeria = crear_servicio(perfil, "Plomería urgente", "Arreglo fugas")
+    guitarra = crear_servicio(perfil, "Clases de guitarra", "Nivel básico", categoria="Música")
+
+    client = APIClient()
+    for q in ["plomeria", "PLOMERÍA", "tuberias fugas"]:
+        response = client.get("/api/servicios/publicos/", {"q": q})
+        ids = [s["id_servicio"] for s in response.data["results"]]
+        assert ids == [plomeria.id_servicio], q
+
+    # La ciudad del trabajador también está indexada
+    response = client.get("/api/servicios/publicos/", {"q": "medellin"})
+    assert {s["id_servicio"] for s in response.data["results"]} == {plomeria.id_servicio, guitarra.id_servicio}
+
+
+@pytest.mark.django_db
+def test_busqueda_se_actualiza_al_editar_servicio_y_ciudad():
+    usuario = Usuario.objects.create_user(email="bus2@test.com", nombre="B", password="123", ciudad="Cali")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = crear_servicio(perfil, "Pintura", "Paredes")
+
+    servicio.titulo = "Carpintería"
+    servicio.save()
+    usuario.ciudad = "Bogotá"
+    usuario.save()
+
+    documento = ServicioBusqueda.objects.get(servicio=servicio).documento
+    assert "carpinteria" in documento
+    assert "bogota" in documento
+    assert "cali" not in documento
+
+
+@pytest.mark.django_db
+def test_reindexar_busqueda():
+    usuario = Usuario.objects.create_user(email="bus3@test.com", nombre="B", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = crear_servicio(perfil, "Jardinería", "Poda")
+    ServicioBusqueda.objects.all().delete()
+
+    call_command("reindexar_busqueda")
+
+    assert ServicioBusqueda.objects.filter(servicio=servicio).exists()
+    response = APIClient().get("/api/servicios/publicos/", {"q": "jardin"})
+    assert [s["id_servicio"] for s in response.data["results"]] == [servicio.id_servicio]
+
+
+@pytest.mark.django_db
+def test_match_una_vez_por_consulta():
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from servicios.busqueda import buscar
+
+    usuario = Usuario.objects.create_user(email="bus4@test.com", nombre="B", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    for i in range(3):
+        crear_servicio(perfil, f"Plomería {i}", "Arreglo fugas")
+
+    with CaptureQueriesContext(connection) as consultas:
+        assert len(list(buscar(Servicio.objects.all(), "plomeria"))) == 3
+    if connection.vendor == "sqlite":
+        assert consultas.captured_queries[-1]["sql"].count("MATCH") == 1
+
+
+@pytest.mark.django_db
+def test_indice_sin_upsert_en_la_base(monkeypatch):
+    from django.db import connection
+
+    # Bases sin ON CONFLICT: update_or_create fila a fila
+    monkeypatch.setattr(connection.features, "supports_update_conflicts", False)
+    monkeypatch.setattr(connection.features, "supports_update_conflicts_with_target", False)
+
+    usuario = Usuario.objects.create_user(email="bus5@test.com", nombre="B", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = crear_servicio(perfil, "Pintura", "Interiores")
+    servicio.titulo = "Carpintería"
+    servicio.save()
+
+    assert "carpinteria" in ServicioBusqueda.objects.get(servicio=servicio).documento
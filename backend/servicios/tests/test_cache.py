@@ -0,0 +1,116 @@
+from datetime import datetime, time
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIClient
+from disponibilidad.models import Disponibilidad
+from servicios.models import Servicio
+from perfiles.models import PerfilTrabajador
+from usuarios.models import Usuario
+
+
+@pytest.mark.django_db
+def test_cache_publica_hit_e_invalidacion():
+    usuario = Usuario.objects.create_user(email="cache@test.com", nombre="C", password="123", ciudad="Cali")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="Pintura", descripcion="d", categoria="Hogar", precio=10)
+    client = APIClient()
+
+    assert client.get("/api/servicios/publicos/?a=&categoria=Hogar")["X-Cache"] == "MISS"
+    # Mismos parámetros normalizados (orden y vacíos) -> misma entrada
+    response = client.get("/api/servicios/publicos/?categoria=Hogar")
+    assert response["X-Cache"] == "HIT"
+    assert response.data["results"][0]["titulo"] == "Pintura"
+
+    servicio.titulo = "Carpintería"
+    servicio.save()
+    response = client.get("/api/servicios/publicos/?categoria=Hogar")
+    assert response["X-Cache"] == "MISS"
+    assert response.data["results"][0]["titulo"] == "Carpintería"
+
+    usuario.ciudad = "Bogotá"
+    usuario.save()
+    assert client.get("/api/servicios/publicos/?categoria=Hogar")["X-Cache"] == "MISS"
+
+    admin = Usuario.objects.create_user(email="admin@test.com", nombre="A", password="123", rol_base="admin")
+    client.force_authenticate(admin)
+    stats = client.get("/api/servicios/cache/estadisticas/").data
+    assert stats["hits"] == 1
+    assert stats["misses"] == 3
+
+
+@pytest.mark.django_db
+def test_detalle_publico_etag_cambia_con_la_calificacion_del_trabajador():
+    from calificaciones.models import Calificacion
+    from solicitudes.models import Solicitud
+
+    usuario = Usuario.objects.create_user(email="etag@test.com", nombre="E", password="123")
+    cliente = Usuario.objects.create_user(email="etag2@test.com", nombre="C", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = Servicio.objects.create(
+        trabajador=perfil, titulo="Pintura", descripcion="d", categoria="Hogar",
+        precio=10, estado_publicacion="aprobado"
+    )
+    client = APIClient()
+    url = f"/api/servicios/publicos/{servicio.id_servicio}/"
+
+    etag = client.get(url)["ETag"]
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+    Calificacion.objects.create(solicitud=solicitud, cliente=cliente, trabajador=perfil, puntaje=4)
+
+    response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["trabajador_calificacion"] == 4.0
+
+
+@pytest.mark.django_db
+def test_etag_del_catalogo_sin_consultas(settings, django_assert_num_queries):
+    usuario = Usuario.objects.create_user(email="etag3@test.com", nombre="E", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="Pintura", descripcion="d", categoria="Hogar", precio=10)
+    client = APIClient()
+    url = "/api/servicios/publicos/"
+
+    etag = client.get(url)["ETag"]
+    # La versión es la generación del catálogo: ni agregado ni página
+    with django_assert_num_queries(0):
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    servicio.delete()
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    # Sin cache pública la generación no se mueve: se vuelve al agregado
+    settings.CACHE_PUBLICO = {"ACTIVO": False}
+    etag = client.get(url)["ETag"]
+    Servicio.objects.create(trabajador=perfil, titulo="Otra", descripcion="d", categoria="Hogar", precio=10)
+    assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+
+@pytest.mark.django_db
+def test_disponible_ahora_cachea_por_ranura(monkeypatch):
+    usuario = Usuario.objects.create_user(email="ahora@test.com", nombre="A", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario)
+    Servicio.objects.create(trabajador=perfil, titulo="Pintura", descripcion="d", categoria="Hogar", precio=10)
+    Disponibilidad.objects.create(trabajador=perfil, dia="lunes", hora_inicio=time(9), hora_fin=time(10))
+    client = APIClient()
+
+    def reloj(hora, minuto):
+        # 2026-10-12 es lunes
+        momento = timezone.make_aware(datetime(2026, 10, 12, hora, minuto))
+        monkeypatch.setattr("disponibilidad.mapa.timezone.localtime", lambda: momento)
+
+    reloj(9, 30)
+    response = client.get("/api/servicios/publicos/?disponible=ahora")
+    assert response["X-Cache"] == "MISS"
+    assert len(response.data["results"]) == 1
+    etag = response["ETag"]
+    assert client.get("/api/servicios/publicos/?disponible=ahora", HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+    # Misma URL, otra ranura: ni la cache ni el ETag anteriores sirven
+    reloj(11, 0)
+    response = client.get("/api/servicios/publicos/?disponible=ahora", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["X-Cache"] == "MISS"
+    assert response.data["results"] == []
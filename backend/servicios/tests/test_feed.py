@@ -0,0 +1,35 @@
+import pytest
+from datetime import time
+from rest_framework.test import APIClient
+from disponibilidad.models import Disponibilidad
+from servicios.models import Servicio
+from perfiles.models import PerfilTrabajador
+from usuarios.models import Usuario
+
+
+def crear_trabajador(n):
+    usuario = Usuario.objects.create_user(email=f"feed{n}@test.com", nombre=f"T{n}", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    Disponibilidad.objects.create(trabajador=perfil, dia="lunes", hora_inicio=time(8), hora_fin=time(12))
+    Disponibilidad.objects.create(trabajador=perfil, dia="martes", hora_inicio=time(14), hora_fin=time(18))
+    return perfil
+
+
+@pytest.mark.django_db
+def test_feed_solo_aprobados_con_disponibilidad_y_consultas_fijas(django_assert_num_queries):
+    for n in range(4):
+        perfil = crear_trabajador(n)
+        for estado in ["aprobado", "pendiente"]:
+            Servicio.objects.create(
+                trabajador=perfil, titulo=f"S{n}", descripcion="d",
+                categoria="Hogar", precio=10, estado_publicacion=estado
+            )
+
+    # Servicios (con trabajador y usuario) + disponibilidades, sin importar el tamaño de página
+    with django_assert_num_queries(2):
+        response = APIClient().get("/api/servicios/feed/", {"cursor": ""})
+
+    resultados = response.data["results"]
+    assert len(resultados) == 4
+    assert all(s["estado_publicacion"] == "aprobado" for s in resultados)
+    assert [f["dia"] for f in resultados[0]["disponibilidad"]] == ["lunes", "martes"]
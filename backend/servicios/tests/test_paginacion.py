@@ -0,0 +1,43 @@
+import pytest
+from rest_framework.test import APIClient
+from backend.pagination import KeysetPagination
+from servicios.models import Servicio
+from perfiles.models import PerfilTrabajador
+from usuarios.models import Usuario
+
+
+@pytest.mark.django_db
+def test_catalogo_paginado_por_cursor(monkeypatch, django_assert_max_num_queries):
+    monkeypatch.setattr(KeysetPagination, "page_size", 2)
+    usuario = Usuario.objects.create_user(email="pag@test.com", nombre="P", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=usuario, categoria_principal="Hogar")
+    servicios = [
+        Servicio.objects.create(trabajador=perfil, titulo=f"S{i}", descripcion="d", categoria="Hogar", precio=10)
+        for i in range(5)
+    ]
+    esperados = [s.id_servicio for s in reversed(servicios)]
+
+    client = APIClient()
+    vistos = []
+    url = "/api/servicios/publicos/?cursor="
+    while url:
+        # Sin COUNT(*) de paginación: solo la página (el ETag sale de la generación)
+        with django_assert_max_num_queries(1):
+            data = client.get(url).data
+        assert "count" not in data
+        vistos += [s["id_servicio"] for s in data["results"]]
+        url = data["next"]
+    assert vistos == esperados
+
+    # Volver hacia atrás desde la última página
+    anterior = client.get(data["previous"]).data
+    assert [s["id_servicio"] for s in anterior["results"]] == esperados[2:4]
+
+    # El total solo se calcula si se pide
+    assert client.get("/api/servicios/publicos/", {"cursor": "", "total": "1"}).data["count"] == 5
+
+
+@pytest.mark.django_db
+def test_cursor_invalido():
+    response = APIClient().get("/api/servicios/publicos/", {"cursor": "xxx"})
+    assert response.status_code == 404
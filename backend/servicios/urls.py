@@ -1,6 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import ServicioViewSet, ServiciosPublicosListView, ServicioPublicoDetailView
+from .views import (
+    ServicioViewSet,
+    ServiciosPublicosListView,
+    ServicioPublicoDetailView,
+    ServiciosFeedView,
+    EstadisticasCachePublicaView,
+)
 
 # El router maneja las rutas estándar (GET, POST, PUT, DELETE) para usuarios autenticados
 router = DefaultRouter()
@@ -11,6 +17,8 @@ urlpatterns = [
     # Es importante ponerlas ANTES del router.urls para que Django las encuentre primero
     path('publicos/', ServiciosPublicosListView.as_view(), name='servicios-publicos-lista'),
     path('publicos/<int:id_servicio>/', ServicioPublicoDetailView.as_view(), name='servicio-publico-detalle'),
+    path('feed/', ServiciosFeedView.as_view(), name='servicios-feed'),
+    path('cache/estadisticas/', EstadisticasCachePublicaView.as_view(), name='servicios-cache-estadisticas'),
 
     # Rutas del ViewSet (Mis servicios, crear, editar, borrar)
     path('', include(router.urls)),
@@ -1,32 +1,67 @@
-from rest_framework import viewsets, permissions, serializers, generics
+from rest_framework import viewsets, permissions, serializers, generics, status
+from rest_framework.views import APIView
+from rest_framework.response import Response
 from rest_framework.exceptions import ValidationError
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.db.models import Prefetch
 
-from moderacion.palabras import PALABRAS_PROHIBIDAS
-from moderacion.models import Moderacion
+from moderacion.cola import encolar as encolar_moderacion
 from perfiles.models import PerfilTrabajador
 from membresias.models import Membresia
+from disponibilidad.models import Disponibilidad
+from disponibilidad.mapa import filtrar_disponibles, ranura
 
 from .models import Servicio
-from .serializers import ServicioSerializer, ServicioPublicoSerializer
+from .serializers import ServicioSerializer, ServicioPublicoSerializer, ServicioFeedSerializer
 from .filters import ServicioFilter
+from .busqueda import buscar
+from backend.pagination import KeysetPagination
+from backend.cache import CachePublicoMixin, estadisticas, reiniciar_estadisticas
+from backend.conditional import ConditionalGetMixin
+from backend.texto import normalizar
 
 
-class ServiciosPublicosListView(generics.ListAPIView):
+class ServiciosPublicosListView(ConditionalGetMixin, CachePublicoMixin, generics.ListAPIView):
     """
     Lista de servicios públicos que los clientes pueden ver y contratar.
     Solo muestra servicios con estado_publicacion='aprobado'.
-    Permite filtros por categoría y ciudad del trabajador.
+    Permite filtros por categoría y ciudad del trabajador, por disponibilidad
+    (?disponible=martes@18:00) y búsqueda de texto completo con ?q= (sin
+    distinguir acentos ni mayúsculas, ordenada por relevancia).
     """
     serializer_class = ServicioPublicoSerializer
     permission_classes = [permissions.AllowAny]
-
-    def get_queryset(self):
+    pagination_class = KeysetPagination
+    campos_version = ("actualizado", "trabajador__actualizado")
+
+    @property
+    def keyset_campos(self):
+        # Con ?q= el orden es por relevancia: se pagina por número de página
+        if self.request.query_params.get("q"):
+            return None
+        return ("fecha_publicacion", "id_servicio")
+
+    def get_disponible(self):
+        # "ahora" se resuelve una vez por petición a la ranura concreta: la
+        # cache, el ETag y el filtro usan la misma aunque el reloj avance
+        if not hasattr(self, "_disponible"):
+            disponible = self.request.query_params.get("disponible")
+            self._disponible = ranura(disponible) if normalizar(disponible or "") == "ahora" else disponible
+        return self._disponible
+
+    def get_clave_extra(self):
+        disponible = self.get_disponible()
+        return f"ranura={disponible}" if isinstance(disponible, int) else ""
+
+    def get_base_queryset(self):
         # ANTES: Solo aprobados
         # qs = Servicio.objects.filter(estado_publicacion="aprobado").select_related("trabajador__usuario")
         
         # AHORA: (TEMPORAL) Mostrar TODOS para probar
-        qs = Servicio.objects.all().select_related("trabajador__usuario")
+        return Servicio.objects.all().select_related("trabajador__usuario")
+
+    def get_queryset(self):
+        qs = self.get_base_queryset()
 
         categoria = self.request.query_params.get("categoria")
         ciudad = self.request.query_params.get("ciudad")
@@ -37,10 +72,39 @@ class ServiciosPublicosListView(generics.ListAPIView):
         if ciudad:
             qs = qs.filter(trabajador__usuario__ciudad__icontains=ciudad)
 
+        # ?disponible=martes@18:00 (o "ahora"): trabajadores que atienden a esa hora
+        disponible = self.get_disponible()
+        if disponible is not None and disponible != "":
+            qs = filtrar_disponibles(qs, disponible, campo="trabajador")
+
+        q = self.request.query_params.get("q")
+        if q:
+            qs = buscar(qs, q)
+
         return qs
 
 
-class ServicioPublicoDetailView(generics.RetrieveAPIView):
+class ServiciosFeedView(ServiciosPublicosListView):
+    """
+    Feed del Home: servicios aprobados con la disponibilidad semanal de su
+    trabajador embebida, en una sola petición.
+    Acepta los mismos filtros y paginación que la lista pública.
+    Consultas fijas por página: servicios (+ trabajador y usuario) y disponibilidades.
+    """
+    serializer_class = ServicioFeedSerializer
+
+    def get_base_queryset(self):
+        return Servicio.objects.filter(estado_publicacion="aprobado").select_related(
+            "trabajador__usuario"
+        ).prefetch_related(
+            Prefetch(
+                "trabajador__disponibilidades",
+                queryset=Disponibilidad.objects.order_by("id_disponibilidad"),
+            )
+        )
+
+
+class ServicioPublicoDetailView(ConditionalGetMixin, CachePublicoMixin, generics.RetrieveAPIView):
     """
     Detalle de UN servicio específico (sin autenticación).
     Muestra información básica del trabajador.
@@ -48,14 +112,16 @@ class ServicioPublicoDetailView(generics.RetrieveAPIView):
     serializer_class = ServicioPublicoSerializer
     permission_classes = [permissions.AllowAny]
     lookup_field = "id_servicio"
+    campos_version = ("actualizado", "trabajador__actualizado")
 
     def get_queryset(self):
         return Servicio.objects.filter(estado_publicacion="aprobado").select_related("trabajador__usuario")
 
 
-class ServicioViewSet(viewsets.ModelViewSet):
+class ServicioViewSet(ConditionalGetMixin, viewsets.ModelViewSet):
     queryset = Servicio.objects.all()
     serializer_class = ServicioSerializer
+    campos_version = ("actualizado", "trabajador__actualizado")
     filterset_class = ServicioFilter
     ordering_fields = ['fecha_creacion', 'precio', 'titulo']
     search_fields = ['titulo', 'descripcion']
@@ -64,12 +130,14 @@ class ServicioViewSet(viewsets.ModelViewSet):
         if not self.request.user.is_authenticated:
             return Servicio.objects.none()
         
+        qs = Servicio.objects.select_related("trabajador")
+
         # Admin ve todo
         if self.request.user.rol_base == "admin":
-            return Servicio.objects.all()
+            return qs
 
         # Usuario normal solo ve sus servicios
-        return Servicio.objects.filter(trabajador__usuario=self.request.user)
+        return qs.filter(trabajador__usuario=self.request.user)
 
     def perform_create(self, serializer):
         # -----------------------------------------------------
@@ -95,42 +163,54 @@ class ServicioViewSet(viewsets.ModelViewSet):
         membresia = getattr(perfil, "membresia", None)
         plan = membresia.plan if membresia else "free"
 
-        if plan == "free":
-            limite = 3
+        limite = Membresia.LIMITE_SERVICIOS.get(plan)
+        if limite is not None:
             # Contamos cuántos servicios tiene este perfil
             servicios_publicados = Servicio.objects.filter(trabajador=perfil).count()
 
             if servicios_publicados >= limite:
                 raise ValidationError(
-                    f"Has alcanzado el límite de {limite} servicios con el plan Free."
+                    f"Has alcanzado el límite de {limite} servicios con el plan {plan.title()}."
                 )
 
         # -----------------------------------------------------
         # 3) Guardar el servicio asociado al perfil (nuevo o existente)
         # -----------------------------------------------------
-        servicio = serializer.save(trabajador=perfil)
+        servicio = serializer.save(
+            trabajador=perfil,
+            estado_publicacion="pendiente",
+            palabras_detectadas=False,
+        )
 
         # -----------------------------------------------------
-        # 4) Sistema de moderación automática
+        # 4) Moderación automática en segundo plano (moderacion.cola)
         # -----------------------------------------------------
-        texto = f"{servicio.titulo.lower()} {servicio.descripcion.lower()}"
-        palabras_encontradas = [p for p in PALABRAS_PROHIBIDAS if p in texto]
-
-        if palabras_encontradas:
-            servicio.palabras_detectadas = True
-            servicio.estado_publicacion = "pendiente"
-            servicio.save()
-
-            Moderacion.objects.create(
-                servicio=servicio,
-                palabras_detectadas=", ".join(palabras_encontradas),
-                estado="pendiente"
-            )
-        else:
-            servicio.palabras_detectadas = False
-            servicio.estado_publicacion = "aprobado"
-            servicio.save()
-        
+        encolar_moderacion(servicio)
+
         return servicio
 
 
+class EstadisticasCachePublicaView(APIView):
+    """
+    Aciertos/fallos de la cache de respuestas públicas (SOLO ADMIN).
+    GET  -> contadores
+    DELETE -> reinicia los contadores
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if request.user.rol_base != "admin":
+            return Response(
+                {"error": "Solo administradores pueden ver las estadísticas de cache."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response(estadisticas())
+
+    def delete(self, request):
+        if request.user.rol_base != "admin":
+            return Response(
+                {"error": "Solo administradores pueden reiniciar las estadísticas de cache."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        reiniciar_estadisticas()
+        return Response(status=status.HTTP_204_NO_CONTENT)
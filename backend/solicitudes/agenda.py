@@ -0,0 +1,186 @@
+"""
+Agenda de un trabajador: sus franjas semanales (Disponibilidad) y sus citas
+aceptadas a futuro, como listas ordenadas de intervalos en minutos.
+
+- ¿Está libre esta cita? Una búsqueda binaria en las franjas del día y otra
+  en las citas: O(log n).
+- Próximos N huecos: se recorren las franjas desde una fecha saltando las
+  citas con bisect, sin consultar la base de datos.
+
+La agenda se construye con dos consultas (las citas futuras usan el índice
+(trabajador, fecha_servicio)), se guarda en la cache por trabajador y se
+invalida desde solicitudes.signals cuando cambian sus franjas o sus citas.
+"""
+from bisect import bisect_right, insort
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from disponibilidad.models import Disponibilidad
+
+from .models import Solicitud
+
+
+CONFIG_POR_DEFECTO = {
+    "TIMEOUT": 3600,  # segundos en cache
+    "HORIZONTE_DIAS": 60,  # hasta dónde buscar huecos
+    "MAX_HUECOS": 50,
+}
+
+MINUTOS_DIA = 24 * 60
+# lunes=0 ... domingo=6, igual que date.weekday()
+DIA_SEMANA = {dia: i for i, (dia, _) in enumerate(Disponibilidad.DIAS)}
+
+
+def config():
+    return {**CONFIG_POR_DEFECTO, **getattr(settings, "AGENDA", {})}
+
+
+def minutos(hora):
+    return hora.hour * 60 + hora.minute
+
+
+def a_hora(total):
+    return time(total // 60, total % 60)
+
+
+def absoluto(fecha, minuto):
+    """Minuto absoluto: permite comparar citas de días distintos."""
+    return fecha.toordinal() * MINUTOS_DIA + minuto
+
+
+def _fusionar(intervalos):
+    fusionados = []
+    for inicio, fin in sorted(intervalos):
+        if fusionados and inicio <= fusionados[-1][1]:
+            fusionados[-1][1] = max(fusionados[-1][1], fin)
+        else:
+            fusionados.append([inicio, fin])
+    return [tuple(i) for i in fusionados]
+
+
+class Agenda:
+    def __init__(self, franjas, citas, hoy):
+        # franjas: {dia_semana: [(inicio, fin)]} en minutos del día
+        # citas: [(inicio, fin)] en minutos absolutos
+        self.hoy = hoy
+        self.franjas = [_fusionar(franjas.get(dia, [])) for dia in range(7)]
+        self._inicios_franja = [[inicio for inicio, _ in f] for f in self.franjas]
+        self._citas(_fusionar(citas))
+
+    def _citas(self, citas):
+        self.citas = citas
+        # Intervalos disjuntos y ordenados: inicios y fines quedan ordenados
+        self._inicios = [inicio for inicio, _ in citas]
+        self._fines = [fin for _, fin in citas]
+
+    def en_disponibilidad(self, fecha, inicio, fin):
+        dia = fecha.weekday()
+        i = bisect_right(self._inicios_franja[dia], inicio) - 1
+        return i >= 0 and self.franjas[dia][i][1] >= fin
+
+    def choca(self, inicio, fin):
+        """¿Se solapa [inicio, fin) (minutos absolutos) con alguna cita?"""
+        # Primera cita que termina después de `inicio`
+        i = bisect_right(self._fines, inicio)
+        return i < len(self.citas) and self._inicios[i] < fin
+
+    def libre(self, fecha, hora_inicio, hora_fin):
+        inicio, fin = minutos(hora_inicio), minutos(hora_fin)
+        return (
+            fin > inicio
+            and self.en_disponibilidad(fecha, inicio, fin)
+            and not self.choca(absoluto(fecha, inicio), absoluto(fecha, fin))
+        )
+
+    def reservar(self, fecha, hora_inicio, hora_fin):
+        """Añade una cita a esta copia de la agenda (validación de lotes)."""
+        citas = list(self.citas)
+        insort(citas, (absoluto(fecha, minutos(hora_inicio)), absoluto(fecha, minutos(hora_fin))))
+        self._citas(_fusionar(citas))
+
+    def huecos(self, desde, duracion, cantidad, horizonte):
+        """
+        Los primeros `cantidad` huecos de `duracion` minutos a partir de
+        `desde` (datetime local), dentro de las franjas y sin pisar citas.
+        """
+        resultado = []
+        for k in range(horizonte):
+            fecha = desde.date() + timedelta(days=k)
+            base = absoluto(fecha, 0)
+            for franja_inicio, franja_fin in self.franjas[fecha.weekday()]:
+                inicio = franja_inicio
+                if k == 0:
+                    inicio = max(inicio, desde.hour * 60 + desde.minute)
+                actual, limite = base + inicio, base + franja_fin
+                i = bisect_right(self._fines, actual)
+                while actual + duracion <= limite:
+                    if i < len(self.citas) and self._inicios[i] < actual + duracion:
+                        actual = max(actual, self._fines[i])
+                        i += 1
+                        continue
+                    resultado.append((fecha, a_hora(actual - base), a_hora(actual - base + duracion)))
+                    if len(resultado) >= cantidad:
+                        return resultado
+                    actual += duracion
+        return resultado
+
+
+# ---------------------------------------------------------
+# Construcción y cache por trabajador
+# ---------------------------------------------------------
+
+def _clave(trabajador_id):
+    return f"agenda:{trabajador_id}"
+
+
+def construir(trabajador_id, hoy):
+    franjas = {}
+    for dia, inicio, fin in Disponibilidad.objects.filter(trabajador_id=trabajador_id).values_list(
+        "dia", "hora_inicio", "hora_fin"
+    ):
+        if fin > inicio:
+            franjas.setdefault(DIA_SEMANA[dia], []).append((minutos(inicio), minutos(fin)))
+
+    citas = [
+        (absoluto(fecha, minutos(inicio)), absoluto(fecha, minutos(fin)))
+        for fecha, inicio, fin in Solicitud.objects.filter(
+            trabajador_id=trabajador_id,
+            estado="aceptada",
+            fecha_servicio__gte=hoy,
+            hora_inicio__isnull=False,
+            hora_fin__isnull=False,
+        ).values_list("fecha_servicio", "hora_inicio", "hora_fin")
+    ]
+    return Agenda(franjas, citas, hoy)
+
+
+def agenda_de(trabajador_id):
+    hoy = timezone.localdate()
+    agenda = cache.get(_clave(trabajador_id))
+    if agenda is None or agenda.hoy != hoy:
+        agenda = construir(trabajador_id, hoy)
+        cache.set(_clave(trabajador_id), agenda, config()["TIMEOUT"])
+    return agenda
+
+
+def invalidar(*trabajador_ids):
+    cache.delete_many([_clave(t) for t in set(filter(None, trabajador_ids))])
+
+
+def validar_cita(trabajador_id, fecha, hora_inicio, hora_fin):
+    if hora_fin <= hora_inicio:
+        raise ValidationError({"hora_fin": "Debe ser posterior a la hora de inicio."})
+    ahora = timezone.localtime()
+    if datetime.combine(fecha, hora_inicio) < ahora.replace(tzinfo=None):
+        raise ValidationError({"fecha_servicio": "La cita no puede estar en el pasado."})
+
+    agenda = agenda_de(trabajador_id)
+    inicio, fin = minutos(hora_inicio), minutos(hora_fin)
+    if not agenda.en_disponibilidad(fecha, inicio, fin):
+        raise ValidationError({"hora_inicio": "El trabajador no atiende en ese horario."})
+    if agenda.choca(absoluto(fecha, inicio), absoluto(fecha, fin)):
+        raise ValidationError({"hora_inicio": "El trabajador ya tiene una cita en ese horario."})
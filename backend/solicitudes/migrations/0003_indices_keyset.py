@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 10:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfiles', '0004_calificacion_agregados'),
+        ('servicios', '0004_indices_keyset'),
+        ('solicitudes', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(fields=['fecha_solicitud', 'id'], name='solicitud_fecha_pk_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfiles', '0005_actualizado'),
+        ('servicios', '0005_actualizado'),
+        ('solicitudes', '0003_indices_keyset'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(fields=['cliente', 'fecha_solicitud'], name='solicitud_cliente_fecha_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(fields=['trabajador', 'fecha_solicitud'], name='solicitud_trab_fecha_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.8 on 2026-10-18 11:36
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('perfiles', '0005_actualizado'),
+        ('servicios', '0005_actualizado'),
+        ('solicitudes', '0004_indices_por_rol'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='solicitud',
+            name='fecha_servicio',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solicitud',
+            name='hora_fin',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='solicitud',
+            name='hora_inicio',
+            field=models.TimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='solicitud',
+            index=models.Index(fields=['trabajador', 'fecha_servicio'], name='solicitud_trab_cita_idx'),
+        ),
+    ]
@@ -36,7 +36,22 @@ class Solicitud(models.Model):
     mensaje = models.TextField(blank=True, null=True)
     estado = models.CharField(max_length=20, choices=ESTADOS, default='pendiente')
 
+    # Cita (opcional): se valida contra la agenda del trabajador (solicitudes.agenda)
+    fecha_servicio = models.DateField(blank=True, null=True)
+    hora_inicio = models.TimeField(blank=True, null=True)
+    hora_fin = models.TimeField(blank=True, null=True)
+
     def __str__(self):
         # Nota: Aquí no podemos usar self.servicio.titulo directamente si da problemas, 
         # pero generalmente funciona bien dentro de los métodos.
-        return f"Solicitud #{self.id} - {self.estado}"
\ No newline at end of file
+        return f"Solicitud #{self.id} - {self.estado}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["fecha_solicitud", "id"], name="solicitud_fecha_pk_idx"),
+            # Listados por rol (enviadas / recibidas), ya ordenados por fecha
+            models.Index(fields=["cliente", "fecha_solicitud"], name="solicitud_cliente_fecha_idx"),
+            models.Index(fields=["trabajador", "fecha_solicitud"], name="solicitud_trab_fecha_idx"),
+            # Agenda: citas futuras de un trabajador
+            models.Index(fields=["trabajador", "fecha_servicio"], name="solicitud_trab_cita_idx"),
+        ]
@@ -13,9 +13,12 @@ class SolicitudSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'cliente', 'servicio', 'trabajador', 
             'fecha_solicitud', 'mensaje', 'estado',
+            'fecha_servicio', 'hora_inicio', 'hora_fin',
             'titulo_servicio', 'nombre_cliente', 'email_cliente', 'foto_cliente'
         ]
-        read_only_fields = ['cliente', 'trabajador', 'fecha_solicitud', 'estado']
+        # La cita solo se fija al crear (CrearSolicitudSerializer + agenda.validar_cita):
+        # editarla aquí saltaría la validación de la agenda y el NOT EXISTS de aceptar
+        read_only_fields = ['cliente', 'trabajador', 'fecha_solicitud', 'estado', 'fecha_servicio', 'hora_inicio', 'hora_fin']
 
 class CrearSolicitudSerializer(serializers.ModelSerializer):
     titulo_servicio = serializers.CharField(source='servicio.titulo', read_only=True)
@@ -27,7 +30,31 @@ class CrearSolicitudSerializer(serializers.ModelSerializer):
         model = Solicitud
         fields = [
             'id', 'servicio', 'mensaje', 'cliente', 'trabajador', 
-            'fecha_solicitud', 'estado',
+            'fecha_solicitud', 'estado', 'fecha_servicio', 'hora_inicio', 'hora_fin',
             'titulo_servicio', 'nombre_cliente', 'email_cliente', 'foto_cliente'
         ]
-        read_only_fields = ['id', 'cliente', 'trabajador', 'fecha_solicitud', 'estado', 'titulo_servicio', 'nombre_cliente', 'email_cliente', 'foto_cliente']
\ No newline at end of file
+        read_only_fields = ['id', 'cliente', 'trabajador', 'fecha_solicitud', 'estado', 'titulo_servicio', 'nombre_cliente', 'email_cliente', 'foto_cliente']
+
+    def validate(self, data):
+        # La cita es opcional, pero va completa: fecha, hora de inicio y de fin
+        cita = [data.get('fecha_servicio'), data.get('hora_inicio'), data.get('hora_fin')]
+        if any(c is not None for c in cita) and not all(c is not None for c in cita):
+            raise serializers.ValidationError("Para agendar envía fecha_servicio, hora_inicio y hora_fin.")
+        return data
+
+class TransicionLoteSerializer(serializers.Serializer):
+    ESTADOS = [('aceptada', 'Aceptada'), ('rechazada', 'Rechazada'), ('finalizada', 'Finalizada')]
+
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
+    estado = serializers.ChoiceField(choices=ESTADOS)
+
+
+class HorariosLibresSerializer(serializers.Serializer):
+    trabajador = serializers.IntegerField(min_value=1)
+    duracion = serializers.IntegerField(min_value=15, max_value=12 * 60, default=60)
+    cantidad = serializers.IntegerField(min_value=1, max_value=50, default=5)
+    desde = serializers.DateField(required=False)
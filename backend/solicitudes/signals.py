@@ -0,0 +1,41 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from disponibilidad.models import Disponibilidad
+
+from .models import Solicitud
+from . import agenda
+
+
+# Enviada tras cambiar el estado con un UPDATE condicional (solicitudes.transiciones),
+# que no dispara post_save. Argumentos: ids (lista de pk) y estado (el nuevo).
+estado_cambiado = Signal()
+
+
+# ---------------------------------------------------------
+# Cache de agendas (solicitudes.agenda)
+# ---------------------------------------------------------
+
+@receiver(post_save, sender=Disponibilidad)
+@receiver(post_delete, sender=Disponibilidad)
+def invalidar_agenda_por_franja(sender, instance, raw=False, **kwargs):
+    if not raw:
+        agenda.invalidar(instance.trabajador_id)
+
+
+@receiver(post_save, sender=Solicitud)
+@receiver(post_delete, sender=Solicitud)
+def invalidar_agenda_por_solicitud(sender, instance, raw=False, created=False, **kwargs):
+    # Una solicitud pendiente nueva no ocupa la agenda: crearla no la invalida
+    if raw or not instance.fecha_servicio or (created and instance.estado != "aceptada"):
+        return
+    agenda.invalidar(instance.trabajador_id)
+
+
+@receiver(estado_cambiado, sender=Solicitud)
+def invalidar_agenda_por_transicion(sender, ids, estado, **kwargs):
+    # Rechazar una pendiente no cambia las citas aceptadas
+    if estado == "rechazada":
+        return
+    agenda.invalidar(*Solicitud.objects.filter(pk__in=ids, fecha_servicio__isnull=False)
+                      .values_list("trabajador_id", flat=True).distinct())
@@ -0,0 +1,148 @@
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from django.core.cache import cache
+from rest_framework.test import APIClient
+
+from disponibilidad.models import Disponibilidad
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.agenda import Agenda, absoluto, agenda_de
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+def proximo(dia_semana):
+    """Fecha del próximo `dia_semana` (0 = lunes), al menos mañana."""
+    hoy = date.today() + timedelta(days=1)
+    return hoy + timedelta(days=(dia_semana - hoy.weekday()) % 7)
+
+
+@pytest.fixture
+def partes():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    Disponibilidad.objects.create(trabajador=perfil, dia="martes", hora_inicio=time(8), hora_fin=time(12))
+    Disponibilidad.objects.create(trabajador=perfil, dia="martes", hora_inicio=time(14), hora_fin=time(16))
+    return cliente, trabajador, perfil, servicio
+
+
+def api(usuario):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client
+
+
+def pedir(cliente, servicio, fecha, inicio, fin):
+    return api(cliente).post("/api/solicitudes/", {
+        "servicio": servicio.pk,
+        "fecha_servicio": fecha.isoformat(),
+        "hora_inicio": inicio,
+        "hora_fin": fin,
+    }, format="json")
+
+
+def test_agenda_busquedas():
+    martes = proximo(1)
+    franjas = {1: [(8 * 60, 10 * 60), (9 * 60, 12 * 60)]}  # se fusionan en 8-12
+    citas = [(absoluto(martes, 9 * 60), absoluto(martes, 10 * 60))]
+    agenda = Agenda(franjas, citas, date.today())
+
+    assert agenda.libre(martes, time(8), time(9))
+    assert agenda.libre(martes, time(10), time(12))
+    assert not agenda.libre(martes, time(8, 30), time(9, 30))  # choca con la cita
+    assert not agenda.libre(martes, time(11), time(13))  # se sale de la franja
+    assert not agenda.libre(martes + timedelta(days=1), time(8), time(9))  # miércoles sin franja
+
+    huecos = agenda.huecos(datetime.combine(martes, time(0)), 60, 4, 14)
+    assert [(h[0], h[1]) for h in huecos] == [
+        (martes, time(8)), (martes, time(10)), (martes, time(11)), (martes + timedelta(days=7), time(8)),
+    ]
+
+
+def test_crear_solicitud_valida_agenda(partes):
+    cliente, trabajador, perfil, servicio = partes
+    martes = proximo(1)
+
+    assert pedir(cliente, servicio, martes, "07:00", "09:00").status_code == 400
+    assert pedir(cliente, servicio, martes, "10:00", "09:00").status_code == 400
+    assert pedir(cliente, servicio, martes - timedelta(days=7), "08:00", "09:00").status_code == 400  # pasado
+    assert api(cliente).post("/api/solicitudes/", {
+        "servicio": servicio.pk, "fecha_servicio": martes.isoformat(),
+    }, format="json").status_code == 400
+
+    res = pedir(cliente, servicio, martes, "08:00", "09:00")
+    assert res.status_code == 201
+    # Las pendientes no ocupan la agenda
+    assert pedir(cliente, servicio, martes, "08:30", "09:30").status_code == 201
+
+    assert api(trabajador).patch(f"/api/solicitudes/{res.data['id']}/aceptar/").status_code == 200
+    assert pedir(cliente, servicio, martes, "08:30", "09:30").status_code == 400
+
+
+def test_aceptar_citas_solapadas(partes):
+    cliente, trabajador, perfil, servicio = partes
+    martes = proximo(1)
+    ids = [pedir(cliente, servicio, martes, "08:00", "10:00").data["id"] for _ in range(2)]
+    otra = pedir(cliente, servicio, martes, "10:00", "11:00").data["id"]
+
+    assert api(trabajador).patch(f"/api/solicitudes/{ids[0]}/aceptar/").status_code == 200
+    res = api(trabajador).patch(f"/api/solicitudes/{ids[1]}/aceptar/")
+    assert res.status_code == 409
+    assert res.data["motivo"] == "horario"
+
+    # En lote: la que choca se omite, la contigua se acepta
+    res = api(trabajador).post("/api/solicitudes/responder-lote/", {"ids": [ids[1], otra], "estado": "aceptada"}, format="json")
+    resultados = {r["id"]: r for r in res.data["resultados"]}
+    assert resultados[ids[1]]["motivo"] == "horario"
+    assert resultados[otra]["resultado"] == "cambiada"
+
+
+def test_horarios_libres_y_cache(partes, django_assert_num_queries):
+    cliente, trabajador, perfil, servicio = partes
+    martes = proximo(1)
+    url = "/api/solicitudes/horarios-libres/"
+    params = {"trabajador": perfil.pk, "duracion": 120, "cantidad": 3, "desde": martes.isoformat()}
+
+    res = api(cliente).get(url, params)
+    assert [(h["fecha_servicio"], h["hora_inicio"]) for h in res.data] == [
+        (martes, time(8)), (martes, time(10)), (martes, time(14)),
+    ]
+
+    # Ya construida: sale de la cache sin consultas
+    with django_assert_num_queries(0):
+        agenda_de(perfil.pk)
+
+    # Aceptar una cita invalida la agenda
+    solicitud = Solicitud.objects.create(
+        cliente=cliente, trabajador=perfil, servicio=servicio,
+        fecha_servicio=martes, hora_inicio=time(8), hora_fin=time(10),
+    )
+    api(trabajador).patch(f"/api/solicitudes/{solicitud.pk}/aceptar/")
+    res = api(cliente).get(url, params)
+    assert [h["hora_inicio"] for h in res.data] == [time(10), time(14), time(8)]
+
+    # Cambiar las franjas también
+    Disponibilidad.objects.filter(trabajador=perfil, hora_inicio=time(14)).delete()
+    assert cache.get(f"agenda:{perfil.pk}") is None
+
+
+def test_la_cita_no_se_edita_despues_de_crear(partes):
+    cliente, trabajador, perfil, servicio = partes
+    martes = proximo(1)
+    primera = pedir(cliente, servicio, martes, "08:00", "09:00").data["id"]
+    segunda = pedir(cliente, servicio, martes, "10:00", "11:00").data["id"]
+    Solicitud.objects.filter(pk__in=[primera, segunda]).update(estado="aceptada")
+
+    url = f"/api/solicitudes/{segunda}/"
+    for cambio in [
+        {"hora_inicio": "08:00", "hora_fin": "09:00"},  # encima de otra aceptada
+        {"fecha_servicio": "2001-01-01"},  # en el pasado
+        {"hora_inicio": "23:00", "hora_fin": "01:00"},  # rango invertido
+    ]:
+        api(cliente).patch(url, cambio, format="json")
+
+    solicitud = Solicitud.objects.get(pk=segunda)
+    assert (solicitud.fecha_servicio, solicitud.hora_inicio, solicitud.hora_fin) == (martes, time(10), time(11))
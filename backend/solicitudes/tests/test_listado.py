@@ -0,0 +1,76 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from backend.pagination import KeysetPagination
+
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def escenario():
+    # "ana" es trabajadora y también contrata servicios de "beto"
+    ana = Usuario.objects.create_user(email="ana@test.com", nombre="Ana", password="123")
+    beto = Usuario.objects.create_user(email="beto@test.com", nombre="Beto", password="123")
+    carla = Usuario.objects.create_user(email="carla@test.com", nombre="Carla", password="123")
+    perfil_ana = PerfilTrabajador.objects.create(usuario=ana)
+    perfil_beto = PerfilTrabajador.objects.create(usuario=beto)
+    servicio_ana = Servicio.objects.create(trabajador=perfil_ana, titulo="A", descripcion="d", categoria="Hogar", precio=10)
+    servicio_beto = Servicio.objects.create(trabajador=perfil_beto, titulo="B", descripcion="d", categoria="Hogar", precio=10)
+
+    recibidas = [
+        Solicitud.objects.create(cliente=carla, trabajador=perfil_ana, servicio=servicio_ana) for _ in range(3)
+    ]
+    enviadas = [
+        Solicitud.objects.create(cliente=ana, trabajador=perfil_beto, servicio=servicio_beto) for _ in range(2)
+    ]
+    return ana, carla, recibidas, enviadas
+
+
+def listar(usuario, **params):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client.get("/api/solicitudes/", params)
+
+
+def ids(response):
+    return [s["id"] for s in response.data["results"]]
+
+
+def test_listado_por_rol(escenario):
+    ana, carla, recibidas, enviadas = escenario
+
+    assert ids(listar(ana, rol="cliente")) == [s.id for s in reversed(enviadas)]
+    assert ids(listar(ana, rol="trabajador")) == [s.id for s in reversed(recibidas)]
+    # Combinado, más reciente primero y sin duplicados
+    assert ids(listar(ana)) == [s.id for s in reversed(recibidas + enviadas)]
+
+    # Sin perfil de trabajador no recibe nada
+    assert ids(listar(carla, rol="trabajador")) == []
+    assert len(ids(listar(carla))) == 3
+
+    assert listar(ana, rol="admin").status_code == 400
+
+
+def test_listado_combinado_por_cursor_y_sin_n_mas_1(escenario, monkeypatch):
+    ana, _, recibidas, enviadas = escenario
+    monkeypatch.setattr(KeysetPagination, "page_size", 2)
+
+    res = listar(ana, cursor="")
+    vistos = ids(res)
+    while res.data["next"]:
+        client = APIClient()
+        client.force_authenticate(user=ana)
+        res = client.get(res.data["next"])
+        vistos += ids(res)
+    assert vistos == [s.id for s in reversed(recibidas + enviadas)]
+
+    with CaptureQueriesContext(connection) as consultas:
+        res = listar(ana)
+    assert res.data["results"][0]["titulo_servicio"] == "B"
+    # Paginación (COUNT + página); servicio y cliente van en el JOIN
+    assert len(consultas) <= 3
@@ -0,0 +1,92 @@
+import pytest
+from rest_framework.test import APIClient
+
+from perfiles.models import PerfilTrabajador
+from servicios.models import Servicio
+from solicitudes.models import Solicitud
+from usuarios.models import Usuario
+
+
+@pytest.fixture
+def partes():
+    cliente = Usuario.objects.create_user(email="c@test.com", nombre="C", password="123")
+    trabajador = Usuario.objects.create_user(email="t@test.com", nombre="T", password="123")
+    perfil = PerfilTrabajador.objects.create(usuario=trabajador)
+    servicio = Servicio.objects.create(trabajador=perfil, titulo="S", descripcion="d", categoria="Hogar", precio=10)
+    return cliente, trabajador, perfil, servicio
+
+
+def api(usuario):
+    client = APIClient()
+    client.force_authenticate(user=usuario)
+    return client
+
+
+def test_flujo_y_conflictos(partes):
+    cliente, trabajador, perfil, servicio = partes
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+    url = f"/api/solicitudes/{solicitud.pk}/"
+
+    res = api(trabajador).patch(url + "aceptar/")
+    assert res.status_code == 200
+    assert res.data["estado"] == "aceptada"
+
+    # Segundo toque: ya no está pendiente
+    res = api(trabajador).patch(url + "rechazar/")
+    assert res.status_code == 409
+    assert res.data["estado"] == "aceptada"
+
+    assert api(trabajador).patch(url + "finalizar/").status_code == 200
+    assert api(trabajador).post(url + "responder/", {"estado": "aceptada"}).status_code == 409
+
+    solicitud.refresh_from_db()
+    assert solicitud.estado == "finalizada"
+
+
+def test_rechazada_no_se_puede_finalizar(partes):
+    cliente, trabajador, perfil, servicio = partes
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio, estado="rechazada")
+    res = api(trabajador).patch(f"/api/solicitudes/{solicitud.pk}/finalizar/")
+    assert res.status_code == 409
+
+
+def test_permisos(partes):
+    cliente, trabajador, perfil, servicio = partes
+    solicitud = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio)
+    url = f"/api/solicitudes/{solicitud.pk}/aceptar/"
+
+    assert api(cliente).patch(url).status_code == 403
+    extrano = Usuario.objects.create_user(email="x@test.com", nombre="X", password="123")
+    assert api(extrano).patch(url).status_code == 404
+    assert api(trabajador).patch("/api/solicitudes/999/aceptar/").status_code == 404
+
+    solicitud.refresh_from_db()
+    assert solicitud.estado == "pendiente"
+
+
+def test_responder_en_lote(partes, django_assert_max_num_queries):
+    cliente, trabajador, perfil, servicio = partes
+    pendientes = [Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio) for _ in range(3)]
+    finalizada = Solicitud.objects.create(cliente=cliente, trabajador=perfil, servicio=servicio, estado="finalizada")
+
+    otro = Usuario.objects.create_user(email="o@test.com", nombre="O", password="123")
+    otro_perfil = PerfilTrabajador.objects.create(usuario=otro)
+    otro_servicio = Servicio.objects.create(trabajador=otro_perfil, titulo="S2", descripcion="d", categoria="Hogar", precio=10)
+    ajena = Solicitud.objects.create(cliente=cliente, trabajador=otro_perfil, servicio=otro_servicio)
+
+    ids = [s.pk for s in pendientes] + [finalizada.pk, ajena.pk]
+    client = api(trabajador)
+    with django_assert_max_num_queries(8):
+        res = client.post("/api/solicitudes/responder-lote/", {"ids": ids, "estado": "aceptada"}, format="json")
+
+    assert res.status_code == 200
+    assert res.data["procesadas"] == 3
+    resultados = {r["id"]: r["resultado"] for r in res.data["resultados"]}
+    assert resultados[finalizada.pk] == "conflicto"
+    assert resultados[ajena.pk] == "no_encontrada"
+    assert set(Solicitud.objects.filter(estado="aceptada").values_list("pk", flat=True)) == {s.pk for s in pendientes}
+    ajena.refresh_from_db()
+    assert ajena.estado == "pendiente"
+
+    res = client.post("/api/solicitudes/responder-lote/", {"ids": ids, "estado": "pendiente"}, format="json")
+    assert res.status_code == 400
@@ -0,0 +1,168 @@
+"""
+Cambios de estado de las solicitudes sin carreras.
+
+Cada transición es un único UPDATE condicional:
+
+    UPDATE solicitud SET estado = <nuevo>
+    WHERE id = <id> AND estado IN (<orígenes permitidos>) AND trabajador = <perfil del usuario>
+
+Si dos peticiones compiten (dos toques en "aceptar", aceptar y rechazar a la
+vez) solo una encuentra la fila en el estado esperado; la otra recibe 409
+con el estado actual. El permiso va en el mismo WHERE, sin consultar antes
+el perfil del usuario.
+
+Al aceptar una cita, el mismo WHERE exige que no se solape con otra cita ya
+aceptada del trabajador (NOT EXISTS). En SQLite las escrituras se
+serializan, así que tampoco se cuelan dos aceptaciones simultáneas; en
+PostgreSQL eso requeriría además aislamiento serializable.
+
+Como el UPDATE no dispara post_save, se envía solicitudes.signals.estado_cambiado.
+"""
+import copy
+
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from rest_framework import status
+from rest_framework.exceptions import APIException, NotFound, PermissionDenied, ValidationError
+
+from perfiles.models import PerfilTrabajador
+
+from .agenda import absoluto, agenda_de, minutos
+from .models import Solicitud
+from .signals import estado_cambiado
+
+
+# estado actual -> estados a los que puede pasar
+TRANSICIONES = {
+    "pendiente": {"aceptada", "rechazada"},
+    "aceptada": {"finalizada"},
+}
+
+
+class ConflictoEstado(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "La solicitud ya no está en un estado que permita este cambio."
+
+    def __init__(self, estado_actual):
+        super().__init__()
+        self.detail = {"error": self.default_detail, "estado": estado_actual}
+
+
+class ConflictoHorario(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "El trabajador ya tiene una cita aceptada en ese horario."
+
+    def __init__(self, estado_actual):
+        super().__init__()
+        self.detail = {"error": self.default_detail, "estado": estado_actual, "motivo": "horario"}
+
+
+def origenes(estado):
+    """Estados desde los que se puede llegar a `estado`."""
+    permitidos = [origen for origen, destinos in TRANSICIONES.items() if estado in destinos]
+    if not permitidos:
+        raise ValidationError({"estado": f'Estado inválido: "{estado}".'})
+    return permitidos
+
+
+def recibidas_por(usuario):
+    """Solicitudes hechas al perfil de trabajador de `usuario` (subconsulta, sin cargar el perfil)."""
+    return Solicitud.objects.filter(
+        trabajador__in=PerfilTrabajador.objects.filter(usuario=usuario).values("pk")
+    )
+
+
+def sin_solape(qs):
+    """Excluye las citas que chocan con otra cita aceptada del mismo trabajador."""
+    return qs.exclude(Exists(
+        Solicitud.objects.filter(
+            trabajador=OuterRef("trabajador"),
+            estado="aceptada",
+            fecha_servicio=OuterRef("fecha_servicio"),
+            hora_inicio__lt=OuterRef("hora_fin"),
+            hora_fin__gt=OuterRef("hora_inicio"),
+        ).exclude(pk=OuterRef("pk"))
+    ))
+
+
+def _candidatas(usuario, estado):
+    qs = recibidas_por(usuario)
+    return sin_solape(qs) if estado == "aceptada" else qs
+
+
+def transicionar(usuario, solicitud_id, estado):
+    """Aplica la transición y devuelve la solicitud actualizada. Lanza 403/404/409."""
+    if _candidatas(usuario, estado).filter(pk=solicitud_id, estado__in=origenes(estado)).update(estado=estado):
+        estado_cambiado.send(sender=Solicitud, ids=[solicitud_id], estado=estado)
+        return Solicitud.objects.select_related("servicio", "cliente").get(pk=solicitud_id)
+
+    # No cambió nada: averiguar por qué (solo en el camino de error)
+    actual = (
+        Solicitud.objects.filter(pk=solicitud_id)
+        .values_list("estado", "trabajador__usuario_id", "cliente_id", "fecha_servicio")
+        .first()
+    )
+    # Como get_object(): para quien no participa, la solicitud no existe
+    if actual is None or usuario.pk not in actual[1:3]:
+        raise NotFound("Solicitud no encontrada.")
+    if actual[1] != usuario.pk:
+        raise PermissionDenied("No tienes permiso para responder esta solicitud.")
+    if actual[0] in origenes(estado) and actual[3] is not None:
+        raise ConflictoHorario(actual[0])
+    raise ConflictoEstado(actual[0])
+
+
+def transicionar_lote(usuario, ids, estado):
+    """
+    Aplica la misma transición a muchas solicitudes del trabajador.
+    Devuelve (cambiadas, resultados) con un resultado por id:
+    cambiada / conflicto (con el estado actual; motivo "horario" si la cita
+    choca con otra) / no_encontrada.
+    """
+    permitidos = origenes(estado)
+    ids = list(dict.fromkeys(ids))
+
+    with transaction.atomic():
+        filas = {
+            pk: (estado_actual, trabajador_id, cita)
+            for pk, estado_actual, trabajador_id, *cita in recibidas_por(usuario).select_for_update()
+            .filter(pk__in=ids)
+            .values_list("pk", "estado", "trabajador_id", "fecha_servicio", "hora_inicio", "hora_fin")
+        }
+        actuales = {pk: fila[0] for pk, fila in filas.items()}
+        validas = [pk for pk in ids if actuales.get(pk) in permitidos]
+        ocupadas = set()
+
+        if estado == "aceptada":
+            # Citas del lote que chocan con la agenda o entre sí
+            agendas = {}
+            for pk in validas:
+                _, trabajador_id, (fecha, inicio, fin) = filas[pk]
+                if fecha is None:
+                    continue
+                if trabajador_id not in agendas:
+                    agendas[trabajador_id] = copy.deepcopy(agenda_de(trabajador_id))
+                agenda = agendas[trabajador_id]
+                if agenda.choca(absoluto(fecha, minutos(inicio)), absoluto(fecha, minutos(fin))):
+                    ocupadas.add(pk)
+                else:
+                    agenda.reservar(fecha, inicio, fin)
+            validas = [pk for pk in validas if pk not in ocupadas]
+
+        if validas:
+            _candidatas(usuario, estado).filter(pk__in=validas, estado__in=permitidos).update(estado=estado)
+
+    if validas:
+        estado_cambiado.send(sender=Solicitud, ids=validas, estado=estado)
+
+    resultados = []
+    for pk in ids:
+        if pk not in actuales:
+            resultados.append({"id": pk, "resultado": "no_encontrada"})
+        elif actuales[pk] not in permitidos:
+            resultados.append({"id": pk, "resultado": "conflicto", "estado": actuales[pk]})
+        elif pk in ocupadas:
+            resultados.append({"id": pk, "resultado": "conflicto", "estado": actuales[pk], "motivo": "horario"})
+        else:
+            resultados.append({"id": pk, "resultado": "cambiada", "estado": estado})
+    return validas, resultados
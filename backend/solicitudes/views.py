@@ -2,11 +2,20 @@ from rest_framework import viewsets, permissions, status, exceptions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django.db import models
+from django.utils import timezone
+from datetime import datetime, time
 from .models import Solicitud
-from .serializers import SolicitudSerializer, CrearSolicitudSerializer
+from .serializers import (
+    SolicitudSerializer, CrearSolicitudSerializer, TransicionLoteSerializer, HorariosLibresSerializer
+)
+from .agenda import agenda_de, validar_cita, config as agenda_config
+from .transiciones import recibidas_por, transicionar, transicionar_lote
+from backend.pagination import KeysetPagination
 
 class SolicitudViewSet(viewsets.ModelViewSet):
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
+    keyset_campos = ("fecha_solicitud", "id")
     
     def get_serializer_class(self):
         if self.action == 'create':
@@ -14,17 +23,30 @@ class SolicitudViewSet(viewsets.ModelViewSet):
         return SolicitudSerializer
 
     def get_queryset(self):
+        """
+        ?rol=cliente     solicitudes enviadas por el usuario
+        ?rol=trabajador  solicitudes recibidas en su perfil de trabajador
+        sin rol          ambas: UNION ALL de las dos consultas, cada una sobre
+                         su índice (cliente|trabajador, fecha_solicitud), en
+                         lugar de un OR con DISTINCT que no usa ninguno.
+        """
         user = self.request.user
-        
-        # Si el usuario tiene perfil de trabajador, ve las solicitudes que LE han hecho
-        # Y TAMBIÉN las que él ha hecho como cliente
-        qs = Solicitud.objects.filter(cliente=user)
-        
-        if hasattr(user, 'perfil_trabajador'):
-            qs_trabajador = Solicitud.objects.filter(trabajador=user.perfil_trabajador)
-            qs = qs | qs_trabajador # Unimos ambas listas (Enviadas + Recibidas)
-            
-        return qs.distinct().order_by('-fecha_solicitud')
+        rol = self.request.query_params.get("rol")
+
+        enviadas = Solicitud.objects.filter(cliente=user)
+        # Subconsulta: sin la consulta extra de hasattr(user, 'perfil_trabajador')
+        recibidas = recibidas_por(user)
+
+        if rol == "cliente":
+            qs = enviadas
+        elif rol == "trabajador":
+            qs = recibidas
+        elif rol is None:
+            qs = Solicitud.objects.filter(pk__in=enviadas.values("pk").union(recibidas.values("pk"), all=True))
+        else:
+            raise exceptions.ValidationError({"rol": 'Use "cliente" o "trabajador".'})
+
+        return qs.select_related("servicio", "cliente").order_by("-fecha_solicitud", "-id")
 
     def perform_create(self, serializer):
         servicio = serializer.validated_data['servicio']
@@ -34,18 +56,49 @@ class SolicitudViewSet(viewsets.ModelViewSet):
         if servicio.trabajador.usuario == cliente:
             raise exceptions.ValidationError("No puedes solicitar tu propio servicio.")
 
-        # 2. Guardar la solicitud asignando automáticamente el trabajador dueño del servicio
+        # 2. Si trae cita, debe caer en la disponibilidad del trabajador y no chocar con otra aceptada
+        if serializer.validated_data.get('fecha_servicio'):
+            validar_cita(
+                servicio.trabajador_id,
+                serializer.validated_data['fecha_servicio'],
+                serializer.validated_data['hora_inicio'],
+                serializer.validated_data['hora_fin'],
+            )
+
+        # 3. Guardar la solicitud asignando automáticamente el trabajador dueño del servicio
         serializer.save(
             cliente=cliente,
             trabajador=servicio.trabajador
         )
 
+    @action(detail=False, methods=['get'], url_path='horarios-libres')
+    def horarios_libres(self, request):
+        """
+        Próximos huecos libres en la agenda de un trabajador.
+        ?trabajador=<id>&duracion=<minutos>&cantidad=<n>[&desde=AAAA-MM-DD]
+        """
+        serializer = HorariosLibresSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        datos = serializer.validated_data
+
+        ahora = timezone.localtime().replace(tzinfo=None)
+        desde = ahora
+        if datos.get('desde') and datos['desde'] > ahora.date():
+            desde = datetime.combine(datos['desde'], time.min)
+
+        huecos = agenda_de(datos['trabajador']).huecos(
+            desde, datos['duracion'], datos['cantidad'], agenda_config()['HORIZONTE_DIAS']
+        )
+        return Response([
+            {'fecha_servicio': fecha, 'hora_inicio': inicio, 'hora_fin': fin}
+            for fecha, inicio, fin in huecos
+        ])
+
     # Acción personalizada para que el trabajador responda
     @action(detail=True, methods=['post'])
     def responder(self, request, pk=None):
-        solicitud = self.get_object()
         nuevo_estado = request.data.get('estado')
-        
+
         # Validar estado correcto
         if nuevo_estado not in ['aceptada', 'rechazada']:
             return Response(
@@ -53,68 +106,48 @@ class SolicitudViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # Validar que sea el trabajador quien responde
-        if not hasattr(request.user, 'perfil_trabajador') or \
-           solicitud.trabajador != request.user.perfil_trabajador:
-            return Response(
-                {'error': 'No tienes permiso para responder esta solicitud.'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        solicitud.estado = nuevo_estado
-        solicitud.save()
-        return Response(SolicitudSerializer(solicitud).data)
+        return self._transicionar(pk, nuevo_estado)
 
     # Acción para aceptar solicitud (alias corto)
     @action(detail=True, methods=['patch'])
     def aceptar(self, request, pk=None):
-        solicitud = self.get_object()
-        
-        # Validar que sea el trabajador quien responde
-        if not hasattr(request.user, 'perfil_trabajador') or \
-           solicitud.trabajador != request.user.perfil_trabajador:
-            return Response(
-                {'error': 'No tienes permiso para responder esta solicitud.'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        solicitud.estado = 'aceptada'
-        solicitud.save()
-        return Response(SolicitudSerializer(solicitud).data)
+        return self._transicionar(pk, 'aceptada')
 
     # Acción para rechazar solicitud
     @action(detail=True, methods=['patch'])
     def rechazar(self, request, pk=None):
-        solicitud = self.get_object()
-        
-        # Validar que sea el trabajador quien responde
-        if not hasattr(request.user, 'perfil_trabajador') or \
-           solicitud.trabajador != request.user.perfil_trabajador:
-            return Response(
-                {'error': 'No tienes permiso para responder esta solicitud.'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
-
-        solicitud.estado = 'rechazada'
-        solicitud.save()
-        return Response(SolicitudSerializer(solicitud).data)
+        return self._transicionar(pk, 'rechazada')
 
     # Acción para marcar como finalizada
     @action(detail=True, methods=['patch'])
     def finalizar(self, request, pk=None):
-        solicitud = self.get_object()
-        
-        # Validar que sea el trabajador quien finaliza
-        if not hasattr(request.user, 'perfil_trabajador') or \
-           solicitud.trabajador != request.user.perfil_trabajador:
-            return Response(
-                {'error': 'No tienes permiso para finalizar esta solicitud.'}, 
-                status=status.HTTP_403_FORBIDDEN
-            )
+        return self._transicionar(pk, 'finalizada')
+
+    def _transicionar(self, pk, nuevo_estado):
+        # UPDATE condicional: permiso y estado esperado en el mismo WHERE (409 si ya cambió)
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise exceptions.NotFound("Solicitud no encontrada.")
+        solicitud = transicionar(self.request.user, pk, nuevo_estado)
+        return Response(SolicitudSerializer(solicitud, context=self.get_serializer_context()).data)
 
-        solicitud.estado = 'finalizada'
-        solicitud.save()
-        return Response(SolicitudSerializer(solicitud).data)
+    @action(detail=False, methods=['post'], url_path='responder-lote')
+    def responder_lote(self, request):
+        """
+        El trabajador responde muchas solicitudes en una llamada.
+        Body: {"ids": [1, 2, ...], "estado": "aceptada" | "rechazada" | "finalizada"}
+        """
+        serializer = TransicionLoteSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        cambiadas, resultados = transicionar_lote(
+            request.user, serializer.validated_data['ids'], serializer.validated_data['estado']
+        )
+        return Response({
+            'procesadas': len(cambiadas),
+            'omitidas': len(resultados) - len(cambiadas),
+            'resultados': resultados,
+        })
 
     def destroy(self, request, *args, **kwargs):
         """
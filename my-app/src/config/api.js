@@ -251,6 +251,12 @@ export const chatAPI = {
     apiRequest(`/chat/${solicitudId}/leer/`, {
       method: 'PUT',
     }),
+
+  // WebSocket de la conversación (mensajes nuevos y confirmaciones de lectura)
+  abrirSocket: (solicitudId, token) => {
+    const base = API_BASE_URL.replace(/^http/, 'ws').replace(/\/api\/?$/, '');
+    return new WebSocket(`${base}/ws/chat/${solicitudId}/?token=${encodeURIComponent(token)}`);
+  },
 };
 
 // API de Disponibilidad
@@ -37,39 +37,14 @@ export default function Home() {
   useEffect(() => {
     const fetchServices = async () => {
       try {
-        const response = await fetch('http://localhost:8000/api/servicios/publicos/');
+        // Un solo request: servicios aprobados con la disponibilidad del trabajador embebida
+        const response = await fetch('http://localhost:8000/api/servicios/feed/');
         if (!response.ok) throw new Error('Error al cargar servicios');
         const data = await response.json();
         const listaServicios = data.results ? data.results : data;
         const imagenes = [plomeroImg, carpinteroImg, meseroImg];
-        
-        // Obtener disponibilidades de todos los trabajadores
-        let disponibilidadesMap = {};
-        try {
-          const dispResponse = await fetch('http://localhost:8000/api/disponibilidad/publico/');
-          if (dispResponse.ok) {
-            const dispData = await dispResponse.json();
-            const dispList = dispData.results ? dispData.results : dispData;
-            // Agrupar disponibilidades por trabajador
-            dispList.forEach(disp => {
-              if (!disponibilidadesMap[disp.trabajador]) {
-                disponibilidadesMap[disp.trabajador] = [];
-              }
-              disponibilidadesMap[disp.trabajador].push({
-                dia: disp.dia,
-                hora_inicio: disp.hora_inicio,
-                hora_fin: disp.hora_fin
-              });
-            });
-            console.log('✅ Disponibilidades cargadas:', disponibilidadesMap);
-          }
-        } catch (err) {
-          console.warn('Disponibilidades no disponibles o error cargando:', err);
-        }
-        
+
         const formattedServices = listaServicios
-          // ✅ FILTRAR SOLO SERVICIOS APROBADOS
-          .filter(item => item.estado_publicacion === 'aprobado')
           .map((item, index) => ({
             id: item.id_servicio,
             title: item.titulo,
@@ -84,7 +59,7 @@ export default function Home() {
             ownerId: item.owner_id,
             estado: item.estado_publicacion,
             trabajadorId: item.trabajador_id,
-            availability: disponibilidadesMap[item.trabajador_id] || []
+            availability: item.disponibilidad || []
           }));
 
         setServices(formattedServices);
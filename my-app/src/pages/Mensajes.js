@@ -84,6 +84,31 @@ export default function Mensajes() {
     }
   }, [selectedItem, activeTab]);
 
+  // Mensajes en tiempo real de la conversación abierta
+  useEffect(() => {
+    if (!selectedItem || activeTab !== 'chats' || !token) return undefined;
+
+    const socket = chatAPI.abrirSocket(selectedItem.id, token);
+    socket.onmessage = (event) => {
+      const evento = JSON.parse(event.data);
+      if (evento.tipo === 'mensaje') {
+        agregarMensaje(evento.mensaje);
+        if (user && evento.mensaje.remitente !== user.id_usuario) {
+          socket.send(JSON.stringify({ tipo: 'leer' }));
+        }
+      } else if (evento.tipo === 'leido' && user && evento.usuario !== user.id_usuario) {
+        setMessages(prev => prev.map(m => (m.remitente === user.id_usuario ? { ...m, leido: true } : m)));
+      }
+    };
+    return () => socket.close();
+  }, [selectedItem, activeTab, token]);
+
+  const agregarMensaje = (mensaje) => {
+    setMessages(prev => (
+      prev.some(m => m.id_mensaje === mensaje.id_mensaje) ? prev : [...prev, mensaje]
+    ));
+  };
+
   const cargarMensajes = async (solicitudId) => {
     try {
       const data = await chatAPI.obtenerMensajes(solicitudId);
@@ -164,9 +189,9 @@ export default function Mensajes() {
         throw new Error(errorData.detail || 'Error al enviar mensaje');
       }
 
-      // Limpiar input y recargar mensajes
+      // Limpiar input y mostrar el mensaje (si llega también por el socket no se duplica)
       setNewMessage('');
-      await cargarMensajes(selectedItem.id);
+      agregarMensaje(await response.json());
 
     } catch (error) {
       alert('Error: ' + error.message);